@@ -16,8 +16,10 @@ from app.models import (  # noqa: F401 — ensure all models are imported
     FieldValue,
     Pack,
     PackComponent,
+    PriorityProfile,
     SourcePriority,
     User,
+    ValueConflict,
 )
 
 config = context.config
@@ -0,0 +1,30 @@
+"""Treat NULL variant/market as equal in pack identity
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IDENTITY_COLUMNS = ["oem", "model", "variant", "year", "market"]
+
+
+def upgrade() -> None:
+    # Fails if NULL-variant/market duplicates already exist — merge those first
+    op.drop_constraint("uq_pack_identity", "packs", type_="unique")
+    op.create_unique_constraint(
+        "uq_pack_identity", "packs", IDENTITY_COLUMNS, postgresql_nulls_not_distinct=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_pack_identity", "packs", type_="unique")
+    op.create_unique_constraint("uq_pack_identity", "packs", IDENTITY_COLUMNS)
@@ -0,0 +1,40 @@
+"""Index active field values by (field_id, pack_id)
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction; building it
+    # online keeps field_values writable on large catalogs
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_values_field_pack_active",
+            "field_values",
+            ["field_id", "pack_id"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_values_field_pack_active",
+            table_name="field_values",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,66 @@
+"""Add field formulas and derived values
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Formulas for the seeded fields that can be derived from other seeded fields,
+# by (domain name, field name): field names are only unique within a domain
+DEFAULT_FORMULAS = {
+    ("Cellblock rest", "cells_total"): "module_count * cells_per_module",
+    ("Other components", "gross_capacity_kwh"): "cells_total * cell_capacity_ah * cell_nominal_voltage / 1000",
+    ("Other components", "pack_gravimetric_density_whkg"): "gross_capacity_kwh * 1000 / pack_weight_kg",
+}
+
+
+def upgrade() -> None:
+    op.add_column("fields", sa.Column("formula", sa.Text(), nullable=True))
+    op.add_column(
+        "field_values",
+        sa.Column("is_derived", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+    )
+    fields = sa.table(
+        "fields", sa.column("domain_id", sa.Integer), sa.column("name", sa.String), sa.column("formula", sa.Text)
+    )
+    domains = sa.table("domains", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    for (domain_name, name), formula in DEFAULT_FORMULAS.items():
+        op.execute(
+            fields.update()
+            .where(
+                fields.c.domain_id == sa.select(domains.c.id).where(domains.c.name == domain_name).scalar_subquery(),
+                fields.c.name == name,
+                fields.c.formula.is_(None),
+            )
+            .values(formula=formula)
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_values_derived",
+            "field_values",
+            ["pack_id", "field_id"],
+            unique=True,
+            postgresql_where=sa.text("is_derived AND is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_values_derived", table_name="field_values", postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column("field_values", "is_derived")
+    op.drop_column("fields", "formula")
@@ -0,0 +1,51 @@
+"""Add parsed numeric bounds to field values
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("field_values", sa.Column("value_min", sa.Float(), nullable=True))
+    op.add_column("field_values", sa.Column("value_max", sa.Float(), nullable=True))
+    op.add_column(
+        "field_values",
+        sa.Column("value_approximate", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    )
+    # Calculated values are exact; the rest keep value_numeric as written until
+    # scripts/normalize_values.py re-parses them
+    op.execute("UPDATE field_values SET value_min = value_numeric, value_max = value_numeric WHERE is_derived")
+    # Built online like 005
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_values_field_numeric",
+            "field_values",
+            ["field_id", "value_numeric"],
+            postgresql_where=sa.text("is_active AND value_numeric IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_values_field_numeric",
+            table_name="field_values",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("field_values", "value_approximate")
+    op.drop_column("field_values", "value_max")
+    op.drop_column("field_values", "value_min")
@@ -0,0 +1,42 @@
+"""Add value_conflicts (per pack field source agreement)
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by scripts/score_conflicts.py, then kept current by value writes
+    op.create_table(
+        "value_conflicts",
+        sa.Column("pack_id", sa.Integer(), sa.ForeignKey("packs.id"), primary_key=True),
+        sa.Column("field_id", sa.Integer(), sa.ForeignKey("fields.id"), primary_key=True),
+        sa.Column("value_count", sa.Integer(), nullable=False),
+        sa.Column("group_count", sa.Integer(), nullable=False),
+        sa.Column("agreement", sa.Float(), nullable=False),
+        sa.Column("spread", sa.Float(), nullable=True),
+        sa.Column("is_conflict", sa.Boolean(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "idx_value_conflicts_field",
+        "value_conflicts",
+        ["field_id", "agreement"],
+        postgresql_where=sa.text("is_conflict"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_value_conflicts_field", table_name="value_conflicts")
+    op.drop_table("value_conflicts")
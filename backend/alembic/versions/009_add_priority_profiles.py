@@ -0,0 +1,58 @@
+"""Add shared priority profiles
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BUILTIN_PROFILES = [
+    {
+        "name": "Teardown-first",
+        "description": "Measured data before official figures (the default order)",
+        "priority_order": ["teardown", "a2mac1", "oem", "regulatory", "cad", "calculated", "press", "user"],
+    },
+    {
+        "name": "OEM-official",
+        "description": "Manufacturer and homologation figures first, then measured data",
+        "priority_order": ["oem", "regulatory", "teardown", "a2mac1", "cad", "calculated", "press", "user"],
+    },
+]
+
+
+def upgrade() -> None:
+    profiles = op.create_table(
+        "priority_profiles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("priority_order", postgresql.JSONB(), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.bulk_insert(profiles, BUILTIN_PROFILES)
+    op.add_column(
+        "source_priorities",
+        sa.Column(
+            "profile_id",
+            sa.Integer(),
+            sa.ForeignKey("priority_profiles.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("source_priorities", "profile_id")
+    op.drop_table("priority_profiles")
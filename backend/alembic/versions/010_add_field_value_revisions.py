@@ -0,0 +1,82 @@
+"""Add field_value_revisions (append-only value history)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "field_value_revisions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("value_id", sa.Integer(), sa.ForeignKey("field_values.id"), nullable=False),
+        sa.Column("pack_id", sa.Integer(), sa.ForeignKey("packs.id"), nullable=False),
+        sa.Column("field_id", sa.Integer(), sa.ForeignKey("fields.id"), nullable=False),
+        sa.Column("value_text", sa.Text(), nullable=True),
+        sa.Column("value_numeric", sa.Float(), nullable=True),
+        sa.Column("value_min", sa.Float(), nullable=True),
+        sa.Column("value_max", sa.Float(), nullable=True),
+        sa.Column("value_approximate", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("source_type", sa.String(50), nullable=False),
+        sa.Column("source_detail", sa.Text(), nullable=False),
+        sa.Column("contributed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("is_derived", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("valid", postgresql.TSTZRANGE(), nullable=False),
+        sa.Column("recorded_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+
+    # Seed history from the current rows: nothing older was kept, so each
+    # value starts at its last update; deleted values end there
+    op.execute(
+        """
+        INSERT INTO field_value_revisions (
+            value_id, pack_id, field_id, value_text, value_numeric, value_min, value_max,
+            value_approximate, source_type, source_detail, contributed_by, is_derived, created_at, valid
+        )
+        SELECT
+            id, pack_id, field_id, value_text, value_numeric, value_min, value_max,
+            value_approximate, source_type, source_detail, contributed_by, is_derived,
+            coalesce(created_at, now()),
+            CASE WHEN is_active
+                THEN tstzrange(coalesce(updated_at, created_at, now()), NULL)
+                ELSE tstzrange(
+                    coalesce(created_at, updated_at, now()),
+                    greatest(coalesce(created_at, updated_at, now()), coalesce(updated_at, now()))
+                )
+            END
+        FROM field_values
+        ORDER BY id
+        """
+    )
+
+    # Built after the backfill; the table is new, so nothing reads it yet
+    op.create_index(
+        "idx_value_revisions_pack_from", "field_value_revisions", ["pack_id", sa.text("lower(valid)")]
+    )
+    op.create_index(
+        "idx_value_revisions_value_from", "field_value_revisions", ["value_id", sa.text("lower(valid)")]
+    )
+    op.create_index(
+        "uq_value_revisions_open",
+        "field_value_revisions",
+        ["value_id"],
+        unique=True,
+        postgresql_where=sa.text("upper_inf(valid)"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("field_value_revisions")
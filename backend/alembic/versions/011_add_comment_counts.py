@@ -0,0 +1,54 @@
+"""Index comments by value and denormalize field_values.comment_count
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Comment pages walk (created_at, id) within one value; built online so
+    # comments stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_comments_value_created",
+            "comments",
+            ["value_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    # A constant default is metadata-only: no table rewrite
+    op.add_column(
+        "field_values",
+        sa.Column("comment_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE field_values v
+        SET comment_count = c.n
+        FROM (SELECT value_id, count(*) AS n FROM comments GROUP BY value_id) c
+        WHERE v.id = c.value_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("field_values", "comment_count")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_comments_value_created",
+            table_name="comments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
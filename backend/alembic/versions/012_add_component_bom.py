@@ -0,0 +1,45 @@
+"""Component suppliers, BOM quantities and lookup indexes
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("components", sa.Column("supplier", sa.String(200), nullable=True))
+    op.add_column(
+        "pack_components",
+        sa.Column("quantity", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+    # Fails if duplicate components already exist — merge those first
+    op.create_index(
+        "uq_component_identity",
+        "components",
+        ["name", "component_type", "supplier"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    op.create_index("idx_components_supplier", "components", [sa.text("lower(supplier)"), "component_type"])
+    op.create_index("idx_components_type", "components", ["component_type"])
+    op.create_index("idx_pack_components_component", "pack_components", ["component_id", "pack_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_pack_components_component", table_name="pack_components")
+    op.drop_index("idx_components_type", table_name="components")
+    op.drop_index("idx_components_supplier", table_name="components")
+    op.drop_index("uq_component_identity", table_name="components")
+    op.drop_column("pack_components", "quantity")
+    op.drop_column("components", "supplier")
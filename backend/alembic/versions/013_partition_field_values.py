@@ -0,0 +1,140 @@
+"""Hash-partition field_values by pack_id; add field_values_archive
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+Needs a maintenance window. The upgrade runs in one transaction and holds
+ACCESS EXCLUSIVE locks on field_values, comments and field_value_revisions
+from its first ALTER until it commits. Every read and write of values and
+comments, pack detail included, waits for it. It runs for as long as it
+takes to backfill comments.pack_id, copy every field_values row and build
+the partition indexes. Time it on a restored copy of production first.
+Downgrade copies the table back the same way.
+
+Stop the API workers and scheduled scripts, take a backup, run
+``python -m app.bootstrap`` (or ``alembic upgrade 013``), then ANALYZE
+field_values and restart.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed once the table is partitioned: changing it means rewriting the table
+PARTITIONS = 16
+
+COLUMNS = (
+    "id, pack_id, field_id, value_text, value_numeric, source_type, source_detail, contributed_by, "
+    "created_at, updated_at, is_active, is_derived, value_min, value_max, value_approximate, comment_count"
+)
+
+
+def _create_field_value_constraints() -> None:
+    op.create_foreign_key("field_values_pack_id_fkey", "field_values", "packs", ["pack_id"], ["id"])
+    op.create_foreign_key("field_values_field_id_fkey", "field_values", "fields", ["field_id"], ["id"])
+    op.create_foreign_key("field_values_contributed_by_fkey", "field_values", "users", ["contributed_by"], ["id"])
+    op.create_index("idx_values_pack_field", "field_values", ["pack_id", "field_id", "source_type"])
+    op.create_index(
+        "idx_values_field_pack_active", "field_values", ["field_id", "pack_id"], postgresql_where=sa.text("is_active")
+    )
+    op.create_index(
+        "idx_values_field_numeric",
+        "field_values",
+        ["field_id", "value_numeric"],
+        postgresql_where=sa.text("is_active AND value_numeric IS NOT NULL"),
+    )
+    op.create_index(
+        "uq_values_derived",
+        "field_values",
+        ["pack_id", "field_id"],
+        unique=True,
+        postgresql_where=sa.text("is_derived AND is_active"),
+    )
+
+
+def upgrade() -> None:
+    # A foreign key into a partitioned table has to include the partition
+    # key, so comments carry their value's pack
+    op.add_column("comments", sa.Column("pack_id", sa.Integer(), nullable=True))
+    op.execute("UPDATE comments c SET pack_id = v.pack_id FROM field_values v WHERE v.id = c.value_id")
+    op.alter_column("comments", "pack_id", nullable=False)
+    op.drop_constraint("comments_value_id_fkey", "comments", type_="foreignkey")
+    # Revisions outlive archived values, so theirs is dropped for good
+    op.drop_constraint("field_value_revisions_value_id_fkey", "field_value_revisions", type_="foreignkey")
+
+    # Rewrite into the partitioned table under the rename's exclusive lock;
+    # the id sequence carries over
+    op.execute("ALTER TABLE field_values RENAME TO field_values_unpartitioned")
+    op.execute("ALTER SEQUENCE field_values_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE field_values (LIKE field_values_unpartitioned INCLUDING DEFAULTS) PARTITION BY HASH (pack_id)"
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE field_values_p{remainder:02d} PARTITION OF field_values "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.execute(f"INSERT INTO field_values ({COLUMNS}) SELECT {COLUMNS} FROM field_values_unpartitioned")
+    op.execute("DROP TABLE field_values_unpartitioned")
+    op.execute("ALTER SEQUENCE field_values_id_seq OWNED BY field_values.id")
+
+    # Built after the copy; every index on the parent is created per partition
+    op.create_primary_key("field_values_pkey", "field_values", ["id", "pack_id"])
+    _create_field_value_constraints()
+    # What the archival job scans for
+    op.create_index(
+        "idx_values_inactive_updated", "field_values", ["updated_at"], postgresql_where=sa.text("NOT is_active")
+    )
+    op.create_foreign_key(
+        "comments_value_fkey", "comments", "field_values", ["value_id", "pack_id"], ["id", "pack_id"]
+    )
+
+    op.create_table(
+        "field_values_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("pack_id", sa.Integer(), sa.ForeignKey("packs.id"), nullable=False),
+        sa.Column("field_id", sa.Integer(), sa.ForeignKey("fields.id"), nullable=False),
+        sa.Column("value_text", sa.Text(), nullable=True),
+        sa.Column("value_numeric", sa.Float(), nullable=True),
+        sa.Column("source_type", sa.String(50), nullable=False),
+        sa.Column("source_detail", sa.Text(), nullable=False),
+        sa.Column("contributed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_derived", sa.Boolean(), nullable=False),
+        sa.Column("value_min", sa.Float(), nullable=True),
+        sa.Column("value_max", sa.Float(), nullable=True),
+        sa.Column("value_approximate", sa.Boolean(), nullable=False),
+        sa.Column("comment_count", sa.Integer(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("idx_values_archive_pack", "field_values_archive", ["pack_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("comments_value_fkey", "comments", type_="foreignkey")
+
+    op.execute("ALTER TABLE field_values RENAME TO field_values_partitioned")
+    op.execute("ALTER SEQUENCE field_values_id_seq OWNED BY NONE")
+    op.execute("CREATE TABLE field_values (LIKE field_values_partitioned INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO field_values ({COLUMNS}) SELECT {COLUMNS} FROM field_values_partitioned")
+    # Archived values come back, so every revision has its value again
+    op.execute(f"INSERT INTO field_values ({COLUMNS}) SELECT {COLUMNS} FROM field_values_archive")
+    op.execute("DROP TABLE field_values_partitioned")
+    op.execute("ALTER SEQUENCE field_values_id_seq OWNED BY field_values.id")
+    op.drop_table("field_values_archive")
+
+    op.create_primary_key("field_values_pkey", "field_values", ["id"])
+    _create_field_value_constraints()
+    op.create_foreign_key(
+        "field_value_revisions_value_id_fkey", "field_value_revisions", "field_values", ["value_id"], ["id"]
+    )
+    op.create_foreign_key("comments_value_id_fkey", "comments", "field_values", ["value_id"], ["id"])
+    op.drop_column("comments", "pack_id")
@@ -0,0 +1,36 @@
+"""GiST index for point-in-time revision reads
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trusted since PostgreSQL 13, so the database owner can create it;
+    # lets pack_id (a plain integer) share a GiST index with the range
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # valid @> as_of is answered by the index alone, instead of scanning
+    # every revision of the pack that started before as_of
+    op.create_index(
+        "idx_value_revisions_pack_valid", "field_value_revisions", ["pack_id", "valid"], postgresql_using="gist"
+    )
+    op.drop_index("idx_value_revisions_pack_from", table_name="field_value_revisions")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_value_revisions_pack_from", "field_value_revisions", ["pack_id", sa.text("lower(valid)")]
+    )
+    op.drop_index("idx_value_revisions_pack_valid", table_name="field_value_revisions")
+    # The extension stays: other objects may have come to depend on it
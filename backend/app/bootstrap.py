@@ -0,0 +1,72 @@
+"""
+One-shot database bootstrap: Alembic ``upgrade head`` + default seeding.
+
+Run once per deploy, before starting the API workers:
+
+    python -m app.bootstrap
+
+A Postgres advisory lock serialises concurrent runs (e.g. several containers
+starting at once); later runs find the schema current and the seed rows
+present and do nothing. Workers only call ``check_schema_version()`` on boot.
+"""
+
+import asyncio
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from app.database import async_read_session, async_session, engine
+from app.seed import seed_defaults
+
+# Arbitrary application-wide key for pg_advisory_lock
+BOOTSTRAP_LOCK_KEY = 71_402_026
+
+
+def _alembic_config() -> Config:
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    alembic_cfg = Config(os.path.join(base_dir, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(base_dir, "alembic"))
+    return alembic_cfg
+
+
+def run_migrations():
+    command.upgrade(_alembic_config(), "head")
+
+
+async def check_schema_version() -> None:
+    head = ScriptDirectory.from_config(_alembic_config()).get_current_head()
+    async with async_read_session() as session:
+        try:
+            result = await session.execute(text("SELECT version_num FROM alembic_version"))
+            current = result.scalar_one_or_none()
+        except ProgrammingError:
+            current = None
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current or '<none>'}, expected {head}. "
+            "Run `python -m app.bootstrap` before starting the API."
+        )
+
+
+async def bootstrap():
+    async with engine.connect() as lock_conn:
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        try:
+            # Alembic's env.py drives its own event loop, so run it off this one
+            await asyncio.to_thread(run_migrations)
+            async with async_session() as session:
+                domains_created, fields_created = await seed_defaults(session)
+                await session.commit()
+            print(f"Seeded {domains_created} domain(s), {fields_created} field(s)")
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(bootstrap())
@@ -1,8 +1,28 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql+asyncpg://packdb_user:packdb_dev_password@db:5432/packdb"
+    DATABASE_REPLICA_URL: Optional[str] = None  # streaming replica for read-only routes
+    REPLICA_STICKY_SECONDS: int = 5  # reads stay on the primary this long after a write
+    FACET_CACHE_TTL_SECONDS: int = 60
+    ROLLUP_CACHE_TTL_SECONDS: int = 60  # component rollups across packs
+    RESOLUTION_CACHE_TTL_SECONDS: int = 600  # resolved packs under shared priority profiles
+    RESOLUTION_CACHE_MAX_ENTRIES: int = 1000  # ~130 KB each for a full pack
+    VALUE_ARCHIVE_RETENTION_DAYS: int = 180  # deleted values older than this move to field_values_archive
+    CONFLICT_TOLERANCE: float = 0.02  # numeric values within this relative difference agree
+    N_PLUS_ONE_THRESHOLD: int = 10  # same statement this many times in one request logs a warning
+    COMPRESSION_MIN_BYTES: int = 1024  # responses smaller than this go out uncompressed
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = None  # capture statements slower than this; unset = off
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.1  # fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+    TRACING_ENABLED: bool = False  # OpenTelemetry spans for requests, resolver stages and SQL
+    TRACING_EXPORTER: str = "otlp"  # "otlp" (HTTP collector) or "file" (JSON lines)
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0  # fraction of new traces recorded; child spans follow the parent
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     UPLOAD_DIR: str = "/app/uploads"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
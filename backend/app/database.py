@@ -1,3 +1,7 @@
+import time
+from typing import Optional
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -6,12 +10,49 @@ from app.config import settings
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Optional streaming replica — falls back to the primary when not configured
+replica_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, echo=False)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+# Read-only sessions run in autocommit mode: no BEGIN/COMMIT round trips, and
+# closing the session just hands the connection back to the (shared) pool
+async_read_session = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+async_replica_session = async_sessionmaker(
+    (replica_engine or engine).execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Set on responses to mutating requests so the client's next reads go to the
+# primary until the replica has had time to replay the write
+PRIMARY_STICKY_COOKIE = "packdb_primary"
+
+# API clients usually drop cookies, so writes also return this header with
+# the Unix time the pin ends; clients echo it on their reads. It carries the
+# pin to whichever worker serves the next request
+PRIMARY_STICKY_HEADER = "X-Primary-Until"
+
+# Clients that echo neither are pinned by Bearer token, until this monotonic
+# deadline. Kept per worker process, so it only covers reads that land on
+# the worker that handled the write
+_sticky_tokens: dict[str, float] = {}
+_STICKY_TOKENS_PRUNE_AT = 1024
+
 
 class Base(DeclarativeBase):
     pass
 
 
 async def get_db():
+    # Use with Depends(get_db, scope="function"): the commit then happens before
+    # the response is sent, so a client acting on a 2xx always sees its write
     async with async_session() as session:
         try:
             yield session
@@ -19,3 +60,54 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+def _bearer_token(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+
+def _sticky_header_active(request: Request) -> bool:
+    try:
+        return float(request.headers.get(PRIMARY_STICKY_HEADER, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_primary_sticky(request: Request) -> str:
+    """Send the next REPLICA_STICKY_SECONDS of this token's reads to the primary.
+
+    Returns the value for PRIMARY_STICKY_HEADER.
+    """
+    until = f"{time.time() + settings.REPLICA_STICKY_SECONDS:.3f}"
+    token = _bearer_token(request)
+    if token is None:
+        return until
+    now = time.monotonic()
+    if len(_sticky_tokens) >= _STICKY_TOKENS_PRUNE_AT:
+        for expired in [t for t, deadline in _sticky_tokens.items() if deadline <= now]:
+            del _sticky_tokens[expired]
+    _sticky_tokens[token] = now + settings.REPLICA_STICKY_SECONDS
+    return until
+
+
+def read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    if replica_engine is None or PRIMARY_STICKY_COOKIE in request.cookies or _sticky_header_active(request):
+        return async_read_session
+    token = _bearer_token(request)
+    if token is not None and _sticky_tokens.get(token, 0.0) > time.monotonic():
+        return async_read_session
+    return async_replica_session
+
+
+def read_only_request(request: Request) -> None:
+    # For POST endpoints that only read (batch lookups): keeps
+    # replica_read_your_writes from pinning the client to the primary
+    request.state.read_only = True
+
+
+async def get_read_db(request: Request):
+    # Also function-scoped, so the connection is released as soon as the
+    # handler returns instead of after the response has been sent
+    async with read_session_factory(request)() as session:
+        yield session
@@ -2,11 +2,12 @@ from app.models.user import User
 from app.models.pack import Pack
 from app.models.domain import Domain
 from app.models.field import Field
-from app.models.value import FieldValue
-from app.models.source_priority import SourcePriority
+from app.models.value import FieldValue, FieldValueArchive, FieldValueRevision
+from app.models.source_priority import PriorityProfile, SourcePriority
 from app.models.comment import Comment
 from app.models.attachment import Attachment
 from app.models.component import Component, PackComponent
+from app.models.conflict import ValueConflict
 
 __all__ = [
     "User",
@@ -14,9 +15,13 @@ __all__ = [
     "Domain",
     "Field",
     "FieldValue",
+    "FieldValueRevision",
+    "FieldValueArchive",
     "SourcePriority",
+    "PriorityProfile",
     "Comment",
     "Attachment",
     "Component",
     "PackComponent",
+    "ValueConflict",
 ]
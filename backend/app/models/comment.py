@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -10,11 +10,21 @@ class Comment(Base):
     __tablename__ = "comments"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    value_id: Mapped[int] = mapped_column(ForeignKey("field_values.id"), nullable=False)
+    value_id: Mapped[int] = mapped_column(nullable=False)
+    # The value's pack: the foreign key into partitioned field_values needs it
+    pack_id: Mapped[int] = mapped_column(nullable=False)
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     text: Mapped[str] = mapped_column(nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["value_id", "pack_id"], ["field_values.id", "field_values.pack_id"], name="comments_value_fkey"
+        ),
+        # Comment pages per value, in (created_at, id) order
+        Index("idx_comments_value_created", "value_id", "created_at", "id"),
+    )
+
     # Relationships
     value: Mapped["FieldValue"] = relationship(back_populates="comments")
     author: Mapped["User"] = relationship(foreign_keys=[author_id])
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -13,15 +13,35 @@ class Component(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     component_type: Mapped[Optional[str]] = mapped_column(String(100))
+    supplier: Mapped[Optional[str]] = mapped_column(String(200))
     description: Mapped[Optional[str]] = mapped_column()
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
+    __table_args__ = (
+        # One catalog entry per part; NULL type/supplier count as equal
+        Index(
+            "uq_component_identity", "name", "component_type", "supplier",
+            unique=True, postgresql_nulls_not_distinct=True,
+        ),
+        # Supplier lookups are case-insensitive
+        Index("idx_components_supplier", func.lower(text("supplier")), "component_type"),
+        Index("idx_components_type", "component_type"),
+    )
+
 
 class PackComponent(Base):
+    """One bill-of-materials line: a component used in a pack."""
+
     __tablename__ = "pack_components"
 
     pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), primary_key=True)
     component_id: Mapped[int] = mapped_column(ForeignKey("components.id"), primary_key=True)
     domain_id: Mapped[Optional[int]] = mapped_column(ForeignKey("domains.id"))
+    quantity: Mapped[int] = mapped_column(default=1, server_default=text("1"))
     notes: Mapped[Optional[str]] = mapped_column()
+
+    __table_args__ = (
+        # Reverse lookups: which packs use a component (the primary key covers pack -> components)
+        Index("idx_pack_components_component", "component_id", "pack_id"),
+    )
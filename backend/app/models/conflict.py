@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Float, ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ValueConflict(Base):
+    """How far the active values of one pack field agree (app.services.conflicts).
+
+    Only fields with two or more active values have a row.
+    """
+
+    __tablename__ = "value_conflicts"
+
+    pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), primary_key=True)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), primary_key=True)
+    value_count: Mapped[int] = mapped_column(nullable=False)
+    # Values that agree (within tolerance, or equal text) form one group
+    group_count: Mapped[int] = mapped_column(nullable=False)
+    # Share of the values in the largest group, 0-1
+    agreement: Mapped[float] = mapped_column(Float, nullable=False)
+    # (max - min) / max |value| over the numeric values; NULL when fewer than two
+    spread: Mapped[Optional[float]] = mapped_column(Float)
+    is_conflict: Mapped[bool] = mapped_column(nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Disputed fields across packs (GET /api/conflicts?field_id=)
+        Index("idx_value_conflicts_field", "field_id", "agreement", postgresql_where=text("is_conflict")),
+    )
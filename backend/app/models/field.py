@@ -20,6 +20,8 @@ class Field(Base):
     select_options: Mapped[Optional[Any]] = mapped_column(JSONB)
     sort_order: Mapped[int] = mapped_column(default=0)
     description: Mapped[Optional[str]] = mapped_column()
+    # Arithmetic over other number fields by name; see app/services/formulas.py
+    formula: Mapped[Optional[str]] = mapped_column()
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -22,11 +22,19 @@ class Pack(Base):
     platform: Mapped[Optional[str]] = mapped_column(String(100))
     is_active: Mapped[bool] = mapped_column(default=True)
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
+    # Bumped in the same transaction as any change to the pack's values or
+    # their comments; keys shared resolutions (see services/value_resolver.py)
+    revision: Mapped[int] = mapped_column(default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
 
     __table_args__ = (
-        UniqueConstraint("oem", "model", "variant", "year", "market", name="uq_pack_identity"),
+        # NULLS NOT DISTINCT: a missing variant/market is part of the identity (PostgreSQL 15+)
+        UniqueConstraint(
+            "oem", "model", "variant", "year", "market",
+            name="uq_pack_identity",
+            postgresql_nulls_not_distinct=True,
+        ),
     )
 
     # Relationships
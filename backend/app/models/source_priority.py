@@ -1,6 +1,7 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +18,27 @@ class SourcePriority(Base):
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
     priority_order: Mapped[Any] = mapped_column(JSONB, default=DEFAULT_PRIORITY)
+    # Subscribed profile; while set, its order replaces priority_order
+    profile_id: Mapped[Optional[int]] = mapped_column(ForeignKey("priority_profiles.id", ondelete="SET NULL"))
 
     # Relationships
     user: Mapped["User"] = relationship(back_populates="source_priority")
+    profile: Mapped[Optional["PriorityProfile"]] = relationship(back_populates="subscribers")
+
+
+class PriorityProfile(Base):
+    """A named priority order that users share by subscribing to it."""
+
+    __tablename__ = "priority_profiles"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column()
+    priority_order: Mapped[Any] = mapped_column(JSONB, nullable=False)
+    # NULL for the built-in profiles
+    created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    subscribers: Mapped[list["SourcePriority"]] = relationship(back_populates="profile", passive_deletes=True)
@@ -1,29 +1,61 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Float, ForeignKey, Index, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, func, text
+from sqlalchemy.dialects.postgresql import TSTZRANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
 class FieldValue(Base):
+    """A value for one field of a pack, with its source.
+
+    Hash-partitioned on ``pack_id`` (Alembic migration 013), so a pack's
+    values live in one partition. The primary key has to include ``pack_id``;
+    ids all come from one sequence, but nothing enforces their uniqueness
+    alone, so writes must never set ``id`` explicitly. Deleted values are kept (``is_active``)
+    until app.services.archive moves them to ``field_values_archive``.
+    """
+
     __tablename__ = "field_values"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), primary_key=True)
     field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False)
     value_text: Mapped[Optional[str]] = mapped_column()
     value_numeric: Mapped[Optional[float]] = mapped_column(Float)
+    # Parsed bounds in the field's unit (app.services.numeric); NULL when open
+    value_min: Mapped[Optional[float]] = mapped_column(Float)
+    value_max: Mapped[Optional[float]] = mapped_column(Float)
+    value_approximate: Mapped[bool] = mapped_column(default=False, server_default=text("false"))
     source_type: Mapped[str] = mapped_column(String(50), nullable=False)
     source_detail: Mapped[str] = mapped_column(nullable=False)
     contributed_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active: Mapped[bool] = mapped_column(default=True)
+    # Maintained by the formula engine: one active derived value per (pack, field)
+    is_derived: Mapped[bool] = mapped_column(default=False, server_default=text("false"))
+    # Denormalized count of comments, kept by create_comment
+    comment_count: Mapped[int] = mapped_column(default=0, server_default=text("0"))
 
     __table_args__ = (
         Index("idx_values_pack_field", "pack_id", "field_id", "source_type"),
+        # One field across many packs (GET /api/fields/{id}/values)
+        Index("idx_values_field_pack_active", "field_id", "pack_id", postgresql_where=text("is_active")),
+        # Numeric range filters on one field
+        Index(
+            "idx_values_field_numeric", "field_id", "value_numeric",
+            postgresql_where=text("is_active AND value_numeric IS NOT NULL"),
+        ),
+        Index(
+            "uq_values_derived", "pack_id", "field_id", unique=True,
+            postgresql_where=text("is_derived AND is_active"),
+        ),
+        # Archival candidates
+        Index("idx_values_inactive_updated", "updated_at", postgresql_where=text("NOT is_active")),
+        {"postgresql_partition_by": "HASH (pack_id)"},
     )
 
     # Relationships
@@ -31,3 +63,75 @@ class FieldValue(Base):
     field: Mapped["Field"] = relationship(back_populates="values")
     contributor: Mapped["User"] = relationship(foreign_keys=[contributed_by])
     comments: Mapped[list["Comment"]] = relationship(back_populates="value")
+
+
+class FieldValueRevision(Base):
+    """One state of a field value and the period it held (app.services.history).
+
+    Append-only: every write to a value closes its open revision and, unless
+    the value was deleted, opens one with the new contents. ``valid`` is
+    half-open ``[from, to)``; the current revision has no upper bound.
+    """
+
+    __tablename__ = "field_value_revisions"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # No foreign key: history outlives values moved to field_values_archive
+    value_id: Mapped[int] = mapped_column(nullable=False)
+    pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), nullable=False)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False)
+    value_text: Mapped[Optional[str]] = mapped_column()
+    value_numeric: Mapped[Optional[float]] = mapped_column(Float)
+    value_min: Mapped[Optional[float]] = mapped_column(Float)
+    value_max: Mapped[Optional[float]] = mapped_column(Float)
+    value_approximate: Mapped[bool] = mapped_column(default=False, server_default=text("false"))
+    source_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    source_detail: Mapped[str] = mapped_column(nullable=False)
+    contributed_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    is_derived: Mapped[bool] = mapped_column(default=False, server_default=text("false"))
+    # The value's own created_at; REVISION_VALUE_COLUMNS reads it back as naive UTC
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    valid: Mapped[Range[datetime]] = mapped_column(TSTZRANGE, nullable=False)
+    # Who made the change that opened this revision; NULL for backfilled history
+    recorded_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
+
+    __table_args__ = (
+        # Point-in-time reads of a pack: valid @> as_of (needs btree_gist for pack_id)
+        Index("idx_value_revisions_pack_valid", "pack_id", "valid", postgresql_using="gist"),
+        # A value's history, oldest first
+        Index("idx_value_revisions_value_from", "value_id", func.lower(text("valid"))),
+        # At most one open revision per value; also what each write closes
+        Index("uq_value_revisions_open", "value_id", unique=True, postgresql_where=text("upper_inf(valid)")),
+    )
+
+
+class FieldValueArchive(Base):
+    """Deleted values moved out of ``field_values`` (app.services.archive).
+
+    Same columns as ``field_values`` plus ``archived_at``; nothing in the API
+    reads it. A value's history stays in ``field_value_revisions``.
+    """
+
+    __tablename__ = "field_values_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    pack_id: Mapped[int] = mapped_column(ForeignKey("packs.id"), nullable=False)
+    field_id: Mapped[int] = mapped_column(ForeignKey("fields.id"), nullable=False)
+    value_text: Mapped[Optional[str]] = mapped_column()
+    value_numeric: Mapped[Optional[float]] = mapped_column(Float)
+    value_min: Mapped[Optional[float]] = mapped_column(Float)
+    value_max: Mapped[Optional[float]] = mapped_column(Float)
+    value_approximate: Mapped[bool] = mapped_column()
+    source_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    source_detail: Mapped[str] = mapped_column(nullable=False)
+    contributed_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    is_active: Mapped[Optional[bool]] = mapped_column()
+    is_derived: Mapped[bool] = mapped_column()
+    comment_count: Mapped[int] = mapped_column()
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_values_archive_pack", "pack_id"),
+    )
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query, status
+
+from app.config import settings
+from app.models.user import User
+from app.schemas.admin import SlowQueryListResponse, SlowQueryResponse
+from app.utils.deps import get_current_admin
+from app.utils.slow_queries import SLOW_QUERIES
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+@router.get("/slow-queries", response_model=SlowQueryListResponse)
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(get_current_admin),
+):
+    # Newest first; the buffer belongs to whichever worker served this request
+    entries = list(SLOW_QUERIES)[-limit:][::-1]
+    return SlowQueryListResponse(
+        enabled=settings.SLOW_QUERY_THRESHOLD_MS is not None,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        items=[SlowQueryResponse.model_validate(e) for e in entries],
+    )
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: User = Depends(get_current_admin)):
+    SLOW_QUERIES.clear()
@@ -1,72 +1,181 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import literal, select, true, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, read_only_request
 from app.models.comment import Comment
 from app.models.user import User
 from app.models.value import FieldValue
-from app.schemas.comment import CommentCreate, CommentResponse
+from app.schemas.comment import (
+    CommentBatchRequest,
+    CommentBatchResponse,
+    CommentCreate,
+    CommentPage,
+    CommentResponse,
+)
+from app.services.value_resolver import bump_pack_revision, precompute_resolutions, value_conditions
 from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api", tags=["Comments"])
 
+COMMENT_PAGE_SIZE = 50
+COMMENT_PAGE_MAX = 200
+COMMENT_COLUMNS = (
+    Comment.id, Comment.value_id, Comment.author_id, User.display_name.label("author_name"),
+    Comment.text, Comment.created_at,
+)
+
+
+def _encode_cursor(comment: dict) -> str:
+    # Keyset position in (created_at, id) order; opaque to clients
+    raw = f"{comment['created_at'].isoformat()}|{comment['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        created_at, comment_id = datetime.fromisoformat(created_at), int(comment_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    # comments.created_at holds naive UTC; an aware bound would be shifted by the server's time zone
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at, comment_id
+
 
-@router.get("/values/{value_id}/comments", response_model=list[CommentResponse])
+def _page(rows: list[dict], limit: int, total: int) -> dict:
+    """A CommentPage from up to ``limit + 1`` rows; the extra row only signals more."""
+    items = rows[:limit]
+    return {
+        "items": items,
+        "next_cursor": _encode_cursor(items[-1]) if len(rows) > limit else None,
+        "total": total,
+    }
+
+
+@router.get("/values/{value_id}/comments", response_model=CommentPage)
 async def list_comments(
     value_id: int,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(COMMENT_PAGE_SIZE, ge=1, le=COMMENT_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    pack_id: Optional[int] = Query(None, description="the value's pack, if known: limits the lookup to its partition"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Verify value exists
     value_result = await db.execute(
-        select(FieldValue).where(FieldValue.id == value_id, FieldValue.is_active == True)  # noqa: E712
+        select(FieldValue.comment_count).where(*value_conditions(value_id, pack_id))
     )
-    if value_result.scalar_one_or_none() is None:
+    total = value_result.scalar_one_or_none()
+    if total is None:
         raise HTTPException(status_code=404, detail="Value not found")
 
-    result = await db.execute(
-        select(Comment, User.display_name)
+    query = (
+        select(*COMMENT_COLUMNS)
         .join(User, Comment.author_id == User.id)
         .where(Comment.value_id == value_id)
-        .order_by(Comment.created_at.asc())
+        .order_by(Comment.created_at, Comment.id)
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        created_at, comment_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(Comment.created_at, Comment.id)
+            > tuple_(literal(created_at, Comment.created_at.type), literal(comment_id))
+        )
+    rows = [dict(row) for row in (await db.execute(query)).mappings().all()]
+    return FastJSONResponse(_page(rows, limit, total))
+
+
+@router.post("/comments/batch", response_model=CommentBatchResponse, dependencies=[Depends(read_only_request)])
+async def get_comments_batch(
+    data: CommentBatchRequest,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """The first comments of many values at once, e.g. every value on a pack page."""
+    # POST only to carry the id list; nothing is written
+    value_ids = list(dict.fromkeys(data.value_ids))
+    # Each value's first limit + 1 comments, probed on idx_comments_value_created
+    first = (
+        select(Comment.id, Comment.author_id, Comment.text, Comment.created_at)
+        .where(Comment.value_id == FieldValue.id)
+        .order_by(Comment.created_at, Comment.id)
+        .limit(data.limit + 1)
+        .lateral("first_comments")
     )
-    rows = result.all()
-
-    return [
-        CommentResponse(
-            id=comment.id,
-            value_id=comment.value_id,
-            author_id=comment.author_id,
-            author_name=display_name,
-            text=comment.text,
-            created_at=comment.created_at,
+    result = await db.execute(
+        select(
+            FieldValue.id.label("value_id"), FieldValue.comment_count,
+            first.c.id, first.c.author_id, User.display_name, first.c.text, first.c.created_at,
         )
-        for comment, display_name in rows
-    ]
+        .select_from(FieldValue)
+        .outerjoin(first, true())
+        .outerjoin(User, first.c.author_id == User.id)
+        .where(FieldValue.id.in_(value_ids), FieldValue.is_active == True)  # noqa: E712
+        .order_by(FieldValue.id, first.c.created_at, first.c.id)
+    )
+
+    rows_by_value: dict[int, list[dict]] = {}
+    totals: dict[int, int] = {}
+    for value_id, total, comment_id, author_id, author_name, text, created_at in result.all():
+        totals[value_id] = total
+        rows = rows_by_value.setdefault(value_id, [])
+        if comment_id is not None:
+            rows.append({
+                "id": comment_id,
+                "value_id": value_id,
+                "author_id": author_id,
+                "author_name": author_name,
+                "text": text,
+                "created_at": created_at,
+            })
+
+    return FastJSONResponse({
+        "values": {vid: _page(rows_by_value[vid], data.limit, totals[vid]) for vid in value_ids if vid in totals},
+        "missing": [vid for vid in value_ids if vid not in totals],
+    })
 
 
 @router.post("/values/{value_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     value_id: int,
     data: CommentCreate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    pack_id: Optional[int] = Query(None, description="the value's pack, if known: limits the lookup to its partition"),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Verify value exists
-    value_result = await db.execute(
-        select(FieldValue).where(FieldValue.id == value_id, FieldValue.is_active == True)  # noqa: E712
-    )
-    if value_result.scalar_one_or_none() is None:
+    value_result = await db.execute(select(FieldValue).where(*value_conditions(value_id, pack_id)))
+    fv = value_result.scalar_one_or_none()
+    if fv is None:
         raise HTTPException(status_code=404, detail="Value not found")
 
     comment = Comment(
         value_id=value_id,
+        pack_id=fv.pack_id,
         author_id=current_user.id,
         text=data.text,
     )
     db.add(comment)
     await db.flush()
+    # Comment counts are part of the pack's resolved values
+    await bump_pack_revision(db, fv.pack_id)
+    # In SQL, so concurrent comments on the value both count; a comment is not an edit of the value
+    await db.execute(
+        update(FieldValue)
+        .where(FieldValue.id == value_id, FieldValue.pack_id == fv.pack_id)
+        .values(comment_count=FieldValue.comment_count + 1, updated_at=FieldValue.updated_at)
+    )
+    background_tasks.add_task(precompute_resolutions, [fv.pack_id])
 
     return CommentResponse(
         id=comment.id,
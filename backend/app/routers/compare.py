@@ -1,22 +1,38 @@
+from datetime import datetime
+from typing import Literal, Optional, Union
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.pack import Pack
 from app.models.user import User
-from app.schemas.pack import PackResponse
-from app.schemas.value import CompareDomainEntry, CompareFieldEntry, CompareResponse
-from app.services.value_resolver import resolve_pack_values
+from app.schemas.value import CompactCompareResponse, CompareResponse, PackDiffResponse
+from app.services.diff import diff_resolved
+from app.services.serialization import PACK_COLUMNS, CompactEncoder, compact_field, pack_row_to_dict
+from app.services.history import as_utc
+from app.services.value_resolver import (
+    get_user_profile,
+    resolve_pack_values,
+    resolve_pack_values_shared,
+    resolve_packs_values,
+)
 from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api", tags=["Compare"])
 
+DIFF_MAX_PACKS = 50
+DIFF_PACK_COLUMNS = (Pack.id.label("pack_id"), Pack.oem, Pack.model, Pack.variant, Pack.year, Pack.market)
+
 
-@router.get("/compare", response_model=CompareResponse)
+@router.get("/compare", response_model=Union[CompareResponse, CompactCompareResponse])
 async def compare_packs(
     ids: str = Query(..., description="Comma-separated pack IDs (2-3)"),
-    db: AsyncSession = Depends(get_db),
+    format: Literal["full", "compact"] = Query("full", description="compact: dictionary-encoded value rows"),
+    as_of: Optional[datetime] = Query(None, description="values as they stood at this time (ISO 8601, UTC if no offset)"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Parse and validate IDs
@@ -28,85 +44,124 @@ async def compare_packs(
     if len(pack_ids) < 2 or len(pack_ids) > 3:
         raise HTTPException(status_code=422, detail="Must provide 2 or 3 pack IDs")
 
-    # Fetch all packs
-    packs_data = []
+    # Fetch all packs in one query, keeping the requested order
+    result = await db.execute(
+        select(*PACK_COLUMNS, User.display_name, Pack.revision)
+        .outerjoin(User, Pack.created_by == User.id)
+        .where(Pack.id.in_(pack_ids), Pack.is_active == True)  # noqa: E712
+    )
+    rows = {row.id: row for row in result.all()}
     for pid in pack_ids:
-        result = await db.execute(
-            select(Pack, User.display_name)
-            .outerjoin(User, Pack.created_by == User.id)
-            .where(Pack.id == pid, Pack.is_active == True)  # noqa: E712
-        )
-        row = result.one_or_none()
-        if row is None:
+        if pid not in rows:
             raise HTTPException(status_code=404, detail=f"Pack {pid} not found")
-        pack, creator_name = row
-        packs_data.append((pack, creator_name))
+    found = {pid: pack_row_to_dict(row[:-2], row[-2]) for pid, row in rows.items()}
 
-    # Resolve values for each pack
+    # Resolve values for each pack (shared with concurrent detail/compare
+    # requests for the same pack), indexed by field for the lookups below
+    priority_order, shared = await get_user_profile(db, current_user.id)
     resolved_by_pack = {}
-    for pack, _ in packs_data:
-        resolved_by_pack[pack.id] = await resolve_pack_values(db, pack.id, current_user.id)
+    resolved_values = {}
+    for pid in pack_ids:
+        if as_of is not None:
+            resolved_by_pack[pid] = await resolve_pack_values(
+                db, pid, priority_order=priority_order, as_of=as_utc(as_of)
+            )
+        else:
+            resolved_by_pack[pid] = await resolve_pack_values_shared(
+                db, pid, rows[pid].revision, priority_order, shared=shared
+            )
+        resolved_values[pid] = {
+            field["field_id"]: field["resolved_value"]
+            for domain in resolved_by_pack[pid]
+            for field in domain["fields"]
+        }
 
     # Build comparison structure — use first pack's domain/field structure as reference
     reference = resolved_by_pack[pack_ids[0]]
-    compare_domains = []
-
-    for ref_domain in reference:
-        compare_fields = []
-        for ref_field in ref_domain.fields:
-            values_by_pack = {}
-            for pid in pack_ids:
-                pack_domains = resolved_by_pack[pid]
-                # Find matching domain and field
-                value = None
-                for pd in pack_domains:
-                    if pd.domain_id == ref_domain.domain_id:
-                        for pf in pd.fields:
-                            if pf.field_id == ref_field.field_id:
-                                value = pf.resolved_value
-                                break
-                        break
-                values_by_pack[pid] = value
-
-            compare_fields.append(
-                CompareFieldEntry(
-                    field_id=ref_field.field_id,
-                    field_name=ref_field.field_name,
-                    display_name=ref_field.display_name,
-                    unit=ref_field.unit,
-                    data_type=ref_field.data_type,
-                    values_by_pack=values_by_pack,
-                )
-            )
+    if format == "compact":
+        encoder = CompactEncoder()
+        compact = [
+            {
+                "domain_id": ref_domain["domain_id"],
+                "domain_name": ref_domain["domain_name"],
+                "sort_order": ref_domain["sort_order"],
+                "fields": [
+                    compact_field(
+                        ref_field,
+                        [encoder.row(resolved_values[pid].get(ref_field["field_id"])) for pid in pack_ids],
+                    )
+                    for ref_field in ref_domain["fields"]
+                ],
+            }
+            for ref_domain in reference
+        ]
+        return FastJSONResponse({
+            "format": "compact",
+            "packs": [found[pid] for pid in pack_ids],
+            "values": encoder.table(),
+            "domains": compact,
+        })
 
-        compare_domains.append(
-            CompareDomainEntry(
-                domain_id=ref_domain.domain_id,
-                domain_name=ref_domain.domain_name,
-                sort_order=ref_domain.sort_order,
-                fields=compare_fields,
-            )
-        )
-
-    pack_responses = [
-        PackResponse(
-            id=pack.id,
-            oem=pack.oem,
-            model=pack.model,
-            year=pack.year,
-            variant=pack.variant,
-            market=pack.market,
-            fuel_type=pack.fuel_type,
-            vehicle_class=pack.vehicle_class,
-            drivetrain=pack.drivetrain,
-            platform=pack.platform,
-            is_active=pack.is_active,
-            created_by=pack.created_by,
-            created_by_name=creator_name,
-            created_at=pack.created_at,
-            updated_at=pack.updated_at,
-        )
-        for pack, creator_name in packs_data
+    compare_domains = [
+        {
+            "domain_id": ref_domain["domain_id"],
+            "domain_name": ref_domain["domain_name"],
+            "sort_order": ref_domain["sort_order"],
+            "fields": [
+                {
+                    "field_id": ref_field["field_id"],
+                    "field_name": ref_field["field_name"],
+                    "display_name": ref_field["display_name"],
+                    "unit": ref_field["unit"],
+                    "data_type": ref_field["data_type"],
+                    "values_by_pack": {
+                        pid: resolved_values[pid].get(ref_field["field_id"]) for pid in pack_ids
+                    },
+                }
+                for ref_field in ref_domain["fields"]
+            ],
+        }
+        for ref_domain in reference
     ]
 
-    return CompareResponse(packs=pack_responses, domains=compare_domains)
+    # Built from rows in the CompareResponse shape; encoded without re-validation
+    return FastJSONResponse({"packs": [found[pid] for pid in pack_ids], "domains": compare_domains})
+
+
+@router.get("/compare/diff", response_model=PackDiffResponse)
+async def diff_packs(
+    ids: str = Query(..., description=f"Comma-separated pack IDs (2-{DIFF_MAX_PACKS}); the first is the baseline"),
+    as_of: Optional[datetime] = Query(None, description="values as they stood at this time (ISO 8601, UTC if no offset)"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Only the fields whose resolved values differ from the first pack's."""
+    try:
+        pack_ids = [int(x.strip()) for x in ids.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+
+    if len(pack_ids) < 2 or len(pack_ids) > DIFF_MAX_PACKS:
+        raise HTTPException(status_code=422, detail=f"Must provide 2 to {DIFF_MAX_PACKS} pack IDs")
+
+    result = await db.execute(
+        select(*DIFF_PACK_COLUMNS).where(Pack.id.in_(pack_ids), Pack.is_active == True)  # noqa: E712
+    )
+    rows = {row.pack_id: row for row in result.all()}
+    for pid in pack_ids:
+        if pid not in rows:
+            raise HTTPException(status_code=404, detail=f"Pack {pid} not found")
+
+    if as_of is not None:
+        as_of = as_utc(as_of)
+    priority_order, _ = await get_user_profile(db, current_user.id)
+    # Only resolved values are compared: one values query for every pack
+    resolved = await resolve_packs_values(db, pack_ids, priority_order, include_all_values=False, as_of=as_of)
+    compared, fields = diff_resolved([resolved[pid] for pid in pack_ids])
+
+    # Built from rows in the PackDiffResponse shape; encoded without re-validation
+    return FastJSONResponse({
+        "columns": [{**rows[pid]._asdict(), "as_of": as_of} for pid in pack_ids],
+        "compared_fields": compared,
+        "fields": fields,
+    })
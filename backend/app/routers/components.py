@@ -0,0 +1,375 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.models.component import Component, PackComponent
+from app.models.domain import Domain
+from app.models.pack import Pack
+from app.models.user import User
+from app.schemas.component import (
+    BomLineResponse,
+    BomLineUpdate,
+    ComponentCreate,
+    ComponentListResponse,
+    ComponentPackListResponse,
+    ComponentResponse,
+    ComponentRollupResponse,
+    ComponentUpdate,
+    PackBomResponse,
+    RollupGroupBy,
+)
+from app.services.cache import clear_on_commit
+from app.services.components import component_filters, compute_rollup, rollup_cache, rollup_flight
+from app.services.pack_filters import pack_filters
+from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter(prefix="/api", tags=["Components"])
+
+# Active packs using each component, for the component views
+_pack_count = (
+    select(func.count())
+    .select_from(PackComponent)
+    .join(Pack, Pack.id == PackComponent.pack_id)
+    .where(PackComponent.component_id == Component.id, Pack.is_active == True)  # noqa: E712
+    .correlate(Component)
+    .scalar_subquery()
+    .label("pack_count")
+)
+
+
+def _component_to_response(component: Component, pack_count: int) -> ComponentResponse:
+    return ComponentResponse(
+        id=component.id,
+        name=component.name,
+        component_type=component.component_type,
+        supplier=component.supplier,
+        description=component.description,
+        created_by=component.created_by,
+        created_at=component.created_at,
+        pack_count=pack_count,
+    )
+
+
+async def _get_component(db: AsyncSession, component_id: int) -> Component:
+    result = await db.execute(select(Component).where(Component.id == component_id))
+    component = result.scalar_one_or_none()
+    if component is None:
+        raise HTTPException(status_code=404, detail="Component not found")
+    return component
+
+
+async def _get_active_pack(db: AsyncSession, pack_id: int) -> None:
+    result = await db.execute(select(Pack.id).where(Pack.id == pack_id, Pack.is_active == True))  # noqa: E712
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Pack not found")
+
+
+def _check_can_edit(component: Component, user: User) -> None:
+    # Catalog entries belong to their creator (and admins); BOM lines are open to all
+    if user.role != "admin" and (component.created_by is None or component.created_by != user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to change this component")
+
+
+async def _check_identity_free(
+    db: AsyncSession,
+    name: str,
+    component_type: Optional[str],
+    supplier: Optional[str],
+    component_id: int | None = None,
+) -> None:
+    result = await db.execute(
+        select(Component.id).where(
+            Component.name == name,
+            Component.component_type.is_not_distinct_from(component_type),
+            Component.supplier.is_not_distinct_from(supplier),
+            Component.id != component_id,
+        )
+    )
+    if result.first() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A component with this name, type and supplier already exists",
+        )
+
+
+async def _pack_count_of(db: AsyncSession, component_id: int) -> int:
+    result = await db.execute(select(_pack_count).select_from(Component).where(Component.id == component_id))
+    return result.scalar_one()
+
+
+@router.get("/components/", response_model=ComponentListResponse)
+async def list_components(
+    component_type: Optional[str] = None,
+    supplier: Optional[str] = None,
+    search: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    conditions = component_filters(component_type, supplier)
+    if search:
+        pattern = f"%{search}%"
+        conditions.append(or_(Component.name.ilike(pattern), Component.supplier.ilike(pattern)))
+
+    total = (await db.execute(select(func.count()).select_from(Component).where(*conditions))).scalar_one()
+    result = await db.execute(
+        select(Component, _pack_count)
+        .where(*conditions)
+        .order_by(Component.name, Component.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    items = [_component_to_response(component, count) for component, count in result.all()]
+    return ComponentListResponse(items=items, total=total, page=page, page_size=page_size)
+
+
+@router.post("/components/", response_model=ComponentResponse, status_code=status.HTTP_201_CREATED)
+async def create_component(
+    data: ComponentCreate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    await _check_identity_free(db, data.name, data.component_type, data.supplier)
+    component = Component(
+        name=data.name,
+        component_type=data.component_type,
+        supplier=data.supplier,
+        description=data.description,
+        created_by=current_user.id,
+    )
+    db.add(component)
+    await db.flush()
+    return _component_to_response(component, 0)
+
+
+@router.get("/components/packs", response_model=ComponentPackListResponse)
+async def list_component_packs(
+    component_id: Optional[int] = None,
+    component_type: Optional[str] = None,
+    supplier: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Packs using a component, or any component of a supplier and/or type."""
+    conditions = component_filters(component_type, supplier)
+    if component_id is not None:
+        conditions.append(PackComponent.component_id == component_id)
+    if not conditions:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Filter by component_id, supplier or component_type",
+        )
+
+    base = (
+        select(PackComponent.pack_id)
+        .join(Component, Component.id == PackComponent.component_id)
+        .join(Pack, Pack.id == PackComponent.pack_id)
+        .where(Pack.is_active == True, *conditions)  # noqa: E712
+    )
+    matches = base.subquery()
+    counts = (await db.execute(select(func.count(), func.count(func.distinct(matches.c.pack_id))))).one()
+    result = await db.execute(
+        base.with_only_columns(
+            Pack.id.label("pack_id"), Pack.oem, Pack.model, Pack.variant, Pack.year, Pack.market,
+            Component.id.label("component_id"), Component.name.label("component_name"),
+            Component.component_type, Component.supplier, PackComponent.quantity,
+        )
+        .order_by(Pack.oem, Pack.model, Pack.year, Pack.id, Component.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    items = [dict(row) for row in result.mappings()]
+    return FastJSONResponse({
+        "items": items, "total": counts[0], "pack_count": counts[1], "page": page, "page_size": page_size,
+    })
+
+
+@router.get("/components/rollup", response_model=ComponentRollupResponse)
+async def get_component_rollup(
+    group_by: RollupGroupBy = "supplier",
+    component_type: Optional[str] = None,
+    supplier: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    oem: Optional[str] = None,
+    model: Optional[str] = None,
+    market: Optional[str] = None,
+    fuel_type: Optional[str] = None,
+    vehicle_class: Optional[str] = None,
+    drivetrain: Optional[str] = None,
+    platform: Optional[str] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Packs using each supplier, component type or component, among the packs
+    matching the browse filters."""
+    raw_filters = {
+        "oem": oem, "model": model, "market": market, "fuel_type": fuel_type,
+        "vehicle_class": vehicle_class, "drivetrain": drivetrain, "platform": platform,
+        "search": search,
+    }
+    signature = (
+        group_by, component_type, supplier.lower() if supplier else None, limit,
+        tuple(sorted((k, v) for k, v in raw_filters.items() if v)),
+    )
+    cached = rollup_cache.get(signature)
+    if cached is not None:
+        return FastJSONResponse(cached)
+
+    pack_conditions = list(pack_filters(raw_filters).values())
+    conditions = component_filters(component_type, supplier)
+    generation = rollup_cache.generation
+    response = await rollup_flight.do(
+        (signature, generation), lambda: compute_rollup(db, group_by, pack_conditions, conditions, limit)
+    )
+    if rollup_cache.generation == generation:
+        rollup_cache.set(signature, response)
+    return FastJSONResponse(response)
+
+
+@router.get("/components/{component_id}", response_model=ComponentResponse)
+async def get_component(
+    component_id: int,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    component = await _get_component(db, component_id)
+    return _component_to_response(component, await _pack_count_of(db, component.id))
+
+
+@router.put("/components/{component_id}", response_model=ComponentResponse)
+async def update_component(
+    component_id: int,
+    data: ComponentUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    component = await _get_component(db, component_id)
+    _check_can_edit(component, current_user)
+    update_data = data.model_dump(exclude_unset=True)
+    if update_data.get("name") is None:
+        update_data.pop("name", None)
+    if update_data:
+        await _check_identity_free(
+            db,
+            update_data.get("name", component.name),
+            update_data.get("component_type", component.component_type),
+            update_data.get("supplier", component.supplier),
+            component.id,
+        )
+
+    for key, value in update_data.items():
+        setattr(component, key, value)
+    await db.flush()
+    # Renaming a component or its supplier regroups rollups
+    clear_on_commit(db, rollup_cache)
+    return _component_to_response(component, await _pack_count_of(db, component.id))
+
+
+@router.delete("/components/{component_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_component(
+    component_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    component = await _get_component(db, component_id)
+    _check_can_edit(component, current_user)
+    # Lines on deleted packs count too: they would come back with the pack
+    result = await db.execute(
+        select(func.count()).select_from(PackComponent).where(PackComponent.component_id == component.id)
+    )
+    if (used := result.scalar_one()) > 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Component is on {used} bill(s) of materials; remove it from them first",
+        )
+    await db.delete(component)
+    await db.flush()
+
+
+@router.get("/packs/{pack_id}/components", response_model=PackBomResponse)
+async def get_pack_bom(
+    pack_id: int,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    await _get_active_pack(db, pack_id)
+    result = await db.execute(
+        select(
+            Component.id.label("component_id"), Component.name, Component.component_type, Component.supplier,
+            PackComponent.quantity, PackComponent.domain_id, Domain.name.label("domain_name"), PackComponent.notes,
+        )
+        .select_from(PackComponent)
+        .join(Component, Component.id == PackComponent.component_id)
+        .outerjoin(Domain, Domain.id == PackComponent.domain_id)
+        .where(PackComponent.pack_id == pack_id)
+        .order_by(Domain.sort_order.nulls_last(), Component.component_type.nulls_last(), Component.name)
+    )
+    lines = [dict(row) for row in result.mappings()]
+    return FastJSONResponse({
+        "pack_id": pack_id,
+        "lines": lines,
+        "component_count": len(lines),
+        "total_quantity": sum(line["quantity"] for line in lines),
+    })
+
+
+@router.put("/packs/{pack_id}/components/{component_id}", response_model=BomLineResponse)
+async def put_bom_line(
+    pack_id: int,
+    component_id: int,
+    data: BomLineUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Add the component to the pack's BOM, or replace its line."""
+    await _get_active_pack(db, pack_id)
+    component = await _get_component(db, component_id)
+    domain_name = None
+    if data.domain_id is not None:
+        result = await db.execute(select(Domain.name).where(Domain.id == data.domain_id))
+        domain_name = result.scalar_one_or_none()
+        if domain_name is None:
+            raise HTTPException(status_code=404, detail="Domain not found")
+
+    line = {"quantity": data.quantity, "domain_id": data.domain_id, "notes": data.notes}
+    await db.execute(
+        pg_insert(PackComponent)
+        .values(pack_id=pack_id, component_id=component.id, **line)
+        .on_conflict_do_update(index_elements=["pack_id", "component_id"], set_=line)
+    )
+    clear_on_commit(db, rollup_cache)
+    return BomLineResponse(
+        component_id=component.id,
+        name=component.name,
+        component_type=component.component_type,
+        supplier=component.supplier,
+        domain_name=domain_name,
+        **line,
+    )
+
+
+@router.delete("/packs/{pack_id}/components/{component_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_bom_line(
+    pack_id: int,
+    component_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    await _get_active_pack(db, pack_id)
+    result = await db.execute(
+        delete(PackComponent)
+        .where(PackComponent.pack_id == pack_id, PackComponent.component_id == component_id)
+        .returning(PackComponent.component_id)
+    )
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Component is not on this pack's bill of materials")
+    clear_on_commit(db, rollup_cache)
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.models.conflict import ValueConflict
+from app.models.field import Field
+from app.models.pack import Pack
+from app.models.user import User
+from app.schemas.conflict import ConflictListResponse
+from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter(prefix="/api/conflicts", tags=["Conflicts"])
+
+CONFLICT_COLUMNS = (
+    ValueConflict.pack_id, Pack.oem, Pack.model, Pack.variant, Pack.year,
+    ValueConflict.field_id, Field.name.label("field_name"), Field.display_name, Field.unit, Field.domain_id,
+    ValueConflict.value_count, ValueConflict.group_count, ValueConflict.agreement, ValueConflict.spread,
+    ValueConflict.is_conflict, ValueConflict.computed_at,
+)
+_CONFLICT_KEYS = tuple(c.key for c in CONFLICT_COLUMNS)
+
+
+@router.get("/", response_model=ConflictListResponse)
+async def list_conflicts(
+    pack_id: Optional[int] = None,
+    field_id: Optional[int] = None,
+    domain_id: Optional[int] = None,
+    include_agreeing: bool = Query(False, description="also list fields whose values all agree"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stored source-agreement scores, most disputed first."""
+    query = (
+        select(*CONFLICT_COLUMNS)
+        .join(Pack, ValueConflict.pack_id == Pack.id)
+        .join(Field, ValueConflict.field_id == Field.id)
+        .where(Pack.is_active == True, Field.is_active == True)  # noqa: E712
+    )
+    if not include_agreeing:
+        query = query.where(ValueConflict.is_conflict == True)  # noqa: E712
+    if pack_id is not None:
+        query = query.where(ValueConflict.pack_id == pack_id)
+    if field_id is not None:
+        query = query.where(ValueConflict.field_id == field_id)
+    if domain_id is not None:
+        query = query.where(Field.domain_id == domain_id)
+
+    total_result = await db.execute(
+        select(func.count()).select_from(query.with_only_columns(ValueConflict.pack_id).subquery())
+    )
+    total = total_result.scalar_one()
+
+    result = await db.execute(
+        query.order_by(
+            ValueConflict.agreement, ValueConflict.spread.desc().nulls_last(),
+            ValueConflict.pack_id, ValueConflict.field_id,
+        )
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    items = [dict(zip(_CONFLICT_KEYS, row)) for row in result.all()]
+    return FastJSONResponse({"items": items, "total": total, "page": page, "page_size": page_size})
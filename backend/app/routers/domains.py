@@ -1,20 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.domain import Domain
 from app.models.field import Field
 from app.models.user import User
 from app.schemas.domain import DomainCreate, DomainResponse
 from app.schemas.field import FieldCreate, FieldResponse
+from app.services.cache import clear_on_commit
+from app.services.formulas import FormulaError, load_registry, rebuild_derived_fields
+from app.services.value_resolver import resolution_cache
 from app.utils.deps import get_current_user
 
 router = APIRouter(prefix="/api/domains", tags=["Domains"])
 
 
 @router.get("/", response_model=list[DomainResponse])
-async def list_domains(db: AsyncSession = Depends(get_db)):
+async def list_domains(db: AsyncSession = Depends(get_read_db, scope="function")):
     result = await db.execute(select(Domain).order_by(Domain.sort_order))
     domains = result.scalars().all()
     return [DomainResponse.model_validate(d) for d in domains]
@@ -23,7 +26,7 @@ async def list_domains(db: AsyncSession = Depends(get_db)):
 @router.post("/", response_model=DomainResponse, status_code=status.HTTP_201_CREATED)
 async def create_domain(
     data: DomainCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Check for duplicate name
@@ -43,12 +46,14 @@ async def create_domain(
     )
     db.add(domain)
     await db.flush()
+    # Cached resolutions list every domain and field
+    clear_on_commit(db, resolution_cache)
 
     return DomainResponse.model_validate(domain)
 
 
 @router.get("/{domain_id}/fields", response_model=list[FieldResponse])
-async def list_domain_fields(domain_id: int, db: AsyncSession = Depends(get_db)):
+async def list_domain_fields(domain_id: int, db: AsyncSession = Depends(get_read_db, scope="function")):
     # Verify domain exists
     domain_result = await db.execute(select(Domain).where(Domain.id == domain_id))
     if domain_result.scalar_one_or_none() is None:
@@ -67,7 +72,8 @@ async def list_domain_fields(domain_id: int, db: AsyncSession = Depends(get_db))
 async def create_field(
     domain_id: int,
     data: FieldCreate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Verify domain exists
@@ -85,6 +91,13 @@ async def create_field(
             detail="A field with this name already exists in this domain",
         )
 
+    if data.formula is not None:
+        registry = await load_registry(db)
+        try:
+            registry.check(None, data.formula)
+        except FormulaError as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
     field = Field(
         domain_id=domain_id,
         name=data.name,
@@ -94,9 +107,15 @@ async def create_field(
         select_options=data.select_options,
         sort_order=data.sort_order or 0,
         description=data.description,
+        formula=data.formula,
         created_by=current_user.id,
     )
     db.add(field)
     await db.flush()
+    clear_on_commit(db, resolution_cache)
+
+    if field.formula is not None:
+        # Runs after the response, once this transaction has committed
+        background_tasks.add_task(rebuild_derived_fields, [field.id], current_user.id)
 
     return FieldResponse.model_validate(field)
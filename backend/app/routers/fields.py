@@ -1,21 +1,111 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.database import get_db, get_read_db, read_session_factory
 from app.models.field import Field
+from app.models.pack import Pack
 from app.models.user import User
-from app.schemas.field import FieldResponse, FieldUpdate
+from app.schemas.field import FieldResponse, FieldUpdate, FieldValuesResponse
+from app.services.cache import clear_on_commit
+from app.services.formulas import FormulaError, load_registry, rebuild_derived_fields
+from app.services.numeric import renormalize_field
+from app.services.pack_filters import pack_filters
+from app.services.value_resolver import (
+    field_values_count_query,
+    field_values_query,
+    get_user_priority,
+    resolution_cache,
+    resolve_field_rows,
+)
 from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse, NDJSONStreamingResponse
 
 router = APIRouter(prefix="/api/fields", tags=["Fields"])
 
+STREAM_BATCH_SIZE = 1000
+
+
+async def _stream_field_rows(session_factory: async_sessionmaker[AsyncSession], query):
+    # Keyset batches on pack id, each on a short-lived session: read sessions
+    # autocommit (no server-side cursor), and no connection stays checked out
+    # while a slow client drains the stream
+    after = 0
+    while True:
+        async with session_factory() as session:
+            items = await resolve_field_rows(
+                session, query.where(Pack.id > after).order_by(Pack.id).limit(STREAM_BATCH_SIZE)
+            )
+        for item in items:
+            yield item
+        if len(items) < STREAM_BATCH_SIZE:
+            return
+        after = items[-1]["pack_id"]
+
+
+@router.get("/{field_id}/values", response_model=FieldValuesResponse)
+async def get_field_values(
+    field_id: int,
+    request: Request,
+    oem: Optional[str] = None,
+    model: Optional[str] = None,
+    market: Optional[str] = None,
+    fuel_type: Optional[str] = None,
+    vehicle_class: Optional[str] = None,
+    drivetrain: Optional[str] = None,
+    platform: Optional[str] = None,
+    search: Optional[str] = None,
+    include_missing: bool = Query(True, description="include packs without a value for this field"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=1000),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson: stream every matching pack, ignoring paging"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    result = await db.execute(
+        select(Field).where(Field.id == field_id, Field.is_active == True)  # noqa: E712
+    )
+    field = result.scalar_one_or_none()
+    if field is None:
+        raise HTTPException(status_code=404, detail="Field not found")
+
+    priority_order = await get_user_priority(db, current_user.id)
+    filters = pack_filters({
+        "oem": oem, "model": model, "market": market, "fuel_type": fuel_type,
+        "vehicle_class": vehicle_class, "drivetrain": drivetrain, "platform": platform,
+        "search": search,
+    })
+    query = field_values_query(field_id, priority_order, include_missing).where(*filters.values())
+
+    if format == "ndjson":
+        # One FieldPackValue per line, in pack id order
+        return NDJSONStreamingResponse(_stream_field_rows(read_session_factory(request), query))
+
+    total_result = await db.execute(
+        field_values_count_query(field_id, include_missing).where(*filters.values())
+    )
+    total = total_result.scalar_one()
+    items = await resolve_field_rows(
+        db, query.order_by(Pack.id).offset((page - 1) * page_size).limit(page_size)
+    )
+
+    return FastJSONResponse({
+        "field": FieldResponse.model_validate(field).model_dump(),
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+    })
+
 
 @router.put("/{field_id}", response_model=FieldResponse)
 async def update_field(
     field_id: int,
     data: FieldUpdate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -26,17 +116,52 @@ async def update_field(
         raise HTTPException(status_code=404, detail="Field not found")
 
     update_data = data.model_dump(exclude_unset=True)
+    formula = update_data.get("formula", field.formula)
+    data_type = update_data.get("data_type", field.data_type)
+    if {"name", "data_type", "formula"} & update_data.keys():
+        registry = await load_registry(db)
+        # Formulas refer to their inputs by name and read them as numbers
+        used_by = registry.referenced_by(field.id)
+        if used_by and (update_data.get("name", field.name) != field.name or data_type != "number"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Field is an input to the formulas of: {', '.join(used_by)}",
+            )
+        if formula is not None:
+            if data_type != "number":
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="formula requires data_type 'number'",
+                )
+            try:
+                registry.check(field.id, formula)
+            except FormulaError as exc:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    formula_changed = formula != field.formula
+    # Stored numbers are parsed in the field's unit; re-parse them when it changes
+    parsing_changed = any(
+        key in update_data and update_data[key] != getattr(field, key) for key in ("unit", "data_type")
+    )
+
     for key, value in update_data.items():
         setattr(field, key, value)
 
     await db.flush()
+    # Cached resolutions carry field metadata and are keyed by pack revision only
+    clear_on_commit(db, resolution_cache)
+    if formula_changed:
+        # Recalculates every pack after the response, once this transaction has committed
+        background_tasks.add_task(rebuild_derived_fields, [field.id], current_user.id)
+    if parsing_changed:
+        background_tasks.add_task(renormalize_field, field.id, current_user.id)
     return FieldResponse.model_validate(field)
 
 
 @router.delete("/{field_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_field(
     field_id: int,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -46,5 +171,16 @@ async def delete_field(
     if field is None:
         raise HTTPException(status_code=404, detail="Field not found")
 
+    used_by = (await load_registry(db)).referenced_by(field.id)
+    if used_by:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Field is an input to the formulas of: {', '.join(used_by)}",
+        )
+
     field.is_active = False
     await db.flush()
+    clear_on_commit(db, resolution_cache)
+    if field.formula is not None:
+        # Retire its calculated values
+        background_tasks.add_task(rebuild_derived_fields, [field.id], current_user.id)
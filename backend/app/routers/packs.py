@@ -1,19 +1,67 @@
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import and_, case, func, literal_column, or_, select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db, read_only_request
+from app.models.domain import Domain
+from app.models.field import Field
 from app.models.pack import Pack
+from app.models.source_priority import PriorityProfile
 from app.models.user import User
-from app.schemas.pack import PackCreate, PackListResponse, PackResponse, PackUpdate
-from app.schemas.value import PackDetailResponse
-from app.services.value_resolver import resolve_pack_values
+from app.schemas.pack import (
+    FacetValueCount,
+    PackBulkUpsert,
+    PackCreate,
+    PackFacetsResponse,
+    PackListResponse,
+    PackResponse,
+    PackUpdate,
+    PackUpsertResponse,
+)
+from app.schemas.source_priority import WHAT_IF_MAX_PACKS, PriorityWhatIfRequest, PriorityWhatIfResponse
+from app.schemas.value import (
+    CompactPackDetailResponse,
+    PackBatchRequest,
+    PackBatchResponse,
+    PackDetailResponse,
+    PackDiffResponse,
+)
+from app.services.cache import TTLCache, clear_on_commit
+from app.services.components import rollup_cache
+from app.services.diff import diff_resolved
+from app.services.history import as_utc
+from app.services.pack_filters import pack_filters
+from app.services.singleflight import SingleFlight
+from app.services.serialization import PACK_COLUMNS, CompactEncoder, compact_domains, pack_row_to_dict
+from app.services.value_resolver import (
+    get_user_priority,
+    get_user_profile,
+    resolve_pack_values,
+    resolve_pack_values_shared,
+    resolve_packs_values,
+    resolve_winners,
+)
 from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/packs", tags=["Packs"])
 
+IDENTITY_FIELDS = ("oem", "model", "variant", "year", "market")
+ATTRIBUTE_FIELDS = ("fuel_type", "vehicle_class", "drivetrain", "platform")
+# Packs resolved per values query in /what-if
+WHAT_IF_CHUNK_SIZE = 500
+FACET_FIELDS = ("oem", "market", "fuel_type", "vehicle_class", "drivetrain", "platform")
+
+# Keyed by filter signature; cleared whenever a pack write commits
+facet_cache = TTLCache("pack_facets", ttl_seconds=settings.FACET_CACHE_TTL_SECONDS)
+# Cache misses for the same signature share one facet query
+facet_flight = SingleFlight("pack_facets")
+
 
 def _pack_to_response(pack: Pack, creator_name: Optional[str] = None) -> PackResponse:
     return PackResponse(
@@ -35,6 +83,101 @@ def _pack_to_response(pack: Pack, creator_name: Optional[str] = None) -> PackRes
     )
 
 
+def _identity_key(obj) -> tuple:
+    return tuple(getattr(obj, f) for f in IDENTITY_FIELDS)
+
+
+async def _creator_names(db: AsyncSession, packs: list[Pack]) -> dict[int, str]:
+    user_ids = {p.created_by for p in packs if p.created_by is not None}
+    if not user_ids:
+        return {}
+    result = await db.execute(select(User.id, User.display_name).where(User.id.in_(user_ids)))
+    return dict(result.all())
+
+
+async def _upsert_packs(
+    db: AsyncSession, items: list[PackCreate], user_id: int
+) -> dict[tuple, tuple[Pack, bool]]:
+    """Resolve-or-create packs by identity in one INSERT ... ON CONFLICT statement.
+
+    Returns ``{identity: (pack, created)}``. Attributes given as NULL never
+    overwrite stored ones, and ``updated_at`` only moves when something changed,
+    so replaying the same batch is a no-op. A soft-deleted pack with the same
+    identity is reactivated, values and all.
+    """
+    # A single ON CONFLICT statement cannot touch one row twice, so merge
+    # duplicates within the batch first (later non-null attributes win)
+    merged: dict[tuple, dict] = {}
+    for item in items:
+        row = merged.setdefault(_identity_key(item), {f: getattr(item, f) for f in IDENTITY_FIELDS})
+        for f in ATTRIBUTE_FIELDS:
+            if getattr(item, f) is not None:
+                row[f] = getattr(item, f)
+
+    # Consistent row order keeps lock acquisition ordered across concurrent batches
+    ordered = sorted(merged.items(), key=lambda kv: tuple("" if v is None else v for v in kv[0]))
+    rows = [
+        {**dict.fromkeys(ATTRIBUTE_FIELDS), **row, "created_by": user_id, "is_active": True}
+        for _, row in ordered
+    ]
+
+    stmt = pg_insert(Pack).values(rows)
+    new_values = {f: func.coalesce(getattr(stmt.excluded, f), getattr(Pack, f)) for f in ATTRIBUTE_FIELDS}
+    changed = or_(
+        Pack.is_active == False,  # noqa: E712
+        *(getattr(Pack, f).is_distinct_from(v) for f, v in new_values.items()),
+    )
+    # Naive UTC, like the datetime.utcnow the ORM writes, whatever the session TimeZone
+    now_utc = func.timezone("UTC", func.now())
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_pack_identity",
+        set_={**new_values, "is_active": True, "updated_at": case((changed, now_utc), else_=Pack.updated_at)},
+    ).returning(Pack, literal_column("xmax = 0").label("created"))
+
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    clear_on_commit(db, facet_cache, rollup_cache)
+    return {_identity_key(pack): (pack, created) for pack, created in result.all()}
+
+
+async def _compute_facets(db: AsyncSession, filters: dict[str, object]) -> PackFacetsResponse:
+    # One pass over packs with GROUPING SETS: each facet is counted under every
+    # active filter except its own (so alternatives stay visible), via FILTER.
+    # Only filters that are not facets go into WHERE.
+    columns = [getattr(Pack, name) for name in FACET_FIELDS]
+    facet_counts = [
+        func.count().filter(and_(true(), *(c for k, c in filters.items() if k != name))).label(f"n_{name}")
+        for name in FACET_FIELDS
+    ]
+    query = (
+        select(
+            *columns,
+            *(func.grouping(col).label(f"g_{name}") for name, col in zip(FACET_FIELDS, columns)),
+            *facet_counts,
+            func.count().filter(and_(true(), *filters.values())).label("n_total"),
+        )
+        .where(
+            Pack.is_active == True,  # noqa: E712
+            *(c for k, c in filters.items() if k not in FACET_FIELDS),
+        )
+        .group_by(func.grouping_sets(*columns, tuple_()))
+    )
+    result = await db.execute(query)
+
+    total = 0
+    facets: dict[str, list[FacetValueCount]] = {name: [] for name in FACET_FIELDS}
+    for row in result.mappings():
+        grouped = [name for name in FACET_FIELDS if row[f"g_{name}"] == 0]
+        if not grouped:
+            total = row["n_total"]
+        elif row[f"n_{grouped[0]}"]:
+            facets[grouped[0]].append(FacetValueCount(value=row[grouped[0]], count=row[f"n_{grouped[0]}"]))
+
+    for values in facets.values():
+        values.sort(key=lambda fc: (-fc.count, fc.value is None, fc.value or ""))
+
+    return PackFacetsResponse(total=total, facets=facets)
+
+
 @router.get("/", response_model=PackListResponse)
 async def list_packs(
     oem: Optional[str] = None,
@@ -49,38 +192,18 @@ async def list_packs(
     page_size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created_at"),
     sort_dir: str = Query("desc"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    query = select(Pack, User.display_name).outerjoin(User, Pack.created_by == User.id).where(Pack.is_active == True)  # noqa: E712
-
-    # Filters
-    if oem:
-        query = query.where(Pack.oem == oem)
-    if model:
-        query = query.where(Pack.model == model)
-    if market:
-        query = query.where(Pack.market == market)
-    if fuel_type:
-        query = query.where(Pack.fuel_type == fuel_type)
-    if vehicle_class:
-        query = query.where(Pack.vehicle_class == vehicle_class)
-    if drivetrain:
-        query = query.where(Pack.drivetrain == drivetrain)
-    if platform:
-        query = query.where(Pack.platform == platform)
-
-    # Text search
-    if search:
-        pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Pack.oem.ilike(pattern),
-                Pack.model.ilike(pattern),
-                Pack.variant.ilike(pattern),
-                Pack.platform.ilike(pattern),
-            )
-        )
+    query = select(*PACK_COLUMNS, User.display_name).outerjoin(User, Pack.created_by == User.id).where(Pack.is_active == True)  # noqa: E712
+
+    # Filters + text search
+    filters = pack_filters({
+        "oem": oem, "model": model, "market": market, "fuel_type": fuel_type,
+        "vehicle_class": vehicle_class, "drivetrain": drivetrain, "platform": platform,
+        "search": search,
+    })
+    query = query.where(*filters.values())
 
     # Count total before pagination
     count_query = select(func.count()).select_from(
@@ -103,59 +226,266 @@ async def list_packs(
     result = await db.execute(query)
     rows = result.all()
 
-    items = [_pack_to_response(pack, creator_name) for pack, creator_name in rows]
+    items = [pack_row_to_dict(row[:-1], row[-1]) for row in rows]
+
+    return FastJSONResponse({"items": items, "total": total, "page": page, "page_size": page_size})
 
-    return PackListResponse(items=items, total=total, page=page, page_size=page_size)
+
+@router.get("/facets", response_model=PackFacetsResponse)
+async def get_pack_facets(
+    oem: Optional[str] = None,
+    model: Optional[str] = None,
+    market: Optional[str] = None,
+    fuel_type: Optional[str] = None,
+    vehicle_class: Optional[str] = None,
+    drivetrain: Optional[str] = None,
+    platform: Optional[str] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    raw_filters = {
+        "oem": oem, "model": model, "market": market, "fuel_type": fuel_type,
+        "vehicle_class": vehicle_class, "drivetrain": drivetrain, "platform": platform,
+        "search": search,
+    }
+    filters = pack_filters(raw_filters)
+    signature = tuple(sorted((k, v) for k, v in raw_filters.items() if v))
+    cached = facet_cache.get(signature)
+    if cached is not None:
+        return cached
+
+    generation = facet_cache.generation
+    response = await facet_flight.do((signature, generation), lambda: _compute_facets(db, filters))
+    if facet_cache.generation == generation:
+        facet_cache.set(signature, response)
+    return response
 
 
 @router.post("/", response_model=PackResponse, status_code=status.HTTP_201_CREATED)
 async def create_pack(
     data: PackCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    # Check for duplicate
-    dup_query = select(Pack).where(
-        Pack.oem == data.oem,
-        Pack.model == data.model,
-        Pack.variant == data.variant,
-        Pack.year == data.year,
-        Pack.market == data.market,
+    # Insert-or-nothing in one statement so concurrent creates cannot race
+    result = await db.execute(
+        pg_insert(Pack)
+        .values(**data.model_dump(), created_by=current_user.id, is_active=True)
+        .on_conflict_do_nothing(constraint="uq_pack_identity")
+        .returning(Pack)
     )
-    dup_result = await db.execute(dup_query)
-    if dup_result.scalar_one_or_none() is not None:
+    pack = result.scalar_one_or_none()
+    if pack is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A pack with this OEM, model, variant, year, and market already exists",
         )
 
-    pack = Pack(
-        oem=data.oem,
-        model=data.model,
-        year=data.year,
-        variant=data.variant,
-        market=data.market,
-        fuel_type=data.fuel_type,
-        vehicle_class=data.vehicle_class,
-        drivetrain=data.drivetrain,
-        platform=data.platform,
-        created_by=current_user.id,
-        is_active=True,
+    clear_on_commit(db, facet_cache, rollup_cache)
+    return _pack_to_response(pack, current_user.display_name)
+
+
+@router.post("/upsert", response_model=PackUpsertResponse)
+async def upsert_pack(
+    data: PackCreate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    upserted = await _upsert_packs(db, [data], current_user.id)
+    pack, created = upserted[_identity_key(data)]
+    names = await _creator_names(db, [pack])
+    return PackUpsertResponse(
+        **_pack_to_response(pack, names.get(pack.created_by)).model_dump(), created=created
     )
-    db.add(pack)
-    await db.flush()
 
-    return _pack_to_response(pack, current_user.display_name)
+
+@router.post("/upsert/bulk", response_model=list[PackUpsertResponse])
+async def bulk_upsert_packs(
+    data: PackBulkUpsert,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    upserted = await _upsert_packs(db, data.packs, current_user.id)
+    names = await _creator_names(db, [pack for pack, _ in upserted.values()])
+
+    # One entry per input item, in input order (duplicates map to the same pack)
+    results = []
+    for item in data.packs:
+        pack, created = upserted[_identity_key(item)]
+        results.append(
+            PackUpsertResponse(
+                **_pack_to_response(pack, names.get(pack.created_by)).model_dump(), created=created
+            )
+        )
+    return results
+
+
+@router.get("/lookup", response_model=PackResponse)
+async def lookup_pack(
+    oem: str,
+    model: str,
+    year: int,
+    variant: Optional[str] = None,
+    market: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    # Identity lookup includes soft-deleted packs: the identity stays reserved.
+    # Plain = / IS NULL (not IS NOT DISTINCT FROM) so the identity index is used
+    result = await db.execute(
+        select(Pack, User.display_name)
+        .outerjoin(User, Pack.created_by == User.id)
+        .where(
+            Pack.oem == oem,
+            Pack.model == model,
+            Pack.year == year,
+            Pack.variant.is_(None) if variant is None else Pack.variant == variant,
+            Pack.market.is_(None) if market is None else Pack.market == market,
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Pack not found")
+
+    pack, creator_name = row
+    return _pack_to_response(pack, creator_name)
+
+
+@router.post("/batch", response_model=PackBatchResponse, dependencies=[Depends(read_only_request)])
+async def get_packs_batch(
+    data: PackBatchRequest,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    # POST only to carry the id list and selectors; nothing is written
+    pack_ids = list(dict.fromkeys(data.pack_ids))
+    result = await db.execute(
+        select(*PACK_COLUMNS, User.display_name)
+        .outerjoin(User, Pack.created_by == User.id)
+        .where(Pack.id.in_(pack_ids), Pack.is_active == True)  # noqa: E712
+    )
+    packs = {row.id: pack_row_to_dict(row[:-1], row[-1]) for row in result.all()}
+    found = [pid for pid in pack_ids if pid in packs]
+
+    if found:
+        priority_order = await get_user_priority(db, current_user.id)
+        resolved = await resolve_packs_values(
+            db, found, priority_order,
+            domain_ids=data.domain_ids,
+            field_ids=data.field_ids,
+            include_all_values=data.include_all_values,
+        )
+        for pid in found:
+            packs[pid]["domains"] = resolved[pid]
+
+    return FastJSONResponse({
+        "packs": {pid: packs[pid] for pid in found},
+        "missing": [pid for pid in pack_ids if pid not in packs],
+    })
 
 
-@router.get("/{pack_id}", response_model=PackDetailResponse)
+@router.post("/what-if", response_model=PriorityWhatIfResponse, dependencies=[Depends(read_only_request)])
+async def priority_what_if(
+    data: PriorityWhatIfRequest,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Resolve packs under several priority orders at once and report where the winner differs."""
+    profile_ids = [p.profile_id for p in data.profiles if p.profile_id is not None]
+    result = await db.execute(
+        select(PriorityProfile.id, PriorityProfile.priority_order).where(PriorityProfile.id.in_(profile_ids))
+    )
+    shared_orders = dict(result.all())
+    unknown = [pid for pid in profile_ids if pid not in shared_orders]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Priority profile(s) not found: {unknown}")
+
+    own_order = None
+    priority_orders = []
+    for profile in data.profiles:
+        if profile.profile_id is not None:
+            priority_orders.append(shared_orders[profile.profile_id])
+            continue
+        if profile.priority_order is None and own_order is None:
+            own_order = await get_user_priority(db, current_user.id)
+        priority_orders.append(profile.priority_order or own_order)
+
+    query = select(Pack.id).where(Pack.is_active == True)  # noqa: E712
+    if data.pack_ids is not None:
+        query = query.where(Pack.id.in_(data.pack_ids))
+    else:
+        query = query.where(*pack_filters(data.filters.model_dump()).values())
+    pack_ids = list((await db.execute(query.order_by(Pack.id).limit(WHAT_IF_MAX_PACKS + 1))).scalars())
+    if len(pack_ids) > WHAT_IF_MAX_PACKS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"More than {WHAT_IF_MAX_PACKS} packs match; narrow the filters",
+        )
+
+    fields_q = (
+        select(Field.id, Field.name, Field.display_name)
+        .join(Domain, Field.domain_id == Domain.id)
+        .where(Field.is_active == True)  # noqa: E712
+        .order_by(Domain.sort_order, Field.sort_order)
+    )
+    if data.domain_ids is not None:
+        fields_q = fields_q.where(Field.domain_id.in_(data.domain_ids))
+    if data.field_ids is not None:
+        fields_q = fields_q.where(Field.id.in_(data.field_ids))
+    fields = (await db.execute(fields_q)).all()
+
+    summary = {f.id: {"resolved_packs": 0, "changed_packs": 0} for f in fields}
+    changes, changed_count = [], 0
+    for start in range(0, len(pack_ids) if fields else 0, WHAT_IF_CHUNK_SIZE):
+        chunk = pack_ids[start:start + WHAT_IF_CHUNK_SIZE]
+        winners = await resolve_winners(db, chunk, priority_orders, list(summary))
+        for pack_id in chunk:
+            for field in fields:
+                picks = winners.get((pack_id, field.id))
+                if picks is None:
+                    continue
+                summary[field.id]["resolved_packs"] += 1
+                if len({pick[0] for pick in picks}) == 1:
+                    continue
+                summary[field.id]["changed_packs"] += 1
+                changed_count += 1
+                if len(changes) < data.max_changes:
+                    changes.append({
+                        "pack_id": pack_id,
+                        "field_id": field.id,
+                        "winners": [
+                            dict(zip(("value_id", "source_type", "value_text", "value_numeric"), pick))
+                            for pick in picks
+                        ],
+                    })
+
+    field_summaries = [
+        {"field_id": f.id, "field_name": f.name, "display_name": f.display_name, **summary[f.id]}
+        for f in fields
+    ]
+    field_summaries.sort(key=lambda f: -f["changed_packs"])
+    return FastJSONResponse({
+        "profiles": [p.name for p in data.profiles],
+        "priority_orders": priority_orders,
+        "pack_count": len(pack_ids),
+        "changed_count": changed_count,
+        "fields": field_summaries,
+        "changes": changes,
+        "truncated": changed_count > len(changes),
+    })
+
+
+@router.get("/{pack_id}", response_model=Union[PackDetailResponse, CompactPackDetailResponse])
 async def get_pack_detail(
     pack_id: int,
-    db: AsyncSession = Depends(get_db),
+    format: Literal["full", "compact"] = Query("full", description="compact: dictionary-encoded value rows"),
+    as_of: Optional[datetime] = Query(None, description="values as they stood at this time (ISO 8601, UTC if no offset)"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Pack, User.display_name)
+        select(*PACK_COLUMNS, User.display_name, Pack.revision)
         .outerjoin(User, Pack.created_by == User.id)
         .where(Pack.id == pack_id, Pack.is_active == True)  # noqa: E712
     )
@@ -163,35 +493,66 @@ async def get_pack_detail(
     if row is None:
         raise HTTPException(status_code=404, detail="Pack not found")
 
-    pack, creator_name = row
+    detail = pack_row_to_dict(row[:-2], row[-2])
+    priority_order, shared = await get_user_profile(db, current_user.id)
+    if as_of is not None:
+        # Past states are neither coalesced nor cached: the revision key only describes the present
+        domains = await resolve_pack_values(db, pack_id, priority_order=priority_order, as_of=as_utc(as_of))
+    else:
+        domains = await resolve_pack_values_shared(db, pack_id, row.revision, priority_order, shared=shared)
+    if format == "compact":
+        encoder = CompactEncoder()
+        detail["domains"] = compact_domains(domains, encoder)
+        detail["format"] = "compact"
+        detail["values"] = encoder.table()
+    else:
+        detail["domains"] = domains
 
-    domains = await resolve_pack_values(db, pack_id, current_user.id)
+    # Built from rows in the PackDetailResponse shape; encoded without re-validation
+    return FastJSONResponse(detail)
 
-    return PackDetailResponse(
-        id=pack.id,
-        oem=pack.oem,
-        model=pack.model,
-        year=pack.year,
-        variant=pack.variant,
-        market=pack.market,
-        fuel_type=pack.fuel_type,
-        vehicle_class=pack.vehicle_class,
-        drivetrain=pack.drivetrain,
-        platform=pack.platform,
-        is_active=pack.is_active,
-        created_by=pack.created_by,
-        created_by_name=creator_name,
-        created_at=pack.created_at,
-        updated_at=pack.updated_at,
-        domains=domains,
+
+@router.get("/{pack_id}/diff", response_model=PackDiffResponse)
+async def diff_pack_over_time(
+    pack_id: int,
+    from_: datetime = Query(..., alias="from", description="baseline time (ISO 8601, UTC if no offset)"),
+    to: Optional[datetime] = Query(None, description="compared time; default now"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Fields whose resolved value changed between two points in time."""
+    result = await db.execute(
+        select(Pack.id.label("pack_id"), Pack.oem, Pack.model, Pack.variant, Pack.year, Pack.market, Pack.revision)
+        .where(Pack.id == pack_id, Pack.is_active == True)  # noqa: E712
     )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Pack not found")
+
+    from_ = as_utc(from_)
+    priority_order, shared = await get_user_profile(db, current_user.id)
+    before = await resolve_pack_values(db, pack_id, priority_order=priority_order, as_of=from_)
+    if to is not None:
+        to = as_utc(to)
+        after = await resolve_pack_values(db, pack_id, priority_order=priority_order, as_of=to)
+    else:
+        after = await resolve_pack_values_shared(db, pack_id, row.revision, priority_order, shared=shared)
+    compared, fields = diff_resolved([before, after])
+
+    pack = row._asdict()
+    del pack["revision"]
+    return FastJSONResponse({
+        "columns": [{**pack, "as_of": from_}, {**pack, "as_of": to}],
+        "compared_fields": compared,
+        "fields": fields,
+    })
 
 
 @router.put("/{pack_id}", response_model=PackResponse)
 async def update_pack(
     pack_id: int,
     data: PackUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -210,13 +571,14 @@ async def update_pack(
         setattr(pack, key, value)
 
     await db.flush()
+    clear_on_commit(db, facet_cache, rollup_cache)
     return _pack_to_response(pack, creator_name)
 
 
 @router.delete("/{pack_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pack(
     pack_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -228,3 +590,4 @@ async def delete_pack(
 
     pack.is_active = False
     await db.flush()
+    clear_on_commit(db, facet_cache, rollup_cache)
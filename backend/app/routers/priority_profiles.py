@@ -0,0 +1,190 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.models.source_priority import DEFAULT_PRIORITY, PriorityProfile, SourcePriority
+from app.models.user import User
+from app.schemas.source_priority import (
+    PriorityProfileCreate,
+    PriorityProfileResponse,
+    PriorityProfileUpdate,
+    SourcePriorityResponse,
+)
+from app.utils.deps import get_current_user
+
+router = APIRouter(prefix="/api/priority-profiles", tags=["Preferences"])
+
+
+def _profile_to_response(profile: PriorityProfile, subscriber_count: int, subscribed: bool) -> PriorityProfileResponse:
+    return PriorityProfileResponse(
+        id=profile.id,
+        name=profile.name,
+        description=profile.description,
+        priority_order=profile.priority_order,
+        created_by=profile.created_by,
+        subscriber_count=subscriber_count,
+        subscribed=subscribed,
+        created_at=profile.created_at,
+        updated_at=profile.updated_at,
+    )
+
+
+async def _get_profile(db: AsyncSession, profile_id: int) -> PriorityProfile:
+    result = await db.execute(select(PriorityProfile).where(PriorityProfile.id == profile_id))
+    profile = result.scalar_one_or_none()
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Priority profile not found")
+    return profile
+
+
+def _check_can_edit(profile: PriorityProfile, user: User) -> None:
+    # Built-in profiles belong to admins; others to their creator (and admins)
+    if user.role != "admin" and (profile.created_by is None or profile.created_by != user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to change this profile")
+
+
+async def _check_name_free(db: AsyncSession, name: str, profile_id: int | None = None) -> None:
+    result = await db.execute(
+        select(PriorityProfile.id).where(PriorityProfile.name == name, PriorityProfile.id != profile_id)
+    )
+    if result.first() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A priority profile with this name already exists",
+        )
+
+
+async def _subscriber_counts(db: AsyncSession, profile_ids: list[int]) -> dict[int, int]:
+    result = await db.execute(
+        select(SourcePriority.profile_id, func.count())
+        .where(SourcePriority.profile_id.in_(profile_ids))
+        .group_by(SourcePriority.profile_id)
+    )
+    return dict(result.all())
+
+
+async def _subscribed_profile(db: AsyncSession, user_id: int) -> int | None:
+    result = await db.execute(select(SourcePriority.profile_id).where(SourcePriority.user_id == user_id))
+    return result.scalar_one_or_none()
+
+
+@router.get("/", response_model=list[PriorityProfileResponse])
+async def list_profiles(
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    result = await db.execute(select(PriorityProfile).order_by(PriorityProfile.name))
+    profiles = list(result.scalars())
+    counts = await _subscriber_counts(db, [p.id for p in profiles])
+    subscribed = await _subscribed_profile(db, current_user.id)
+    return [_profile_to_response(p, counts.get(p.id, 0), p.id == subscribed) for p in profiles]
+
+
+@router.post("/", response_model=PriorityProfileResponse, status_code=status.HTTP_201_CREATED)
+async def create_profile(
+    data: PriorityProfileCreate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    await _check_name_free(db, data.name)
+    profile = PriorityProfile(
+        name=data.name,
+        description=data.description,
+        priority_order=data.priority_order,
+        created_by=current_user.id,
+    )
+    db.add(profile)
+    await db.flush()
+    return _profile_to_response(profile, 0, False)
+
+
+@router.get("/{profile_id}", response_model=PriorityProfileResponse)
+async def get_profile(
+    profile_id: int,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    profile = await _get_profile(db, profile_id)
+    counts = await _subscriber_counts(db, [profile.id])
+    subscribed = await _subscribed_profile(db, current_user.id)
+    return _profile_to_response(profile, counts.get(profile.id, 0), profile.id == subscribed)
+
+
+@router.put("/{profile_id}", response_model=PriorityProfileResponse)
+async def update_profile(
+    profile_id: int,
+    data: PriorityProfileUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    profile = await _get_profile(db, profile_id)
+    _check_can_edit(profile, current_user)
+    update_data = data.model_dump(exclude_unset=True)
+    if update_data.get("name") is not None:
+        await _check_name_free(db, update_data["name"], profile.id)
+
+    # Subscribers pick up a new order on their next request: cached
+    # resolutions are keyed by the order itself, so nothing needs clearing
+    for key, value in update_data.items():
+        if value is not None or key == "description":
+            setattr(profile, key, value)
+    await db.flush()
+
+    counts = await _subscriber_counts(db, [profile.id])
+    subscribed = await _subscribed_profile(db, current_user.id)
+    return _profile_to_response(profile, counts.get(profile.id, 0), profile.id == subscribed)
+
+
+@router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_profile(
+    profile_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    profile = await _get_profile(db, profile_id)
+    _check_can_edit(profile, current_user)
+    # Subscribers fall back to their own order (profile_id ON DELETE SET NULL)
+    await db.delete(profile)
+    await db.flush()
+
+
+@router.post("/{profile_id}/subscribe", response_model=SourcePriorityResponse)
+async def subscribe(
+    profile_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    profile = await _get_profile(db, profile_id)
+    result = await db.execute(select(SourcePriority).where(SourcePriority.user_id == current_user.id))
+    sp = result.scalar_one_or_none()
+    if sp is None:
+        sp = SourcePriority(user_id=current_user.id, priority_order=list(DEFAULT_PRIORITY))
+        db.add(sp)
+    sp.profile_id = profile.id
+    await db.flush()
+    return SourcePriorityResponse(
+        user_id=current_user.id,
+        priority_order=profile.priority_order,
+        profile_id=profile.id,
+        profile_name=profile.name,
+    )
+
+
+@router.delete("/{profile_id}/subscribe", status_code=status.HTTP_204_NO_CONTENT)
+async def unsubscribe(
+    profile_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    # Back to the user's own order
+    result = await db.execute(
+        select(SourcePriority).where(
+            SourcePriority.user_id == current_user.id, SourcePriority.profile_id == profile_id
+        )
+    )
+    sp = result.scalar_one_or_none()
+    if sp is None:
+        raise HTTPException(status_code=404, detail="Not subscribed to this profile")
+    sp.profile_id = None
+    await db.flush()
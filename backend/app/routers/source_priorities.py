@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.source_priority import DEFAULT_PRIORITY, SourcePriority
+from app.database import get_db, get_read_db
+from app.models.source_priority import DEFAULT_PRIORITY, PriorityProfile, SourcePriority
 from app.models.user import User
 from app.schemas.source_priority import SourcePriorityResponse, SourcePriorityUpdate
 from app.utils.deps import get_current_user
@@ -13,27 +13,37 @@ router = APIRouter(prefix="/api/preferences", tags=["Preferences"])
 
 @router.get("/sources", response_model=SourcePriorityResponse)
 async def get_source_priority(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(SourcePriority).where(SourcePriority.user_id == current_user.id)
+        select(SourcePriority, PriorityProfile)
+        .outerjoin(PriorityProfile, SourcePriority.profile_id == PriorityProfile.id)
+        .where(SourcePriority.user_id == current_user.id)
     )
-    sp = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if sp is None:
+    if row is None:
         return SourcePriorityResponse(
             user_id=current_user.id,
             priority_order=list(DEFAULT_PRIORITY),
         )
 
+    sp, profile = row
+    if profile is not None:
+        return SourcePriorityResponse(
+            user_id=current_user.id,
+            priority_order=profile.priority_order,
+            profile_id=profile.id,
+            profile_name=profile.name,
+        )
     return SourcePriorityResponse.model_validate(sp)
 
 
 @router.put("/sources", response_model=SourcePriorityResponse)
 async def update_source_priority(
     data: SourcePriorityUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -49,6 +59,8 @@ async def update_source_priority(
         db.add(sp)
     else:
         sp.priority_order = data.priority_order
+        # A personal order replaces any subscribed profile
+        sp.profile_id = None
 
     await db.flush()
     return SourcePriorityResponse.model_validate(sp)
@@ -1,37 +1,55 @@
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.comment import Comment
+from app.database import get_db, get_read_db
 from app.models.domain import Domain
 from app.models.field import Field
 from app.models.pack import Pack
 from app.models.user import User
-from app.models.value import FieldValue
+from app.models.value import FieldValue, FieldValueRevision
 from app.schemas.value import (
     DomainWithResolvedFields,
     ResolvedFieldValue,
     ValueCreate,
     ValueResponse,
+    ValueRevisionResponse,
     ValueUpdate,
     VALID_SOURCE_TYPES,
 )
-from app.services.value_resolver import resolve_pack_values
+from app.services.conflicts import refresh_conflicts
+from app.services.formulas import recompute_pack
+from app.services.history import as_utc, record_revisions
+from app.services.numeric import numeric_columns
+from app.services.value_resolver import (
+    bump_pack_revision,
+    get_user_profile,
+    precompute_resolutions,
+    resolve_pack_values,
+    resolve_pack_values_shared,
+    value_conditions,
+)
 from app.utils.deps import get_current_user
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api", tags=["Values"])
 
+DERIVED_VALUE_DETAIL = "Calculated values are maintained by the field's formula; edit its inputs instead"
+
 
-def _value_to_response(fv: FieldValue, contributor_name: str, comment_count: int = 0) -> ValueResponse:
+def _value_to_response(fv: FieldValue, contributor_name: str) -> ValueResponse:
     return ValueResponse(
         id=fv.id,
         pack_id=fv.pack_id,
         field_id=fv.field_id,
         value_text=fv.value_text,
         value_numeric=fv.value_numeric,
+        value_min=fv.value_min,
+        value_max=fv.value_max,
+        value_approximate=fv.value_approximate,
         source_type=fv.source_type,
         source_detail=fv.source_detail,
         contributed_by=fv.contributed_by,
@@ -39,7 +57,7 @@ def _value_to_response(fv: FieldValue, contributor_name: str, comment_count: int
         is_active=fv.is_active,
         created_at=fv.created_at,
         updated_at=fv.updated_at,
-        comment_count=comment_count,
+        comment_count=fv.comment_count,
     )
 
 
@@ -47,14 +65,16 @@ def _value_to_response(fv: FieldValue, contributor_name: str, comment_count: int
 async def get_pack_values(
     pack_id: int,
     field_id: Optional[int] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    as_of: Optional[datetime] = Query(None, description="values as they stood at this time (ISO 8601, UTC if no offset)"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Verify pack exists and is active
     pack_result = await db.execute(
-        select(Pack).where(Pack.id == pack_id, Pack.is_active == True)  # noqa: E712
+        select(Pack.revision).where(Pack.id == pack_id, Pack.is_active == True)  # noqa: E712
     )
-    if pack_result.scalar_one_or_none() is None:
+    revision = pack_result.scalar_one_or_none()
+    if revision is None:
         raise HTTPException(status_code=404, detail="Pack not found")
 
     # If field_id is provided, find its domain to narrow the query
@@ -66,14 +86,52 @@ async def get_pack_values(
             raise HTTPException(status_code=404, detail="Field not found")
         domain_id = field.domain_id
 
-    return await resolve_pack_values(db, pack_id, current_user.id, domain_id=domain_id)
+    priority_order, shared = await get_user_profile(db, current_user.id)
+    if as_of is not None:
+        return FastJSONResponse(
+            await resolve_pack_values(
+                db, pack_id, domain_id=domain_id, priority_order=priority_order, as_of=as_utc(as_of)
+            )
+        )
+    return FastJSONResponse(
+        await resolve_pack_values_shared(db, pack_id, revision, priority_order, domain_id=domain_id, shared=shared)
+    )
+
+
+@router.get("/values/{value_id}/history", response_model=list[ValueRevisionResponse])
+async def get_value_history(
+    value_id: int,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """Every recorded state of a value, oldest first — including deleted values."""
+    result = await db.execute(
+        select(
+            FieldValueRevision.id, FieldValueRevision.value_id, FieldValueRevision.value_text,
+            FieldValueRevision.value_numeric, FieldValueRevision.value_min, FieldValueRevision.value_max,
+            FieldValueRevision.value_approximate, FieldValueRevision.source_type,
+            FieldValueRevision.source_detail, FieldValueRevision.contributed_by,
+            User.display_name.label("contributor_name"), FieldValueRevision.is_derived,
+            func.lower(FieldValueRevision.valid).label("valid_from"),
+            func.upper(FieldValueRevision.valid).label("valid_to"),
+            FieldValueRevision.recorded_by,
+        )
+        .join(User, FieldValueRevision.contributed_by == User.id)
+        .where(FieldValueRevision.value_id == value_id, ~func.isempty(FieldValueRevision.valid))
+        .order_by(func.lower(FieldValueRevision.valid), FieldValueRevision.id)
+    )
+    rows = result.mappings().all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Value not found")
+    return FastJSONResponse([dict(row) for row in rows])
 
 
 @router.post("/packs/{pack_id}/values", response_model=ValueResponse, status_code=status.HTTP_201_CREATED)
 async def create_value(
     pack_id: int,
     data: ValueCreate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     # Verify pack exists and is active
@@ -106,85 +164,90 @@ async def create_value(
                 detail=f"value_text must be one of: {field.select_options}",
             )
 
-    # Parse numeric value if applicable
-    value_numeric = None
-    if field.data_type == "number":
-        try:
-            value_numeric = float(data.value_text)
-        except (ValueError, TypeError):
-            value_numeric = None  # Don't reject — may have annotations
-
     fv = FieldValue(
         pack_id=pack_id,
         field_id=data.field_id,
         value_text=data.value_text,
-        value_numeric=value_numeric,
+        # Unparseable text is kept, not rejected — the numeric columns stay NULL
+        **numeric_columns(data.value_text, field.data_type, field.unit),
         source_type=data.source_type,
         source_detail=data.source_detail,
         contributed_by=current_user.id,
     )
     db.add(fv)
     await db.flush()
+    await bump_pack_revision(db, pack_id)
+    await record_revisions(db, [(fv.pack_id, fv.id)], current_user.id)
+    await recompute_pack(db, pack_id, [fv.field_id], current_user.id)
+    await refresh_conflicts(db, [pack_id])
+    # Warm shared-profile resolutions once the write has committed
+    background_tasks.add_task(precompute_resolutions, [pack_id])
 
-    return _value_to_response(fv, current_user.display_name, 0)
+    return _value_to_response(fv, current_user.display_name)
 
 
 @router.put("/values/{value_id}", response_model=ValueResponse)
 async def update_value(
     value_id: int,
     data: ValueUpdate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    pack_id: Optional[int] = Query(None, description="the value's pack, if known: limits the lookup to its partition"),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    # Get value with contributor name and comment count
-    comment_count_sq = (
-        select(func.count(Comment.id))
-        .where(Comment.value_id == value_id)
-        .correlate_except(Comment)
-        .scalar_subquery()
-    )
-
+    # Get value with contributor name
     result = await db.execute(
-        select(FieldValue, User.display_name, comment_count_sq)
+        select(FieldValue, User.display_name, Field.data_type, Field.unit)
         .join(User, FieldValue.contributed_by == User.id)
-        .where(FieldValue.id == value_id, FieldValue.is_active == True)  # noqa: E712
+        .join(Field, FieldValue.field_id == Field.id)
+        .where(*value_conditions(value_id, pack_id))
     )
     row = result.one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Value not found")
 
-    fv, contributor_name, cc = row
+    fv, contributor_name, data_type, unit = row
+    if fv.is_derived:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DERIVED_VALUE_DETAIL)
 
     update_data = data.model_dump(exclude_unset=True)
     if "value_text" in update_data:
         fv.value_text = update_data["value_text"]
-        # Re-parse numeric if field is number type
-        field_result = await db.execute(select(Field).where(Field.id == fv.field_id))
-        field = field_result.scalar_one_or_none()
-        if field and field.data_type == "number":
-            try:
-                fv.value_numeric = float(update_data["value_text"])
-            except (ValueError, TypeError):
-                fv.value_numeric = None
+        for column, parsed in numeric_columns(fv.value_text, data_type, unit).items():
+            setattr(fv, column, parsed)
     if "source_detail" in update_data:
         fv.source_detail = update_data["source_detail"]
 
     await db.flush()
-    return _value_to_response(fv, contributor_name, cc or 0)
+    await bump_pack_revision(db, fv.pack_id)
+    if update_data:
+        await record_revisions(db, [(fv.pack_id, fv.id)], current_user.id)
+    if "value_text" in update_data:
+        await recompute_pack(db, fv.pack_id, [fv.field_id], current_user.id)
+        await refresh_conflicts(db, [fv.pack_id])
+    background_tasks.add_task(precompute_resolutions, [fv.pack_id])
+    return _value_to_response(fv, contributor_name)
 
 
 @router.delete("/values/{value_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_value(
     value_id: int,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    pack_id: Optional[int] = Query(None, description="the value's pack, if known: limits the lookup to its partition"),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(FieldValue).where(FieldValue.id == value_id, FieldValue.is_active == True)  # noqa: E712
-    )
+    result = await db.execute(select(FieldValue).where(*value_conditions(value_id, pack_id)))
     fv = result.scalar_one_or_none()
     if fv is None:
         raise HTTPException(status_code=404, detail="Value not found")
+    if fv.is_derived:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DERIVED_VALUE_DETAIL)
 
     fv.is_active = False
     await db.flush()
+    await bump_pack_revision(db, fv.pack_id)
+    await record_revisions(db, [(fv.pack_id, fv.id)], current_user.id)
+    await recompute_pack(db, fv.pack_id, [fv.field_id], current_user.id)
+    await refresh_conflicts(db, [fv.pack_id])
+    background_tasks.add_task(precompute_resolutions, [fv.pack_id])
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SlowQueryResponse(BaseModel):
+    captured_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: list[str]
+    route: Optional[str] = None
+    plan: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class SlowQueryListResponse(BaseModel):
+    enabled: bool
+    threshold_ms: Optional[float] = None
+    items: list[SlowQueryResponse]
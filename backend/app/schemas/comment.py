@@ -17,3 +17,23 @@ class CommentResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class CommentPage(BaseModel):
+    items: list[CommentResponse] = []
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
+    # All comments on the value
+    total: int
+
+
+class CommentBatchRequest(BaseModel):
+    value_ids: list[int] = Field(min_length=1, max_length=500)
+    # First comments per value; page through the rest with each next_cursor
+    limit: int = Field(3, ge=1, le=50)
+
+
+class CommentBatchResponse(BaseModel):
+    values: dict[int, CommentPage] = {}
+    # Requested ids that don't exist or are deleted
+    missing: list[int] = []
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ComponentCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    component_type: Optional[str] = Field(None, max_length=100)
+    supplier: Optional[str] = Field(None, max_length=200)
+    description: Optional[str] = None
+
+
+class ComponentUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    component_type: Optional[str] = Field(None, max_length=100)
+    supplier: Optional[str] = Field(None, max_length=200)
+    description: Optional[str] = None
+
+
+class ComponentResponse(BaseModel):
+    id: int
+    name: str
+    component_type: Optional[str] = None
+    supplier: Optional[str] = None
+    description: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    # Active packs using the component
+    pack_count: int = 0
+
+
+class ComponentListResponse(BaseModel):
+    items: list[ComponentResponse]
+    total: int
+    page: int
+    page_size: int
+
+
+class BomLineUpdate(BaseModel):
+    quantity: int = Field(1, ge=1)
+    # Where the component sits in the pack (e.g. the E/E domain for a contactor)
+    domain_id: Optional[int] = None
+    notes: Optional[str] = None
+
+
+class BomLineResponse(BaseModel):
+    component_id: int
+    name: str
+    component_type: Optional[str] = None
+    supplier: Optional[str] = None
+    quantity: int
+    domain_id: Optional[int] = None
+    domain_name: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class PackBomResponse(BaseModel):
+    pack_id: int
+    lines: list[BomLineResponse] = []
+    component_count: int
+    total_quantity: int
+
+
+class ComponentPackEntry(BaseModel):
+    """A pack using a matching component — one entry per (pack, component)."""
+
+    pack_id: int
+    oem: str
+    model: str
+    variant: Optional[str] = None
+    year: int
+    market: Optional[str] = None
+    component_id: int
+    component_name: str
+    component_type: Optional[str] = None
+    supplier: Optional[str] = None
+    quantity: int
+
+
+class ComponentPackListResponse(BaseModel):
+    items: list[ComponentPackEntry]
+    total: int
+    # Distinct packs among the matches
+    pack_count: int
+    page: int
+    page_size: int
+
+
+RollupGroupBy = Literal["supplier", "component_type", "component"]
+
+
+class RollupGroup(BaseModel):
+    # The supplier, component type or component name (None: not recorded)
+    key: Optional[str] = None
+    component_id: Optional[int] = None  # group_by=component only
+    pack_count: int
+    # Share of the matching packs, 0-1
+    pack_share: float
+    component_count: int
+    total_quantity: int
+
+
+class ComponentRollupResponse(BaseModel):
+    group_by: RollupGroupBy
+    # Active packs matching the pack filters, with or without components
+    total_packs: int
+    groups: list[RollupGroup] = []
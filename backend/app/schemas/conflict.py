@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ConflictResponse(BaseModel):
+    pack_id: int
+    oem: str
+    model: str
+    variant: Optional[str] = None
+    year: int
+    field_id: int
+    field_name: str
+    display_name: str
+    unit: Optional[str] = None
+    domain_id: int
+    value_count: int
+    group_count: int
+    agreement: float
+    spread: Optional[float] = None
+    is_conflict: bool
+    computed_at: datetime
+
+
+class ConflictListResponse(BaseModel):
+    items: list[ConflictResponse]
+    total: int
+    page: int
+    page_size: int
@@ -3,6 +3,8 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
+from app.schemas.value import ValueResponse
+
 
 DATA_TYPE_OPTIONS = ["text", "number", "select"]
 
@@ -15,6 +17,8 @@ class FieldCreate(BaseModel):
     select_options: Optional[list[str]] = None
     description: Optional[str] = None
     sort_order: Optional[int] = 0
+    # e.g. "module_count * cells_per_module"; other number fields by name
+    formula: Optional[str] = Field(None, min_length=1, max_length=1000)
 
     @model_validator(mode="after")
     def validate_select_options(self):
@@ -22,6 +26,8 @@ class FieldCreate(BaseModel):
             raise ValueError(f"data_type must be one of: {DATA_TYPE_OPTIONS}")
         if self.data_type == "select" and not self.select_options:
             raise ValueError("select_options is required when data_type is 'select'")
+        if self.formula is not None and self.data_type != "number":
+            raise ValueError("formula requires data_type 'number'")
         return self
 
 
@@ -33,6 +39,8 @@ class FieldUpdate(BaseModel):
     select_options: Optional[list[str]] = None
     description: Optional[str] = None
     sort_order: Optional[int] = None
+    # null removes the formula and its calculated values
+    formula: Optional[str] = Field(None, min_length=1, max_length=1000)
 
 
 class FieldResponse(BaseModel):
@@ -45,8 +53,30 @@ class FieldResponse(BaseModel):
     select_options: Optional[Any] = None
     sort_order: int
     description: Optional[str] = None
+    formula: Optional[str] = None
     is_active: bool
     created_by: Optional[int] = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class FieldPackValue(BaseModel):
+    pack_id: int
+    oem: str
+    model: str
+    variant: Optional[str] = None
+    year: int
+    market: Optional[str] = None
+    resolved_value: Optional[ValueResponse] = None
+    alternative_count: int = 0
+    agreement: Optional[float] = None
+    disputed: bool = False
+
+
+class FieldValuesResponse(BaseModel):
+    field: FieldResponse
+    items: list[FieldPackValue]
+    total: int
+    page: int
+    page_size: int
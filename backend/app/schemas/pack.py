@@ -51,8 +51,26 @@ class PackResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PackUpsertResponse(PackResponse):
+    created: bool
+
+
+class PackBulkUpsert(BaseModel):
+    packs: list[PackCreate] = Field(min_length=1, max_length=1000)
+
+
 class PackListResponse(BaseModel):
     items: list[PackResponse]
     total: int
     page: int
     page_size: int
+
+
+class FacetValueCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class PackFacetsResponse(BaseModel):
+    total: int
+    facets: dict[str, list[FacetValueCount]]
@@ -1,11 +1,29 @@
-from pydantic import BaseModel, field_validator
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.schemas.value import VALID_SOURCE_TYPES
 
+WHAT_IF_MAX_PACKS = 5000
+
+
+def _validate_priority_order(v: list[str]) -> list[str]:
+    if len(v) != len(VALID_SOURCE_TYPES):
+        raise ValueError(f"Must contain exactly {len(VALID_SOURCE_TYPES)} source types")
+    if set(v) != set(VALID_SOURCE_TYPES):
+        raise ValueError(f"Must contain exactly these source types: {VALID_SOURCE_TYPES}")
+    if len(v) != len(set(v)):
+        raise ValueError("Duplicate source types are not allowed")
+    return v
+
 
 class SourcePriorityResponse(BaseModel):
     user_id: int
+    # Effective order: the subscribed profile's, if any
     priority_order: list[str]
+    profile_id: Optional[int] = None
+    profile_name: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
@@ -16,10 +34,117 @@ class SourcePriorityUpdate(BaseModel):
     @field_validator("priority_order")
     @classmethod
     def validate_priority_order(cls, v: list[str]) -> list[str]:
-        if len(v) != len(VALID_SOURCE_TYPES):
-            raise ValueError(f"Must contain exactly {len(VALID_SOURCE_TYPES)} source types")
-        if set(v) != set(VALID_SOURCE_TYPES):
-            raise ValueError(f"Must contain exactly these source types: {VALID_SOURCE_TYPES}")
-        if len(v) != len(set(v)):
-            raise ValueError("Duplicate source types are not allowed")
-        return v
+        return _validate_priority_order(v)
+
+
+class PriorityProfileCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    description: Optional[str] = None
+    priority_order: list[str]
+
+    @field_validator("priority_order")
+    @classmethod
+    def validate_priority_order(cls, v: list[str]) -> list[str]:
+        return _validate_priority_order(v)
+
+
+class PriorityProfileUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = None
+    priority_order: Optional[list[str]] = None
+
+    @field_validator("priority_order")
+    @classmethod
+    def validate_priority_order(cls, v: Optional[list[str]]) -> Optional[list[str]]:
+        return None if v is None else _validate_priority_order(v)
+
+
+class PriorityProfileResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    priority_order: list[str]
+    created_by: Optional[int] = None  # None: built-in
+    subscriber_count: int = 0
+    subscribed: bool = False  # the current user follows it
+    created_at: datetime
+    updated_at: datetime
+
+
+class WhatIfProfile(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    # At most one of these; neither: the caller's current order
+    priority_order: Optional[list[str]] = None
+    profile_id: Optional[int] = None
+
+    @field_validator("priority_order")
+    @classmethod
+    def validate_priority_order(cls, v: Optional[list[str]]) -> Optional[list[str]]:
+        return None if v is None else _validate_priority_order(v)
+
+    @model_validator(mode="after")
+    def check_source(self):
+        if self.priority_order is not None and self.profile_id is not None:
+            raise ValueError("Give either priority_order or profile_id, not both")
+        return self
+
+
+class WhatIfPackFilters(BaseModel):
+    oem: Optional[str] = None
+    model: Optional[str] = None
+    market: Optional[str] = None
+    fuel_type: Optional[str] = None
+    vehicle_class: Optional[str] = None
+    drivetrain: Optional[str] = None
+    platform: Optional[str] = None
+    search: Optional[str] = None
+
+
+class PriorityWhatIfRequest(BaseModel):
+    profiles: list[WhatIfProfile] = Field(min_length=2, max_length=10)
+    # Either explicit packs or browse filters (no filters: every pack), at most WHAT_IF_MAX_PACKS
+    pack_ids: Optional[list[int]] = Field(None, min_length=1, max_length=WHAT_IF_MAX_PACKS)
+    filters: WhatIfPackFilters = WhatIfPackFilters()
+    domain_ids: Optional[list[int]] = None
+    field_ids: Optional[list[int]] = None
+    # Cap on listed changes; the per-field summary always covers every pack
+    max_changes: int = Field(1000, ge=0, le=10000)
+
+    @model_validator(mode="after")
+    def check_names(self):
+        names = [p.name for p in self.profiles]
+        if len(names) != len(set(names)):
+            raise ValueError("Profile names must be unique")
+        return self
+
+
+class WhatIfWinner(BaseModel):
+    value_id: int
+    source_type: str
+    value_text: Optional[str] = None
+    value_numeric: Optional[float] = None
+
+
+class WhatIfChange(BaseModel):
+    pack_id: int
+    field_id: int
+    # Resolved value under each profile, in PriorityWhatIfResponse.profiles order
+    winners: list[WhatIfWinner]
+
+
+class WhatIfFieldSummary(BaseModel):
+    field_id: int
+    field_name: str
+    display_name: str
+    resolved_packs: int  # packs with at least one value for the field
+    changed_packs: int  # packs where the profiles pick different values
+
+
+class PriorityWhatIfResponse(BaseModel):
+    profiles: list[str]
+    priority_orders: list[list[str]]
+    pack_count: int
+    changed_count: int
+    fields: list[WhatIfFieldSummary] = []  # most changed first
+    changes: list[WhatIfChange] = []
+    truncated: bool = False  # changes stopped at max_changes
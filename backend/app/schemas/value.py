@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,9 @@ class ValueResponse(BaseModel):
     field_id: int
     value_text: Optional[str] = None
     value_numeric: Optional[float] = None
+    value_min: Optional[float] = None
+    value_max: Optional[float] = None
+    value_approximate: bool = False
     source_type: str
     source_detail: str
     contributed_by: int
@@ -40,6 +43,27 @@ class ValueResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ValueRevisionResponse(BaseModel):
+    """One past or current state of a value, from the revision log."""
+
+    id: int
+    value_id: int
+    value_text: Optional[str] = None
+    value_numeric: Optional[float] = None
+    value_min: Optional[float] = None
+    value_max: Optional[float] = None
+    value_approximate: bool = False
+    source_type: str
+    source_detail: str
+    contributed_by: int
+    contributor_name: Optional[str] = None
+    is_derived: bool = False
+    valid_from: datetime
+    # None while current; a deleted value's last revision ends at the delete
+    valid_to: Optional[datetime] = None
+    recorded_by: Optional[int] = None
+
+
 class ResolvedFieldValue(BaseModel):
     field_id: int
     field_name: str
@@ -48,6 +72,9 @@ class ResolvedFieldValue(BaseModel):
     data_type: str
     resolved_value: Optional[ValueResponse] = None
     alternative_count: int = 0
+    # Share of values in the largest agreeing group; None with fewer than two values
+    agreement: Optional[float] = None
+    disputed: bool = False  # sources disagree (see GET /api/conflicts)
     all_values: list[ValueResponse] = []
 
 
@@ -79,6 +106,21 @@ class PackDetailResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PackBatchRequest(BaseModel):
+    pack_ids: list[int] = Field(min_length=1, max_length=500)
+    domain_ids: Optional[list[int]] = None
+    # Sparse selection: only these fields (and the domains they belong to)
+    field_ids: Optional[list[int]] = None
+    # False: resolved values only, all_values left empty
+    include_all_values: bool = True
+
+
+class PackBatchResponse(BaseModel):
+    packs: dict[int, PackDetailResponse] = {}
+    # Requested ids that don't exist or are deleted
+    missing: list[int] = []
+
+
 class CompareFieldEntry(BaseModel):
     field_id: int
     field_name: str
@@ -103,3 +145,86 @@ class CompareResponse(BaseModel):
 # Avoid circular import — use forward ref
 from app.schemas.pack import PackResponse  # noqa: E402
 CompareResponse.model_rebuild()
+
+
+class CompactValueTable(BaseModel):
+    columns: list[str]
+    sources: list[str]
+    contributors: list[tuple[int, Optional[str]]]  # [user_id, display_name]
+
+
+class CompactField(BaseModel):
+    field_id: int
+    field_name: str
+    display_name: str
+    unit: Optional[str] = None
+    data_type: str
+    # Pack detail only, as in ResolvedFieldValue
+    agreement: Optional[float] = None
+    disputed: Optional[bool] = None
+    # Rows laid out by CompactValueTable.columns; source/contributor are table
+    # indexes. Pack detail: every value, best first. Compare: the resolved
+    # value per pack, in CompactCompareResponse.packs order (null when missing)
+    values: list[Optional[list[Any]]] = []
+
+
+class CompactDomain(BaseModel):
+    domain_id: int
+    domain_name: str
+    sort_order: int
+    fields: list[CompactField] = []
+
+
+class CompactPackDetailResponse(PackResponse):
+    format: Literal["compact"]
+    values: CompactValueTable
+    domains: list[CompactDomain] = []
+
+
+class CompactCompareResponse(BaseModel):
+    format: Literal["compact"]
+    packs: list[PackResponse] = []
+    values: CompactValueTable
+    domains: list[CompactDomain] = []
+
+
+class DiffColumn(BaseModel):
+    """One side of a diff: a pack, optionally as it stood at ``as_of``."""
+
+    pack_id: int
+    oem: str
+    model: str
+    variant: Optional[str] = None
+    year: int
+    market: Optional[str] = None
+    as_of: Optional[datetime] = None
+
+
+class DiffValue(BaseModel):
+    value_id: int
+    value_text: Optional[str] = None
+    value_numeric: Optional[float] = None
+    source_type: str
+    # Against the first column's value; None for the first column, or when
+    # either side is not numeric
+    delta: Optional[float] = None
+    percent_change: Optional[float] = None
+
+
+class DiffField(BaseModel):
+    domain_id: int
+    domain_name: str
+    field_id: int
+    field_name: str
+    display_name: str
+    unit: Optional[str] = None
+    data_type: str
+    # The resolved value per column, in PackDiffResponse.columns order (null when missing)
+    values: list[Optional[DiffValue]] = []
+
+
+class PackDiffResponse(BaseModel):
+    columns: list[DiffColumn] = []
+    compared_fields: int
+    # Only fields whose resolved value differs between columns
+    fields: list[DiffField] = []
@@ -0,0 +1,143 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.domain import Domain
+from app.models.field import Field
+
+
+SEED_DATA = {
+    "Cell": {
+        "sort_order": 1,
+        "fields": [
+            {"name": "chemistry", "display_name": "Chemistry", "unit": None, "data_type": "text", "sort_order": 1},
+            {"name": "cell_format", "display_name": "Cell Format", "unit": None, "data_type": "select", "sort_order": 2,
+             "select_options": ["Prismatic", "Pouch", "Cylindrical 1865", "Cylindrical 2170", "Cylindrical 4680", "Cylindrical 46120"]},
+            {"name": "cell_supplier", "display_name": "Cell Supplier", "unit": None, "data_type": "text", "sort_order": 3},
+            {"name": "cell_capacity_ah", "display_name": "Cell Capacity", "unit": "Ah", "data_type": "number", "sort_order": 4},
+            {"name": "cell_nominal_voltage", "display_name": "Cell Nominal Voltage", "unit": "V", "data_type": "number", "sort_order": 5},
+            {"name": "cell_weight_kg", "display_name": "Cell Weight", "unit": "kg", "data_type": "number", "sort_order": 6},
+            {"name": "cell_dimensions_mm", "display_name": "Cell Dimensions (LxWxH)", "unit": "mm", "data_type": "text", "sort_order": 7},
+        ],
+    },
+    "Cellblock rest": {
+        "sort_order": 2,
+        "fields": [
+            {"name": "module_count", "display_name": "Module Count", "unit": None, "data_type": "number", "sort_order": 1},
+            {"name": "cells_per_module", "display_name": "Cells per Module", "unit": None, "data_type": "number", "sort_order": 2},
+            {"name": "cells_total", "display_name": "Total Cell Count", "unit": None, "data_type": "number", "sort_order": 3,
+             "formula": "module_count * cells_per_module"},
+            {"name": "configuration_sxp", "display_name": "Configuration (sXp)", "unit": None, "data_type": "text", "sort_order": 4},
+            {"name": "module_weight_kg", "display_name": "Module Weight", "unit": "kg", "data_type": "number", "sort_order": 5},
+        ],
+    },
+    "E/E": {
+        "sort_order": 3,
+        "fields": [
+            {"name": "voltage_architecture_v", "display_name": "Voltage Architecture", "unit": "V", "data_type": "select", "sort_order": 1,
+             "select_options": ["400", "800"]},
+            {"name": "obc_power_kw", "display_name": "OBC Power", "unit": "kW", "data_type": "number", "sort_order": 2},
+            {"name": "bms_supplier", "display_name": "BMS Supplier", "unit": None, "data_type": "text", "sort_order": 3},
+            {"name": "contactor_type", "display_name": "Contactor Type", "unit": None, "data_type": "text", "sort_order": 4},
+            {"name": "precharge_circuit", "display_name": "Precharge Circuit", "unit": None, "data_type": "text", "sort_order": 5},
+            {"name": "dcdc_converter", "display_name": "DC-DC Converter", "unit": None, "data_type": "text", "sort_order": 6},
+        ],
+    },
+    "Housing": {
+        "sort_order": 4,
+        "fields": [
+            {"name": "pack_weight_kg", "display_name": "Pack Weight", "unit": "kg", "data_type": "number", "sort_order": 1},
+            {"name": "pack_dimensions_lxwxh_mm", "display_name": "Pack Dimensions (LxWxH)", "unit": "mm", "data_type": "text", "sort_order": 2},
+            {"name": "housing_material", "display_name": "Housing Material", "unit": None, "data_type": "text", "sort_order": 3},
+            {"name": "ip_rating", "display_name": "IP Rating", "unit": None, "data_type": "text", "sort_order": 4},
+            {"name": "structural_role", "display_name": "Structural Role", "unit": None, "data_type": "select", "sort_order": 5,
+             "select_options": ["Cell-to-Pack", "Cell-to-Body", "Module-to-Pack", "Structural Battery"]},
+        ],
+    },
+    "Thermal Management": {
+        "sort_order": 5,
+        "fields": [
+            {"name": "cooling_type", "display_name": "Cooling Type", "unit": None, "data_type": "select", "sort_order": 1,
+             "select_options": ["Bottom plate", "Side cooling", "Immersion", "Tab cooling", "Top and bottom plate"]},
+            {"name": "coolant_type", "display_name": "Coolant Type", "unit": None, "data_type": "text", "sort_order": 2},
+            {"name": "cooling_plate_material", "display_name": "Cooling Plate Material", "unit": None, "data_type": "text", "sort_order": 3},
+            {"name": "thermal_interface_material", "display_name": "Thermal Interface Material", "unit": None, "data_type": "text", "sort_order": 4},
+            {"name": "heat_pump_integration", "display_name": "Heat Pump Integration", "unit": None, "data_type": "select", "sort_order": 5,
+             "select_options": ["Yes", "No", "Unknown"]},
+        ],
+    },
+    "Busbar": {
+        "sort_order": 6,
+        "fields": [
+            {"name": "busbar_material", "display_name": "Busbar Material", "unit": None, "data_type": "text", "sort_order": 1},
+            {"name": "busbar_cross_section_mm2", "display_name": "Busbar Cross Section", "unit": "mm\u00b2", "data_type": "number", "sort_order": 2},
+            {"name": "cell_connection_type", "display_name": "Cell Connection Type", "unit": None, "data_type": "select", "sort_order": 3,
+             "select_options": ["Wire bonding", "Laser welding", "Ultrasonic welding", "Bolted", "Flexible busbar"]},
+            {"name": "fuse_type", "display_name": "Fuse Type", "unit": None, "data_type": "text", "sort_order": 4},
+        ],
+    },
+    "Other components": {
+        "sort_order": 7,
+        "fields": [
+            {"name": "gross_capacity_kwh", "display_name": "Gross Capacity", "unit": "kWh", "data_type": "number", "sort_order": 1,
+             "formula": "cells_total * cell_capacity_ah * cell_nominal_voltage / 1000"},
+            {"name": "net_capacity_kwh", "display_name": "Net Capacity", "unit": "kWh", "data_type": "number", "sort_order": 2},
+            {"name": "max_charge_power_kw", "display_name": "Max Charge Power", "unit": "kW", "data_type": "number", "sort_order": 3},
+            {"name": "max_discharge_power_kw", "display_name": "Max Discharge Power", "unit": "kW", "data_type": "number", "sort_order": 4},
+            {"name": "pack_gravimetric_density_whkg", "display_name": "Pack Gravimetric Energy Density", "unit": "Wh/kg", "data_type": "number", "sort_order": 5,
+             "formula": "gross_capacity_kwh * 1000 / pack_weight_kg"},
+            {"name": "pack_volumetric_density_whl", "display_name": "Pack Volumetric Energy Density", "unit": "Wh/L", "data_type": "number", "sort_order": 6},
+        ],
+    },
+}
+
+
+async def seed_defaults(session: AsyncSession) -> tuple[int, int]:
+    """Insert any missing default domains and fields; returns (domains, fields) created.
+
+    Uses set-based ``INSERT ... ON CONFLICT DO NOTHING`` so re-running is a no-op
+    and concurrent runs cannot create duplicates. Existing fields are left as
+    they are: a formula added to SEED_DATA later does not reach a field that
+    already exists (set it with ``PUT /api/fields/{id}``, which also
+    recalculates its values). The caller commits.
+    """
+    domain_rows = [
+        {"name": name, "sort_order": data["sort_order"], "is_default": True}
+        for name, data in SEED_DATA.items()
+    ]
+    result = await session.execute(
+        pg_insert(Domain)
+        .values(domain_rows)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Domain.id)
+    )
+    domains_created = len(result.all())
+
+    result = await session.execute(
+        select(Domain.name, Domain.id).where(Domain.name.in_(list(SEED_DATA)))
+    )
+    domain_ids = dict(result.all())
+
+    field_rows = [
+        {
+            "domain_id": domain_ids[domain_name],
+            "name": field_data["name"],
+            "display_name": field_data["display_name"],
+            "unit": field_data.get("unit"),
+            "data_type": field_data["data_type"],
+            "select_options": field_data.get("select_options"),
+            "sort_order": field_data["sort_order"],
+            "formula": field_data.get("formula"),
+        }
+        for domain_name, domain_data in SEED_DATA.items()
+        for field_data in domain_data["fields"]
+    ]
+    result = await session.execute(
+        pg_insert(Field)
+        .values(field_rows)
+        .on_conflict_do_nothing(constraint="uq_domain_field_name")
+        .returning(Field.id)
+    )
+    fields_created = len(result.all())
+
+    return domains_created, fields_created
@@ -0,0 +1,70 @@
+"""Archival of deleted field values.
+
+Deleting a value only clears ``is_active``, so ``field_values`` would keep
+every dead row forever. Nothing reads a deleted value's row: its history
+and point-in-time reads come from ``field_value_revisions``. Once the
+retention window (``VALUE_ARCHIVE_RETENTION_DAYS``) has passed,
+archive_values() moves the row to ``field_values_archive``. Values with
+comments stay, because the comments reference them.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, delete, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.value import FieldValue, FieldValueArchive
+
+# Rows moved per statement (and per transaction in archive_values())
+ARCHIVE_BATCH_SIZE = 5000
+
+_COLUMNS = (
+    "id", "pack_id", "field_id", "value_text", "value_numeric", "value_min", "value_max", "value_approximate",
+    "source_type", "source_detail", "contributed_by", "created_at", "updated_at", "is_active", "is_derived",
+    "comment_count",
+)
+
+
+async def archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move up to ``batch_size`` values deleted before ``cutoff``; returns how many moved.
+
+    One statement: the rows deleted from ``field_values`` are inserted into
+    the archive as they are returned. Rows locked by a concurrent write are
+    skipped until the next run.
+    """
+    victims = (
+        select(FieldValue.id, FieldValue.pack_id)
+        .where(
+            FieldValue.is_active == False,  # noqa: E712
+            FieldValue.updated_at < literal(cutoff, DateTime(timezone=True)),
+            FieldValue.comment_count == 0,
+        )
+        .order_by(FieldValue.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(FieldValue)
+        .where(tuple_(FieldValue.id, FieldValue.pack_id).in_(victims))
+        .returning(*(getattr(FieldValue, name) for name in _COLUMNS))
+        .cte("moved")
+    )
+    result = await db.execute(
+        pg_insert(FieldValueArchive)
+        .from_select(list(_COLUMNS), select(*(moved.c[name] for name in _COLUMNS)))
+        .add_cte(moved)
+        .returning(FieldValueArchive.id)
+    )
+    return len(result.all())
+
+
+async def archive_values(db: AsyncSession, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive every value deleted before ``cutoff``, committing after each batch."""
+    total = 0
+    while True:
+        moved = await archive_batch(db, cutoff, batch_size)
+        await db.commit()
+        total += moved
+        if moved < batch_size:
+            return total
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.metrics import CACHE_REQUESTS
+
+# Every cache registers itself here so operational endpoints can report on them
+CACHES: dict[str, "TTLCache"] = {}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry expiry.
+
+    Each worker process holds its own copy: explicit invalidation only reaches
+    the worker that handled the write, so the TTL bounds staleness elsewhere.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Bumped by clear(): a value computed under an older generation may
+        # predate the write that cleared the cache and must not be stored
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hit_counter = CACHE_REQUESTS.labels(name, "hit")
+        self._miss_counter = CACHE_REQUESTS.labels(name, "miss")
+        CACHES[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[0] < time.monotonic():
+            self.misses += 1
+            self._miss_counter.inc()
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hit_counter.inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def clear_on_commit(db: AsyncSession, *caches: TTLCache) -> None:
+    # Clearing only once the write is committed keeps a concurrent read from
+    # re-caching pre-write data in between
+    @event.listens_for(db.sync_session, "after_commit", once=True)
+    def _clear(session) -> None:
+        for cache in caches:
+            cache.clear()
@@ -0,0 +1,82 @@
+"""Bill-of-materials rollups across packs.
+
+A rollup groups the BOM lines (``pack_components``) of the active packs
+matching the pack browse filters by supplier, component type or component,
+counting the packs using each group. It is one indexed join over
+``pack_components`` and ``components``: supplier questions never touch
+``field_values``.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.component import Component, PackComponent
+from app.models.pack import Pack
+from app.services.cache import TTLCache
+from app.services.singleflight import SingleFlight
+
+# Keyed by rollup signature; cleared whenever a component, BOM line or pack
+# write commits
+rollup_cache = TTLCache("component_rollups", ttl_seconds=settings.ROLLUP_CACHE_TTL_SECONDS)
+# Cache misses for the same signature share one rollup query
+rollup_flight = SingleFlight("component_rollups")
+
+
+def component_filters(component_type: Optional[str], supplier: Optional[str]) -> list:
+    """WHERE conditions on ``Component``; suppliers match case-insensitively."""
+    conditions = []
+    if component_type:
+        conditions.append(Component.component_type == component_type)
+    if supplier:
+        conditions.append(func.lower(Component.supplier) == supplier.lower())
+    return conditions
+
+
+async def compute_rollup(
+    db: AsyncSession,
+    group_by: str,
+    pack_conditions: list,
+    component_conditions: list,
+    limit: int,
+) -> dict:
+    """Groups shaped like ``ComponentRollupResponse``, largest first."""
+    total = (
+        await db.execute(select(func.count()).select_from(Pack).where(Pack.is_active == True, *pack_conditions))  # noqa: E712
+    ).scalar_one()
+
+    if group_by == "component":
+        keys = [Component.id, Component.name]
+    else:
+        keys = [getattr(Component, group_by)]
+    pack_count = func.count(func.distinct(PackComponent.pack_id))
+    query = (
+        select(
+            *keys,
+            pack_count.label("pack_count"),
+            func.count(func.distinct(Component.id)).label("component_count"),
+            func.sum(PackComponent.quantity).label("total_quantity"),
+        )
+        .select_from(PackComponent)
+        .join(Component, Component.id == PackComponent.component_id)
+        .join(Pack, Pack.id == PackComponent.pack_id)
+        .where(Pack.is_active == True, *pack_conditions, *component_conditions)  # noqa: E712
+        .group_by(*keys)
+        .order_by(pack_count.desc(), keys[-1].asc().nulls_last())
+        .limit(limit)
+    )
+    result = await db.execute(query)
+
+    groups = []
+    for row in result.mappings():
+        groups.append({
+            "key": row["name"] if group_by == "component" else row[group_by],
+            "component_id": row["id"] if group_by == "component" else None,
+            "pack_count": row["pack_count"],
+            "pack_share": round(row["pack_count"] / total, 4) if total else 0.0,
+            "component_count": row["component_count"],
+            "total_quantity": row["total_quantity"],
+        })
+    return {"group_by": group_by, "total_packs": total, "groups": groups}
@@ -0,0 +1,181 @@
+"""Source agreement per pack field: do the contributed values say the same thing?
+
+Every (pack, field) with two or more active values gets a stored score in
+``value_conflicts``:
+
+- numeric values agree when their ranges overlap or they differ by at most
+  ``CONFLICT_TOLERANCE`` relative (75 and 76 kWh agree, 96 and 108 cells
+  don't); values are grouped in ascending order, so agreement chains
+- other values agree when their text matches after case and whitespace
+  folding
+- ``agreement`` is the share of values in the largest group, and the field is
+  a conflict when there is more than one group
+
+refresh_conflicts() runs inside every value write, after bump_pack_revision();
+rebuild_conflicts() re-scores every pack (``scripts/score_conflicts.py``).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.conflict import ValueConflict
+from app.models.pack import Pack
+from app.models.value import FieldValue
+from app.services.value_resolver import bump_pack_revisions
+
+logger = logging.getLogger("app.conflicts")
+
+CONFLICT_BATCH_SIZE = 500
+WRITE_CHUNK_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class Consensus:
+    value_count: int
+    group_count: int
+    agreement: float
+    spread: Optional[float]
+
+    @property
+    def is_conflict(self) -> bool:
+        return self.group_count > 1
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+def score_values(values: list[tuple], tolerance: Optional[float] = None) -> Consensus:
+    """Score ``(value_numeric, value_min, value_max, value_text)`` tuples of one pack field."""
+    if tolerance is None:
+        tolerance = settings.CONFLICT_TOLERANCE
+
+    intervals, texts = [], {}
+    for numeric, low, high, text in values:
+        if numeric is None:
+            key = _normalize_text(text)
+            texts[key] = texts.get(key, 0) + 1
+        else:
+            # Open-ended limits only count their stated end
+            intervals.append((numeric if low is None else low, numeric if high is None else high))
+
+    # [size, upper end] per group of overlapping or near-equal values
+    groups: list[list] = []
+    for low, high in sorted(intervals):
+        if groups and low <= groups[-1][1] + tolerance * max(abs(groups[-1][1]), abs(low)):
+            groups[-1][0] += 1
+            groups[-1][1] = max(groups[-1][1], high)
+        else:
+            groups.append([1, high])
+    sizes = [size for size, _ in groups] + list(texts.values())
+
+    numbers = [v[0] for v in values if v[0] is not None]
+    spread = None
+    if len(numbers) > 1:
+        scale = max(abs(max(numbers)), abs(min(numbers)))
+        spread = round((max(numbers) - min(numbers)) / scale, 6) if scale else 0.0
+    return Consensus(
+        value_count=len(values),
+        group_count=len(sizes),
+        agreement=round(max(sizes) / len(values), 6),
+        spread=spread,
+    )
+
+
+async def refresh_conflicts(db: AsyncSession, pack_ids: Iterable[int]) -> set[int]:
+    """Re-score every field of ``pack_ids``; returns the packs whose stored scores changed.
+
+    Call after bump_pack_revision() (or with the packs otherwise locked), so
+    a concurrent write can't overwrite a newer score with an older one.
+    """
+    pack_ids = sorted(pack_ids)
+    if not pack_ids:
+        return set()
+
+    result = await db.execute(
+        select(
+            FieldValue.pack_id, FieldValue.field_id, FieldValue.value_numeric,
+            FieldValue.value_min, FieldValue.value_max, FieldValue.value_text,
+        ).where(FieldValue.pack_id.in_(pack_ids), FieldValue.is_active == True)  # noqa: E712
+    )
+    values: dict[tuple[int, int], list[tuple]] = {}
+    for pack_id, field_id, *value in result.all():
+        values.setdefault((pack_id, field_id), []).append(tuple(value))
+    scores = {key: score_values(vals) for key, vals in values.items() if len(vals) > 1}
+
+    result = await db.execute(
+        select(
+            ValueConflict.pack_id, ValueConflict.field_id, ValueConflict.value_count,
+            ValueConflict.group_count, ValueConflict.agreement, ValueConflict.spread,
+        ).where(ValueConflict.pack_id.in_(pack_ids))
+    )
+    stored = {(row[0], row[1]): tuple(row[2:]) for row in result.all()}
+
+    now = datetime.utcnow()
+    upserts = [
+        {
+            "pack_id": pack_id,
+            "field_id": field_id,
+            "value_count": score.value_count,
+            "group_count": score.group_count,
+            "agreement": score.agreement,
+            "spread": score.spread,
+            "is_conflict": score.is_conflict,
+            "computed_at": now,
+        }
+        for (pack_id, field_id), score in scores.items()
+        if stored.get((pack_id, field_id))
+        != (score.value_count, score.group_count, score.agreement, score.spread)
+    ]
+    stale = [key for key in stored if key not in scores]
+
+    # Chunked to stay under the 32767 bind parameters of one statement
+    for start in range(0, len(upserts), WRITE_CHUNK_SIZE):
+        stmt = pg_insert(ValueConflict).values(upserts[start:start + WRITE_CHUNK_SIZE])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ValueConflict.pack_id, ValueConflict.field_id],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("value_count", "group_count", "agreement", "spread", "is_conflict", "computed_at")
+                },
+            )
+        )
+    for start in range(0, len(stale), WRITE_CHUNK_SIZE):
+        await db.execute(
+            delete(ValueConflict).where(
+                tuple_(ValueConflict.pack_id, ValueConflict.field_id).in_(stale[start:start + WRITE_CHUNK_SIZE])
+            )
+        )
+    return {row["pack_id"] for row in upserts} | {pack_id for pack_id, _ in stale}
+
+
+async def rebuild_conflicts(session: AsyncSession) -> int:
+    """Re-score every active pack; commits per batch and returns the number of packs changed."""
+    changed_packs = 0
+    after = 0
+    while True:
+        # Lock the batch like a value write would, so concurrent writes interleave cleanly
+        result = await session.execute(
+            select(Pack.id)
+            .where(Pack.is_active == True, Pack.id > after)  # noqa: E712
+            .order_by(Pack.id)
+            .limit(CONFLICT_BATCH_SIZE)
+            .with_for_update()
+        )
+        pack_ids = list(result.scalars())
+        if not pack_ids:
+            break
+        changed = await refresh_conflicts(session, pack_ids)
+        await bump_pack_revisions(session, changed)
+        await session.commit()
+        changed_packs += len(changed)
+        after = pack_ids[-1]
+    return changed_packs
@@ -0,0 +1,77 @@
+"""Server-side diffs of resolved pack values.
+
+Each side ("column") is one pack's resolved domains, as returned by
+resolve_packs_values() — different packs, or the same pack at different
+times (``as_of``). Only fields whose resolved value differs from the first
+column's are returned, with numeric deltas against it.
+
+Numbers compare by ``value_numeric``, so "75 kWh" and "75000 Wh" on a kWh
+field are equal; anything else compares by text.
+"""
+
+from typing import Optional
+
+
+def _clean(value: float) -> float:
+    # 75.3 - 75.0 is 0.29999999999999716 in floats; report 0.3
+    return float(format(value, ".12g"))
+
+
+def _same(base: Optional[dict], other: Optional[dict]) -> bool:
+    if base is None or other is None:
+        return base is other
+    if base["value_numeric"] is not None and other["value_numeric"] is not None:
+        return base["value_numeric"] == other["value_numeric"]
+    return base["value_text"] == other["value_text"]
+
+
+def _diff_value(value: Optional[dict], base: Optional[dict]) -> Optional[dict]:
+    if value is None:
+        return None
+    delta = percent_change = None
+    if value is not base and base is not None:
+        numeric, base_numeric = value["value_numeric"], base["value_numeric"]
+        if numeric is not None and base_numeric is not None:
+            delta = _clean(numeric - base_numeric)
+            if base_numeric != 0:
+                percent_change = _clean((numeric - base_numeric) / abs(base_numeric) * 100)
+    return {
+        "value_id": value["id"],
+        "value_text": value["value_text"],
+        "value_numeric": value["value_numeric"],
+        "source_type": value["source_type"],
+        "delta": delta,
+        "percent_change": percent_change,
+    }
+
+
+def diff_resolved(columns: list[list[dict]]) -> tuple[int, list[dict]]:
+    """Compare resolved domains column by column against the first.
+
+    All columns must come from one resolution call shape (same domains and
+    fields). Returns (fields compared, differing fields shaped like
+    ``DiffField``).
+    """
+    resolved = [
+        {field["field_id"]: field["resolved_value"] for domain in domains for field in domain["fields"]}
+        for domains in columns
+    ]
+    compared, differing = 0, []
+    for domain in columns[0]:
+        for field in domain["fields"]:
+            compared += 1
+            values = [by_field.get(field["field_id"]) for by_field in resolved]
+            base = values[0]
+            if all(_same(base, other) for other in values[1:]):
+                continue
+            differing.append({
+                "domain_id": domain["domain_id"],
+                "domain_name": domain["domain_name"],
+                "field_id": field["field_id"],
+                "field_name": field["field_name"],
+                "display_name": field["display_name"],
+                "unit": field["unit"],
+                "data_type": field["data_type"],
+                "values": [_diff_value(value, base) for value in values],
+            })
+    return compared, differing
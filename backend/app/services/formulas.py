@@ -0,0 +1,410 @@
+"""Derived fields: arithmetic formulas over other number fields.
+
+A field with a ``formula`` such as ``module_count * cells_per_module`` gets
+one engine-maintained value per pack (``source_type='calculated'``,
+``is_derived``), which the resolver then ranks like any other source.
+
+- recompute_pack() runs inside every value write and re-evaluates only the
+  formulas downstream of the fields that changed on that pack.
+- rebuild_derived_fields() re-evaluates formulas over every pack after a
+  formula is added, changed or removed (background task or
+  ``scripts/recompute_derived.py``).
+
+Inputs are each input field's best value by DEFAULT_PRIORITY, so derived
+values do not depend on who is looking at them.
+"""
+
+import ast
+import logging
+import math
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.field import Field
+from app.models.pack import Pack
+from app.models.source_priority import DEFAULT_PRIORITY
+from app.models.value import FieldValue
+from app.services.conflicts import refresh_conflicts
+from app.services.history import record_revisions
+from app.services.value_resolver import bump_pack_revisions
+
+logger = logging.getLogger("app.formulas")
+
+CALCULATED_SOURCE = "calculated"
+REBUILD_BATCH_SIZE = 500
+
+FUNCTIONS = {"min": min, "max": max, "abs": abs, "round": round}
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+# Unknown source types rank after every listed one
+_RANK = {source: i for i, source in enumerate(DEFAULT_PRIORITY)}
+_UNRANKED = len(DEFAULT_PRIORITY)
+
+
+class FormulaError(ValueError):
+    """Invalid formula: syntax, unsupported expression, unknown input or cycle."""
+
+
+def _collect_names(node: ast.expr, names: set[str]) -> None:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return
+    if isinstance(node, ast.Name):
+        names.add(node.id)
+    elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        _collect_names(node.left, names)
+        _collect_names(node.right, names)
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        _collect_names(node.operand, names)
+    elif (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        for arg in node.args:
+            _collect_names(arg, names)
+    else:
+        raise FormulaError(f"Unsupported expression in formula: {ast.unparse(node)}")
+
+
+@lru_cache(maxsize=256)
+def parse_formula(formula: str) -> tuple[ast.expr, frozenset[str]]:
+    """Parse and validate a formula; returns its expression tree and input names."""
+    try:
+        tree = ast.parse(formula.strip(), mode="eval").body
+    except SyntaxError as exc:
+        raise FormulaError(f"Invalid formula syntax: {exc.msg}") from None
+    names: set[str] = set()
+    _collect_names(tree, names)
+    return tree, frozenset(names)
+
+
+def evaluate(node: ast.expr, inputs: dict[str, Optional[float]]) -> Optional[float]:
+    """Evaluate a parsed formula; None when an input is missing or the result isn't finite."""
+    try:
+        result = _evaluate(node, inputs)
+        if not isinstance(result, (int, float)) or not math.isfinite(result):
+            return None  # missing input, inf/nan
+        return float(result)
+    except (ArithmeticError, ValueError, TypeError):
+        return None  # division by zero, overflow
+
+
+def _evaluate(node: ast.expr, inputs: dict[str, Optional[float]]) -> Optional[float]:
+    if isinstance(node, ast.Constant):
+        return float(node.value)  # floats only: an int ** int could run unbounded
+    if isinstance(node, ast.Name):
+        return inputs.get(node.id)
+    if isinstance(node, ast.BinOp):
+        left, right = _evaluate(node.left, inputs), _evaluate(node.right, inputs)
+        if left is None or right is None:
+            return None
+        result = _BINARY_OPS[type(node.op)](left, right)
+        # A negative base to a fractional power is complex in Python; stop
+        # here so e.g. abs() can't turn it back into a real number
+        return None if isinstance(result, complex) else result
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate(node.operand, inputs)
+        return None if operand is None else _UNARY_OPS[type(node.op)](operand)
+    args = [_evaluate(arg, inputs) for arg in node.args]
+    if any(arg is None for arg in args):
+        return None
+    if node.func.id == "round" and len(args) == 2:
+        args[1] = int(args[1])
+    return FUNCTIONS[node.func.id](*args)
+
+
+@dataclass
+class Formula:
+    field_id: int
+    formula: str
+    tree: ast.expr
+    inputs: dict[str, int]  # input field name -> id
+
+
+class FormulaRegistry:
+    """Active fields and their formulas as a dependency graph."""
+
+    def __init__(self, rows: Iterable):
+        # rows: (id, name, data_type, formula) for every active field
+        rows = list(rows)
+        by_name: dict[str, list] = {}
+        for row in rows:
+            by_name.setdefault(row.name, []).append(row)
+        # Formulas refer to fields by name; a name shared across domains is ambiguous
+        self.field_ids = {name: matches[0].id for name, matches in by_name.items() if len(matches) == 1}
+        self.ambiguous = {name for name, matches in by_name.items() if len(matches) > 1}
+        self.number_fields = {row.id for row in rows if row.data_type == "number"}
+        self.names = {row.id: row.name for row in rows}
+
+        self.formulas: dict[int, Formula] = {}
+        for row in rows:
+            if row.formula:
+                try:
+                    self.formulas[row.id] = self.check(row.id, row.formula, check_cycles=False)
+                except FormulaError as exc:
+                    logger.warning("Skipping formula of field %s (%s): %s", row.id, row.name, exc)
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[int]:
+        pending = {
+            fid: {i for i in f.inputs.values() if i in self.formulas} for fid, f in self.formulas.items()
+        }
+        order = []
+        while pending:
+            ready = sorted(fid for fid, deps in pending.items() if not deps)
+            if not ready:
+                logger.warning("Skipping formulas in a dependency cycle: %s", sorted(pending))
+                break
+            order += ready
+            for fid in ready:
+                del pending[fid]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        return order
+
+    def check(self, field_id: Optional[int], formula: str, check_cycles: bool = True) -> Formula:
+        """Validate ``formula`` as the formula of ``field_id`` (None for a new field)."""
+        tree, names = parse_formula(formula)
+        if not names:
+            raise FormulaError("Formula must reference at least one field")
+        for name in sorted(names):
+            if name in self.ambiguous:
+                raise FormulaError(f"Field name '{name}' exists in several domains")
+            if name not in self.field_ids:
+                raise FormulaError(f"Unknown field '{name}'")
+            if self.field_ids[name] not in self.number_fields:
+                raise FormulaError(f"Field '{name}' is not a number field")
+        inputs = {name: self.field_ids[name] for name in names}
+        if field_id is not None and field_id in inputs.values():
+            raise FormulaError("A formula cannot reference its own field")
+        if check_cycles and field_id is not None:
+            cycle = set(inputs.values()) & set(self.downstream([field_id]))
+            if cycle:
+                raise FormulaError(
+                    "Formula would create a dependency cycle through "
+                    + ", ".join(sorted(self.names[i] for i in cycle))
+                )
+        return Formula(field_id=field_id, formula=formula, tree=tree, inputs=inputs)
+
+    def downstream(self, field_ids: Iterable[int]) -> list[int]:
+        """Formula fields that depend, directly or transitively, on ``field_ids``, in evaluation order."""
+        reached = set(field_ids)
+        affected = []
+        for fid in self.order:
+            if reached & set(self.formulas[fid].inputs.values()):
+                reached.add(fid)
+                affected.append(fid)
+        return affected
+
+    def referenced_by(self, field_id: int) -> list[str]:
+        """Names of the fields whose formulas use ``field_id``."""
+        return sorted(
+            self.names[fid] for fid, f in self.formulas.items() if field_id in f.inputs.values()
+        )
+
+
+async def load_registry(db: AsyncSession) -> FormulaRegistry:
+    result = await db.execute(
+        select(Field.id, Field.name, Field.data_type, Field.formula).where(Field.is_active == True)  # noqa: E712
+    )
+    return FormulaRegistry(result.all())
+
+
+def _format_number(value: float) -> str:
+    return format(value, ".12g")
+
+
+async def _recompute(
+    db: AsyncSession, registry: FormulaRegistry, affected: list[int], pack_ids: list[int], user_id: int
+) -> set[int]:
+    """Re-evaluate ``affected`` (in evaluation order) on ``pack_ids``; returns packs whose values changed."""
+    needed = set(affected)
+    for fid in affected:
+        needed.update(registry.formulas[fid].inputs.values())
+
+    result = await db.execute(
+        select(
+            FieldValue.pack_id, FieldValue.field_id, FieldValue.id, FieldValue.source_type,
+            FieldValue.value_numeric, FieldValue.is_derived,
+        ).where(
+            FieldValue.pack_id.in_(pack_ids),
+            FieldValue.field_id.in_(needed),
+            FieldValue.is_active == True,  # noqa: E712
+            FieldValue.value_numeric.is_not(None),
+        )
+    )
+    # (pack_id, field_id) -> [(rank, value_id, value, is_derived)]
+    candidates: dict[tuple[int, int], list[tuple]] = {}
+    for pack_id, field_id, value_id, source_type, value, is_derived in result.all():
+        candidates.setdefault((pack_id, field_id), []).append(
+            (_RANK.get(source_type, _UNRANKED), value_id, value, is_derived)
+        )
+
+    upserts, clears = [], []
+    calculated_rank = _RANK.get(CALCULATED_SOURCE, _UNRANKED)
+    for pack_id in pack_ids:
+        for fid in affected:
+            formula = registry.formulas[fid]
+            inputs = {}
+            for name, input_id in formula.inputs.items():
+                ranked = candidates.get((pack_id, input_id))
+                inputs[name] = min(ranked)[2] if ranked else None
+            value = evaluate(formula.tree, inputs)
+
+            # Downstream formulas in this pass see the new value, not the stored one
+            own = [c for c in candidates.get((pack_id, fid), ()) if not c[3]]
+            if value is None:
+                clears.append((pack_id, fid))
+            else:
+                value = round(value, 6)
+                own.append((calculated_rank, 0, value, True))
+                upserts.append({
+                    "pack_id": pack_id,
+                    "field_id": fid,
+                    "value_text": _format_number(value),
+                    "value_numeric": value,
+                    "value_min": value,
+                    "value_max": value,
+                    "source_type": CALCULATED_SOURCE,
+                    "source_detail": f"formula: {formula.formula}",
+                    "contributed_by": user_id,
+                    "is_derived": True,
+                })
+            candidates[(pack_id, fid)] = own
+
+    changed: set[int] = set()
+    revised: list[tuple[int, int]] = []
+    if upserts:
+        stmt = pg_insert(FieldValue).values(upserts)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FieldValue.pack_id, FieldValue.field_id],
+            index_where=and_(FieldValue.is_derived == True, FieldValue.is_active == True),  # noqa: E712
+            set_={
+                "value_text": stmt.excluded.value_text,
+                "value_numeric": stmt.excluded.value_numeric,
+                "value_min": stmt.excluded.value_min,
+                "value_max": stmt.excluded.value_max,
+                "source_detail": stmt.excluded.source_detail,
+                "contributed_by": stmt.excluded.contributed_by,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            # Only rows whose result actually changed are rewritten (and returned)
+            where=(FieldValue.value_numeric.is_distinct_from(stmt.excluded.value_numeric))
+            | (FieldValue.source_detail.is_distinct_from(stmt.excluded.source_detail)),
+        ).returning(FieldValue.id, FieldValue.pack_id)
+        written = (await db.execute(stmt)).all()
+        revised.extend((row.pack_id, row.id) for row in written)
+        changed.update(row.pack_id for row in written)
+    if clears:
+        result = await db.execute(
+            update(FieldValue)
+            .where(
+                FieldValue.is_derived == True,  # noqa: E712
+                FieldValue.is_active == True,  # noqa: E712
+                tuple_(FieldValue.pack_id, FieldValue.field_id).in_(clears),
+            )
+            .values(is_active=False)
+            .returning(FieldValue.id, FieldValue.pack_id)
+        )
+        cleared = result.all()
+        revised.extend((row.pack_id, row.id) for row in cleared)
+        changed.update(row.pack_id for row in cleared)
+    await record_revisions(db, revised, user_id)
+    return changed
+
+
+async def recompute_pack(db: AsyncSession, pack_id: int, changed_field_ids: Iterable[int], user_id: int) -> bool:
+    """Refresh the derived values downstream of ``changed_field_ids`` on one pack.
+
+    Call after writing values, in the same transaction and after
+    bump_pack_revision() — its row lock serialises concurrent writers on the
+    pack, so each recompute reads the other's committed inputs.
+    """
+    registry = await load_registry(db)
+    affected = registry.downstream(changed_field_ids)
+    if not affected:
+        return False
+    return bool(await _recompute(db, registry, affected, [pack_id], user_id))
+
+
+async def rebuild_fields(session: AsyncSession, field_ids: Iterable[int], user_id: int) -> int:
+    """Re-evaluate the formulas of ``field_ids`` and everything downstream over all packs.
+
+    Fields in ``field_ids`` that no longer have a formula lose their derived
+    values. Commits once per batch of REBUILD_BATCH_SIZE packs; returns the
+    number of packs whose values changed.
+    """
+    field_ids = set(field_ids)
+    registry = await load_registry(session)
+    changed_packs = 0
+
+    removed = [fid for fid in field_ids if fid not in registry.formulas]
+    if removed:
+        result = await session.execute(
+            update(FieldValue)
+            .where(
+                FieldValue.field_id.in_(removed),
+                FieldValue.is_derived == True,  # noqa: E712
+                FieldValue.is_active == True,  # noqa: E712
+            )
+            .values(is_active=False)
+            .returning(FieldValue.id, FieldValue.pack_id)
+        )
+        rows = result.all()
+        cleared = {row.pack_id for row in rows}
+        await record_revisions(session, [(row.pack_id, row.id) for row in rows], user_id)
+        await bump_pack_revisions(session, cleared)
+        await refresh_conflicts(session, cleared)
+        await session.commit()
+        changed_packs += len(cleared)
+
+    affected = [fid for fid in registry.order if fid in field_ids]
+    affected = sorted(set(affected) | set(registry.downstream(field_ids)), key=registry.order.index)
+    if not affected:
+        return changed_packs
+
+    after = 0
+    while True:
+        # Lock the batch like a value write would, so concurrent writes interleave cleanly
+        result = await session.execute(
+            select(Pack.id)
+            .where(Pack.is_active == True, Pack.id > after)  # noqa: E712
+            .order_by(Pack.id)
+            .limit(REBUILD_BATCH_SIZE)
+            .with_for_update()
+        )
+        pack_ids = list(result.scalars())
+        if not pack_ids:
+            break
+        changed = await _recompute(session, registry, affected, pack_ids, user_id)
+        await bump_pack_revisions(session, changed)
+        await refresh_conflicts(session, changed)
+        await session.commit()
+        changed_packs += len(changed)
+        after = pack_ids[-1]
+    return changed_packs
+
+
+async def rebuild_derived_fields(field_ids: list[int], user_id: int) -> None:
+    """Background-task entry point for rebuild_fields() on its own session."""
+    try:
+        async with async_session() as session:
+            changed = await rebuild_fields(session, field_ids, user_id)
+        logger.info("Rebuilt derived fields %s: %d packs changed", field_ids, changed)
+    except Exception:
+        logger.exception("Rebuilding derived fields %s failed", field_ids)
@@ -0,0 +1,85 @@
+"""Append-only value history (``field_value_revisions``).
+
+``field_values`` holds each value's current state. Every write that changes a
+value's contents or deletes it also calls record_revisions() in the same
+transaction, which closes the value's open revision and opens one with the
+new contents. The revisions valid at a moment are then the pack's values as
+they stood ("what did we believe on March 1st?"): see
+``resolve_packs_values(as_of=...)``.
+
+Re-parsing numbers (app.services.numeric) is not a change of contents and is
+not recorded; past states keep the numbers parsed at the time.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import DateTime, func, literal, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.value import FieldValue, FieldValueRevision
+
+# Values per statement, well under asyncpg's 32767 bind parameters
+WRITE_CHUNK_SIZE = 5000
+
+# Copied from the value row into each revision
+_CONTENT_COLUMNS = (
+    "value_id", "pack_id", "field_id", "value_text", "value_numeric", "value_min", "value_max",
+    "value_approximate", "source_type", "source_detail", "contributed_by", "is_derived", "created_at",
+)
+
+
+def as_utc(moment: datetime) -> datetime:
+    """``as_of`` parameters without an offset are taken as UTC."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+async def record_revisions(db: AsyncSession, values: Iterable[tuple[int, int]], user_id: Optional[int]) -> None:
+    """Log the current state of ``values``, ``(pack_id, value_id)`` pairs, after writing them.
+
+    Call after the ``field_values`` rows are flushed, while the write holds
+    the pack lock (see bump_pack_revision()), so revisions of one value are
+    recorded in commit order. Inactive values only get their open revision
+    closed. field_values is partitioned on pack_id, so each value is looked
+    up with its pack.
+    """
+    values = sorted(set(values))
+    if not values:
+        return
+    # One timestamp for both statements, so the old revision ends exactly
+    # where the new one starts. The clock, not now(): a transaction that
+    # started earlier but waited on the pack lock still records after the
+    # writer it waited for
+    moment = literal((await db.execute(select(func.clock_timestamp()))).scalar_one(), DateTime(timezone=True))
+
+    for start in range(0, len(values), WRITE_CHUNK_SIZE):
+        chunk = values[start:start + WRITE_CHUNK_SIZE]
+        await db.execute(
+            update(FieldValueRevision)
+            .where(
+                tuple_(FieldValueRevision.pack_id, FieldValueRevision.value_id).in_(chunk),
+                func.upper_inf(FieldValueRevision.valid),
+            )
+            .values(
+                valid=func.tstzrange(
+                    func.lower(FieldValueRevision.valid), func.greatest(func.lower(FieldValueRevision.valid), moment)
+                )
+            )
+        )
+        await db.execute(
+            pg_insert(FieldValueRevision).from_select(
+                [*_CONTENT_COLUMNS, "valid", "recorded_by"],
+                select(
+                    FieldValue.id, FieldValue.pack_id, FieldValue.field_id, FieldValue.value_text,
+                    FieldValue.value_numeric, FieldValue.value_min, FieldValue.value_max,
+                    FieldValue.value_approximate, FieldValue.source_type, FieldValue.source_detail,
+                    FieldValue.contributed_by, FieldValue.is_derived, FieldValue.created_at,
+                    func.tstzrange(moment, null()),
+                    literal(user_id, FieldValueRevision.recorded_by.type),
+                ).where(
+                    tuple_(FieldValue.pack_id, FieldValue.id).in_(chunk),
+                    FieldValue.is_active == True,  # noqa: E712
+                ),
+            )
+        )
@@ -0,0 +1,298 @@
+"""Parsing of number-field text into canonical numbers, keyed on ``Field.unit``.
+
+``parse_numeric("75 000 Wh", "kWh")`` -> ``ParsedNumber(value=75.0, low=75.0, high=75.0)``.
+
+Handles, in the field's unit:
+
+- unit suffixes convertible to the field unit (``Wh`` for ``kWh``, ``g`` for ``kg``)
+- decimal commas and thousands separators (``75,0``, ``1.234,5``, ``1 234.5``)
+- ranges (``70-75``, ``70 to 75 kWh``) -> midpoint with both bounds
+- tolerances (``75 ± 2``)
+- approximations (``≈75``, ``~75``, ``ca. 75``) -> flagged approximate
+- one-sided limits (``<75``, ``up to 75``, ``>= 300``) -> one open bound
+- a trailing parenthetical note (``75 kWh (estimated)``)
+
+Anything else — a unit from another dimension, free text — yields None so
+``value_numeric`` stays NULL rather than wrong.
+
+normalize_values() re-derives the stored columns from ``value_text`` for
+existing rows: the backfill, and the follow-up when a field's unit or data
+type changes.
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.field import Field
+from app.models.value import FieldValue
+from app.services.conflicts import refresh_conflicts
+from app.services.formulas import load_registry, rebuild_fields
+from app.services.value_resolver import bump_pack_revisions
+
+logger = logging.getLogger("app.numeric")
+
+NORMALIZE_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class ParsedNumber:
+    value: float
+    low: Optional[float]  # None: unbounded below
+    high: Optional[float]  # None: unbounded above
+    approximate: bool = False
+
+
+# Canonical (seeded) unit -> accepted spellings and their factor to it
+UNIT_ALIASES: dict[str, dict[str, float]] = {
+    "kWh": {"kWh": 1, "Wh": 1e-3, "MWh": 1e3},
+    "kW": {"kW": 1, "W": 1e-3, "MW": 1e3},
+    "kg": {"kg": 1, "g": 1e-3, "t": 1e3, "lb": 0.45359237, "lbs": 0.45359237},
+    "V": {"V": 1, "mV": 1e-3, "kV": 1e3},
+    "Ah": {"Ah": 1, "mAh": 1e-3},
+    "Wh/kg": {"Wh/kg": 1, "kWh/kg": 1e3},
+    "Wh/L": {"Wh/L": 1, "Wh/l": 1, "kWh/L": 1e3, "kWh/l": 1e3},
+    "mm": {"mm": 1, "cm": 10, "m": 1e3},
+    "mm²": {"mm²": 1, "mm2": 1, "mm^2": 1, "cm²": 100, "cm2": 100},
+}
+
+
+def _lowercase_aliases(aliases: dict[str, float]) -> dict[str, float]:
+    # Case-insensitive fallback ("kwh", "AH"), except for milli/mega-prefixed
+    # spellings: "mw" could be either, so those have to match exactly
+    return {
+        alias.lower(): factor
+        for alias, factor in aliases.items()
+        if not (alias[0] in "mM" and alias[1:2] not in ("", "m"))
+    }
+
+
+_FOLDED_ALIASES = {unit: _lowercase_aliases(aliases) for unit, aliases in UNIT_ALIASES.items()}
+
+# Regular, no-break, narrow no-break and thin spaces, and Swiss apostrophes
+_GROUP_SPACES = "' \u00a0\u202f\u2009"
+_APPROX_PREFIX = re.compile(r"^(?:≈|~|ca\.?|circa|approx\.?|approximately|about|around)\s*", re.IGNORECASE)
+_LIMIT_PREFIX = re.compile(r"^(<=|>=|≤|≥|<|>|up to|max\.?|min\.?)\s*", re.IGNORECASE)
+_NOTE_SUFFIX = re.compile(r"\s*\([^()]*\)$")
+
+_NUMBER = rf"[+-]?\d(?:[\d.,{_GROUP_SPACES}]*\d)?(?:[eE][+-]?\d+)?"
+_UNIT = r"[^\W\d_][\w/^²³.]*"
+_PATTERN = re.compile(
+    rf"^(?P<first>{_NUMBER})\s*(?P<first_unit>{_UNIT})?"
+    rf"(?:\s*(?:-|–|—|to|\.\.\.?)\s*(?P<second>{_NUMBER})\s*(?P<second_unit>{_UNIT})?)?"
+    rf"(?:\s*(?:±|\+/-)\s*(?P<tolerance>{_NUMBER})\s*(?P<tolerance_unit>{_UNIT})?)?$"
+)
+# A leading 0 is never a thousands group: "0,500" is a decimal comma
+_THOUSANDS_GROUPS = re.compile(r"^[1-9]\d{0,2}(?:[,.]\d{3})+$")
+_SPACE_GROUPS = re.compile(rf"^[1-9]\d{{0,2}}(?:[{_GROUP_SPACES}]\d{{3}})+(?:[.,]\d+)?$")
+
+
+def _to_float(text: str) -> Optional[float]:
+    sign = exponent = ""
+    if text[0] in "+-":
+        sign, text = text[0], text[1:]
+    if "e" in text.lower():
+        text, exponent = re.split("[eE]", text, maxsplit=1)
+        exponent = "e" + exponent
+    if any(space in text for space in _GROUP_SPACES):
+        # Spaces and apostrophes only ever group thousands
+        if not _SPACE_GROUPS.match(text):
+            return None
+        text = re.sub(f"[{_GROUP_SPACES}]", "", text)
+
+    if "," in text and "." in text:
+        # Whichever separator comes last is the decimal one
+        thousands, decimal = (".", ",") if text.rfind(",") > text.rfind(".") else (",", ".")
+        text = text.replace(thousands, "").replace(decimal, ".")
+    elif "," in text or "." in text:
+        separator = "," if "," in text else "."
+        # "1,234" / "1.234.567": thousands groups; "75,0" / "3.65": decimal
+        if text.count(separator) > 1 or (separator == "," and _THOUSANDS_GROUPS.match(text)):
+            if not _THOUSANDS_GROUPS.match(text):
+                return None
+            text = text.replace(separator, "")
+        else:
+            text = text.replace(",", ".")
+    try:
+        value = float(sign + text + exponent)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _unit_factor(unit: Optional[str], field_unit: Optional[str]) -> Optional[float]:
+    """Factor converting ``unit`` to ``field_unit``; None when not convertible."""
+    if unit is None:
+        return 1.0
+    if field_unit is None:
+        return None
+    aliases = UNIT_ALIASES.get(field_unit)
+    if aliases is None:
+        return 1.0 if unit.lower() == field_unit.lower() else None
+    if unit in aliases:
+        return aliases[unit]
+    return _FOLDED_ALIASES[field_unit].get(unit.lower())
+
+
+def parse_numeric(text: Optional[str], field_unit: Optional[str]) -> Optional[ParsedNumber]:
+    """Parse ``text`` as a quantity in ``field_unit``; None when it isn't one."""
+    if not text:
+        return None
+    text = _NOTE_SUFFIX.sub("", text.strip())
+
+    approximate = False
+    match = _APPROX_PREFIX.match(text)
+    if match:
+        approximate = True
+        text = text[match.end():]
+    limit = None
+    match = _LIMIT_PREFIX.match(text)
+    if match:
+        limit = match.group(1).lower()
+        text = text[match.end():]
+
+    match = _PATTERN.match(text)
+    if match is None:
+        return None
+    first, second, tolerance = match.group("first", "second", "tolerance")
+    if limit is not None and (second is not None or tolerance is not None):
+        return None
+
+    # A unit given only once ("70-75 kWh") applies to every number
+    units = [u for u in match.group("first_unit", "second_unit", "tolerance_unit") if u is not None]
+    if len(set(units)) > 1:
+        return None
+    factor = _unit_factor(units[0] if units else None, field_unit)
+    if factor is None:
+        return None
+
+    numbers = [_to_float(n) if n is not None else None for n in (first, second, tolerance)]
+    if numbers[0] is None or (second is not None and numbers[1] is None) or (
+        tolerance is not None and numbers[2] is None
+    ):
+        return None
+    value = numbers[0] * factor
+
+    if second is not None:
+        low, high = sorted((value, numbers[1] * factor))
+        value = (low + high) / 2
+    elif tolerance is not None:
+        spread = abs(numbers[2] * factor)
+        low, high = value - spread, value + spread
+    elif limit in ("<", "<=", "≤", "up to", "max", "max."):
+        low, high = None, value
+    elif limit in (">", ">=", "≥", "min", "min."):
+        low, high = value, None
+    else:
+        low = high = value
+    return ParsedNumber(value=_clean(value), low=_clean(low), high=_clean(high), approximate=approximate)
+
+
+def _clean(value: Optional[float]) -> Optional[float]:
+    # Drop float noise from unit factors: 75000 * 1e-3 -> 75.0, not 75.00000000000001
+    return None if value is None else float(format(value, ".12g"))
+
+
+def numeric_columns(text: Optional[str], data_type: str, field_unit: Optional[str]) -> dict:
+    """``field_values`` numeric columns for ``text`` written to a field of this type and unit."""
+    parsed = parse_numeric(text, field_unit) if data_type == "number" else None
+    if parsed is None:
+        return {"value_numeric": None, "value_min": None, "value_max": None, "value_approximate": False}
+    return {
+        "value_numeric": parsed.value,
+        "value_min": parsed.low,
+        "value_max": parsed.high,
+        "value_approximate": parsed.approximate,
+    }
+
+
+async def normalize_values(session: AsyncSession, field_ids: Optional[Iterable[int]] = None) -> tuple[int, set[int]]:
+    """Re-parse stored values of ``field_ids`` (default: every number field).
+
+    Walks ``field_values`` in id order, rewriting only rows whose numeric
+    columns change, and commits per batch. Calculated values are skipped —
+    the formula engine owns them. Returns (rows changed, fields changed).
+    """
+    fields_q = select(Field.id, Field.data_type, Field.unit)
+    if field_ids is None:
+        fields_q = fields_q.where(Field.data_type == "number")
+    else:
+        fields_q = fields_q.where(Field.id.in_(list(field_ids)))
+    fields = {row.id: row for row in (await session.execute(fields_q)).all()}
+    if not fields:
+        return 0, set()
+
+    table = FieldValue.__table__
+    # Keep updated_at: re-parsing is not an edit
+    update_stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            value_numeric=bindparam("b_value_numeric"),
+            value_min=bindparam("b_value_min"),
+            value_max=bindparam("b_value_max"),
+            value_approximate=bindparam("b_value_approximate"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+    changed_rows, changed_fields = 0, set()
+    after = 0
+    while True:
+        result = await session.execute(
+            select(
+                FieldValue.id, FieldValue.pack_id, FieldValue.field_id, FieldValue.value_text,
+                FieldValue.is_active, FieldValue.value_numeric, FieldValue.value_min,
+                FieldValue.value_max, FieldValue.value_approximate,
+            )
+            .where(
+                FieldValue.field_id.in_(list(fields)),
+                FieldValue.is_derived == False,  # noqa: E712
+                FieldValue.id > after,
+            )
+            .order_by(FieldValue.id)
+            .limit(NORMALIZE_BATCH_SIZE)
+        )
+        rows = result.all()
+        if not rows:
+            break
+
+        updates, packs = [], set()
+        for row in rows:
+            field = fields[row.field_id]
+            columns = numeric_columns(row.value_text, field.data_type, field.unit)
+            if tuple(columns.values()) != tuple(row[5:]):
+                updates.append({"b_id": row.id, **{f"b_{k}": v for k, v in columns.items()}})
+                changed_fields.add(row.field_id)
+                if row.is_active:
+                    packs.add(row.pack_id)
+        if updates:
+            await session.execute(update_stmt, updates)
+            await bump_pack_revisions(session, packs)
+            await refresh_conflicts(session, packs)
+        await session.commit()
+        changed_rows += len(updates)
+        after = rows[-1].id
+    return changed_rows, changed_fields
+
+
+async def renormalize_field(field_id: int, user_id: int) -> None:
+    """Background task after a field's unit or data type changes.
+
+    Formulas fed by the field are rebuilt too, attributed to ``user_id``.
+    """
+    try:
+        async with async_session() as session:
+            changed, fields = await normalize_values(session, [field_id])
+            downstream = (await load_registry(session)).downstream(fields) if fields else []
+            if downstream:
+                await rebuild_fields(session, downstream, user_id)
+        logger.info("Re-normalized field %s: %d values changed", field_id, changed)
+    except Exception:
+        logger.exception("Re-normalizing field %s failed", field_id)
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from sqlalchemy import or_
+
+from app.models.pack import Pack
+
+# Exact-match browse filters shared by the pack list, facets and field views
+FILTER_FIELDS = ("oem", "model", "market", "fuel_type", "vehicle_class", "drivetrain", "platform")
+
+
+def pack_filters(filters: dict[str, Optional[str]]) -> dict[str, object]:
+    """Map each active browse filter to its WHERE condition."""
+    conditions = {}
+    for name in FILTER_FIELDS:
+        if filters.get(name):
+            conditions[name] = getattr(Pack, name) == filters[name]
+
+    # Text search
+    if filters.get("search"):
+        pattern = f"%{filters['search']}%"
+        conditions["search"] = or_(
+            Pack.oem.ilike(pattern),
+            Pack.model.ilike(pattern),
+            Pack.variant.ilike(pattern),
+            Pack.platform.ilike(pattern),
+        )
+    return conditions
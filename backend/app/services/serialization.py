@@ -0,0 +1,128 @@
+"""Row-to-dict builders for the read paths that skip pydantic.
+
+Each builder produces exactly the keys of the corresponding response schema
+(``PackResponse``, ``ValueResponse``); select the matching ``*_COLUMNS`` and
+pass the row straight in.
+"""
+
+from sqlalchemy import func, true
+
+from app.models.pack import Pack
+from app.models.value import FieldValue, FieldValueRevision
+
+PACK_COLUMNS = (
+    Pack.id, Pack.oem, Pack.model, Pack.year, Pack.variant, Pack.market,
+    Pack.fuel_type, Pack.vehicle_class, Pack.drivetrain, Pack.platform,
+    Pack.is_active, Pack.created_by,
+    # created_by_name is selected separately and spliced in here
+    Pack.created_at, Pack.updated_at,
+)
+_PACK_KEYS = tuple(c.key for c in PACK_COLUMNS)
+
+VALUE_COLUMNS = (
+    FieldValue.id, FieldValue.pack_id, FieldValue.field_id, FieldValue.value_text,
+    FieldValue.value_numeric, FieldValue.value_min, FieldValue.value_max, FieldValue.value_approximate,
+    FieldValue.source_type, FieldValue.source_detail,
+    FieldValue.contributed_by, FieldValue.is_active, FieldValue.created_at, FieldValue.updated_at,
+)
+_VALUE_KEYS = tuple(c.key for c in VALUE_COLUMNS)
+
+# A past state of a value, in VALUE_COLUMNS order: updated_at is when that
+# state began. Revisions store timestamptz, which asyncpg returns aware (and
+# orjson suffixes "Z"); FieldValue maps naive UTC timestamps, so convert in SQL
+REVISION_VALUE_COLUMNS = (
+    FieldValueRevision.value_id, FieldValueRevision.pack_id, FieldValueRevision.field_id,
+    FieldValueRevision.value_text, FieldValueRevision.value_numeric, FieldValueRevision.value_min,
+    FieldValueRevision.value_max, FieldValueRevision.value_approximate,
+    FieldValueRevision.source_type, FieldValueRevision.source_detail,
+    FieldValueRevision.contributed_by, true(),
+    func.timezone("UTC", FieldValueRevision.created_at, type_=FieldValue.created_at.type),
+    func.timezone("UTC", func.lower(FieldValueRevision.valid), type_=FieldValue.updated_at.type),
+)
+
+
+def pack_row_to_dict(row, creator_name: str | None) -> dict:
+    """``row`` holds the PACK_COLUMNS values in order."""
+    pack = dict(zip(_PACK_KEYS, row))
+    pack["created_by_name"] = creator_name
+    return pack
+
+
+def value_row_to_dict(row, contributor_name: str | None, comment_count: int) -> dict:
+    """``row`` holds the VALUE_COLUMNS values in order."""
+    value = dict(zip(_VALUE_KEYS, row))
+    value["contributor_name"] = contributor_name
+    value["comment_count"] = comment_count
+    return value
+
+
+# Compact wire format (?format=compact): each value becomes a positional row
+# and the repeated source types and contributors move into lookup tables
+COMPACT_VALUE_COLUMNS = (
+    "id", "value_text", "value_numeric", "source", "source_detail",
+    "contributor", "comment_count", "created_at", "updated_at",
+)
+
+
+class CompactEncoder:
+    """Dictionary-encodes value dicts into rows shaped by COMPACT_VALUE_COLUMNS.
+
+    ``source`` and ``contributor`` are indexes into ``table()["sources"]`` and
+    ``table()["contributors"]`` (``[user_id, display_name]`` pairs).
+    """
+
+    def __init__(self):
+        self._sources: dict[str, int] = {}
+        self._contributors: dict[int, int] = {}
+        self._contributor_rows: list[list] = []
+
+    def row(self, value: dict | None) -> list | None:
+        if value is None:
+            return None
+        source = self._sources.setdefault(value["source_type"], len(self._sources))
+        contributor = self._contributors.get(value["contributed_by"])
+        if contributor is None:
+            contributor = self._contributors[value["contributed_by"]] = len(self._contributor_rows)
+            self._contributor_rows.append([value["contributed_by"], value["contributor_name"]])
+        return [
+            value["id"], value["value_text"], value["value_numeric"], source, value["source_detail"],
+            contributor, value["comment_count"], value["created_at"], value["updated_at"],
+        ]
+
+    def table(self) -> dict:
+        return {
+            "columns": COMPACT_VALUE_COLUMNS,
+            "sources": list(self._sources),
+            "contributors": self._contributor_rows,
+        }
+
+
+def compact_field(field: dict, rows: list) -> dict:
+    return {
+        "field_id": field["field_id"],
+        "field_name": field["field_name"],
+        "display_name": field["display_name"],
+        "unit": field["unit"],
+        "data_type": field["data_type"],
+        "values": rows,
+    }
+
+
+def compact_domains(domains: list[dict], encoder: CompactEncoder) -> list[dict]:
+    """Compact form of resolve_pack_values() output; each field's rows stay best-first."""
+    return [
+        {
+            "domain_id": domain["domain_id"],
+            "domain_name": domain["domain_name"],
+            "sort_order": domain["sort_order"],
+            "fields": [
+                {
+                    **compact_field(field, [encoder.row(v) for v in field["all_values"]]),
+                    "agreement": field["agreement"],
+                    "disputed": field["disputed"],
+                }
+                for field in domain["fields"]
+            ],
+        }
+        for domain in domains
+    ]
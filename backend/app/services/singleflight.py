@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.utils.metrics import SINGLEFLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation.
+
+    The first caller (the leader) runs ``fn`` on its own request's resources;
+    callers arriving while it is in flight await the same result instead of
+    repeating the work. Nothing is kept once the call finishes — this is not a
+    cache, so keys must change whenever the underlying data does (e.g. by
+    including a revision) for later callers to see fresh results.
+
+    Results are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._leader_counter = SINGLEFLIGHT_CALLS.labels(name, "leader")
+        self._shared_counter = SINGLEFLIGHT_CALLS.labels(name, "shared")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (call := self._calls.get(key)) is not None:
+            self._shared_counter.inc()
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise  # this caller was cancelled
+                # The leader was cancelled (client went away) — retry, leading if nobody else has
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self._leader_counter.inc()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except Exception as exc:
+            call.set_exception(exc)
+            call.exception()  # mark retrieved: followers re-raise it, the leader raises below
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -1,159 +1,467 @@
-from sqlalchemy import func, select
+import logging
+import time
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import DateTime, Select, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.config import settings
+from app.database import async_session
 from app.models.comment import Comment
+from app.models.conflict import ValueConflict
 from app.models.domain import Domain
 from app.models.field import Field
-from app.models.source_priority import DEFAULT_PRIORITY, SourcePriority
-from app.models.value import FieldValue
+from app.models.pack import Pack
+from app.models.source_priority import DEFAULT_PRIORITY, PriorityProfile, SourcePriority
+from app.models.value import FieldValue, FieldValueRevision
 from app.models.user import User
-from app.schemas.value import (
-    DomainWithResolvedFields,
-    ResolvedFieldValue,
-    ValueResponse,
+from app.services.cache import TTLCache
+from app.services.serialization import REVISION_VALUE_COLUMNS, VALUE_COLUMNS, value_row_to_dict
+from app.services.singleflight import SingleFlight
+from app.utils.metrics import RESOLVER_DURATION, RESOLVER_FIELDS, RESOLVER_VALUES
+from app.utils.tracing import tracer
+
+
+logger = logging.getLogger("app.resolver")
+
+# Concurrent identical resolutions (same pack, revision and priority profile)
+# share one computation — e.g. a pack linked in a meeting and opened by everyone
+_resolutions = SingleFlight("resolve_pack_values")
+
+# Finished resolutions under shared orders (priority profiles and the default),
+# keyed by pack revision so value writes need no invalidation; field and
+# domain writes change every pack's resolution and clear it on commit.
+# Personal orders are only coalesced: caching them would mean an entry set per user
+resolution_cache = TTLCache(
+    "pack_resolutions",
+    ttl_seconds=settings.RESOLUTION_CACHE_TTL_SECONDS,
+    max_entries=settings.RESOLUTION_CACHE_MAX_ENTRIES,
 )
 
 
-async def _get_user_priority(db: AsyncSession, user_id: int) -> list[str]:
+async def get_user_priority(db: AsyncSession, user_id: int) -> list[str]:
+    return (await get_user_profile(db, user_id))[0]
+
+
+async def get_user_profile(db: AsyncSession, user_id: int) -> tuple[list[str], bool]:
+    """The user's effective priority order, and whether it is shared.
+
+    Subscribers of a priority profile get its order; users without a
+    preference get DEFAULT_PRIORITY. Resolutions under shared orders are
+    cached (see resolve_pack_values_shared()).
+    """
+    result = await db.execute(
+        select(SourcePriority.priority_order, PriorityProfile.priority_order)
+        .outerjoin(PriorityProfile, SourcePriority.profile_id == PriorityProfile.id)
+        .where(SourcePriority.user_id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return list(DEFAULT_PRIORITY), True
+    own_order, profile_order = row
+    if profile_order is not None:
+        return profile_order, True
+    return own_order, own_order == DEFAULT_PRIORITY
+
+
+async def shared_priority_orders(db: AsyncSession) -> list[list[str]]:
+    """DEFAULT_PRIORITY plus the order of every profile that has subscribers."""
     result = await db.execute(
-        select(SourcePriority).where(SourcePriority.user_id == user_id)
+        select(PriorityProfile.priority_order)
+        .where(select(SourcePriority.user_id).where(SourcePriority.profile_id == PriorityProfile.id).exists())
+        .order_by(PriorityProfile.id)
     )
-    sp = result.scalar_one_or_none()
-    if sp is None:
-        return list(DEFAULT_PRIORITY)
-    return sp.priority_order
+    orders = {tuple(DEFAULT_PRIORITY): list(DEFAULT_PRIORITY)}
+    for order in result.scalars():
+        orders.setdefault(tuple(order), order)
+    return list(orders.values())
+
+
+def value_conditions(value_id: int, pack_id: int | None = None) -> list:
+    """WHERE conditions for one active value by id.
+
+    field_values is partitioned on pack_id, so an id alone is probed in
+    every partition; callers that know the value's pack pass it to search
+    only that one.
+    """
+    conditions = [FieldValue.id == value_id, FieldValue.is_active == True]  # noqa: E712
+    if pack_id is not None:
+        conditions.append(FieldValue.pack_id == pack_id)
+    return conditions
 
 
-def _sort_key(source_type: str, priority_order: list[str]) -> int:
+def _observe(started: float, fields: int, values: int) -> None:
+    RESOLVER_DURATION.observe(time.perf_counter() - started)
+    RESOLVER_FIELDS.inc(fields)
+    RESOLVER_VALUES.inc(values)
+
+
+async def bump_pack_revision(db: AsyncSession, pack_id: int) -> None:
+    """Call in every transaction that changes a pack's values or their comments."""
+    await bump_pack_revisions(db, [pack_id])
+
+
+async def bump_pack_revisions(db: AsyncSession, pack_ids: Iterable[int]) -> None:
+    pack_ids = sorted(pack_ids)
+    if not pack_ids:
+        return
+    # updated_at tracks pack metadata edits, so keep onupdate from firing
+    await db.execute(
+        update(Pack).where(Pack.id.in_(pack_ids)).values(revision=Pack.revision + 1, updated_at=Pack.updated_at)
+    )
+
+
+async def resolve_pack_values_shared(
+    db: AsyncSession,
+    pack_id: int,
+    revision: int,
+    priority_order: list[str],
+    domain_id: int | None = None,
+    shared: bool = False,
+) -> list[dict]:
+    """resolve_pack_values() coalesced with identical in-flight calls.
+
+    ``revision`` must be the pack's current ``packs.revision`` as read by the
+    caller, so a request that starts after a write never joins a resolution
+    that began before it. With ``shared`` (the order is a shared one, see
+    get_user_profile()) the result is also kept in resolution_cache. The
+    result is shared: do not mutate it.
+    """
+    key = (pack_id, revision, tuple(priority_order), domain_id)
+    if shared:
+        cached = resolution_cache.get(key)
+        if cached is not None:
+            return cached
+    generation = resolution_cache.generation
+    # The session's bind separates replica reads from primary (read-your-writes) reads
+    resolved = await _resolutions.do(
+        (*key, generation, db.bind),
+        lambda: resolve_pack_values(db, pack_id, domain_id=domain_id, priority_order=priority_order),
+    )
+    if shared and resolution_cache.generation == generation:
+        resolution_cache.set(key, resolved)
+    return resolved
+
+
+async def precompute_resolutions(pack_ids: list[int]) -> None:
+    """Background task after value writes: resolve the packs under every shared order in use.
+
+    Fills this worker's resolution_cache so the next detail request for a
+    subscribed profile is a cache hit.
+    """
     try:
-        return priority_order.index(source_type)
-    except ValueError:
-        return len(priority_order)
+        async with async_session() as session:
+            orders = await shared_priority_orders(session)
+            result = await session.execute(
+                select(Pack.id, Pack.revision).where(Pack.id.in_(pack_ids), Pack.is_active == True)  # noqa: E712
+            )
+            for pack_id, revision in result.all():
+                for order in orders:
+                    await resolve_pack_values_shared(session, pack_id, revision, order, shared=True)
+    except Exception:
+        logger.exception("Precomputing resolutions for packs %s failed", pack_ids)
 
 
 async def resolve_pack_values(
     db: AsyncSession,
     pack_id: int,
-    user_id: int,
+    user_id: int | None = None,
     domain_id: int | None = None,
-) -> list[DomainWithResolvedFields]:
-    priority_order = await _get_user_priority(db, user_id)
-
-    # Get all domains (optionally filtered)
-    domain_q = select(Domain).order_by(Domain.sort_order)
-    if domain_id is not None:
-        domain_q = domain_q.where(Domain.id == domain_id)
-    domains_result = await db.execute(domain_q)
-    domains = domains_result.scalars().all()
-
-    # Get all active fields for those domains
-    domain_ids = [d.id for d in domains]
-    fields_q = (
-        select(Field)
-        .where(Field.domain_id.in_(domain_ids), Field.is_active == True)  # noqa: E712
-        .order_by(Field.sort_order)
+    priority_order: list[str] | None = None,
+    as_of: datetime | None = None,
+) -> list[dict]:
+    """Resolve the best value per field for one pack by the user's source priority.
+
+    Pass either ``user_id`` or an already loaded ``priority_order``. Returns
+    plain dicts shaped like ``DomainWithResolvedFields``, built straight from
+    row tuples so read endpoints can encode them without a pydantic pass.
+    """
+    if priority_order is None:
+        with tracer.start_as_current_span("resolver.priority"):
+            priority_order = await get_user_priority(db, user_id)
+    resolved = await resolve_packs_values(
+        db, [pack_id], priority_order, domain_ids=None if domain_id is None else [domain_id], as_of=as_of
     )
-    fields_result = await db.execute(fields_q)
-    all_fields = fields_result.scalars().all()
+    return resolved[pack_id]
+
+
+async def resolve_packs_values(
+    db: AsyncSession,
+    pack_ids: list[int],
+    priority_order: list[str],
+    domain_ids: list[int] | None = None,
+    field_ids: list[int] | None = None,
+    include_all_values: bool = True,
+    as_of: datetime | None = None,
+) -> dict[int, list[dict]]:
+    """Resolve several packs at once: one domain, field and value query in total.
 
-    # Build lookup: domain_id -> list of fields
-    fields_by_domain: dict[int, list[Field]] = {}
-    for f in all_fields:
-        fields_by_domain.setdefault(f.domain_id, []).append(f)
+    Returns ``{pack_id: domains}`` with each entry shaped like
+    resolve_pack_values(). ``field_ids`` restricts the result to those fields,
+    dropping domains left without any; with ``include_all_values=False`` only
+    the resolved value is returned (``all_values`` is empty, while
+    ``alternative_count`` still counts the others).
+
+    With ``as_of`` the values are the revisions valid at that moment
+    (app.services.history) and comment counts only include comments made by
+    then. Fields are today's, and source agreement is not kept historically:
+    ``agreement`` is None and ``disputed`` False.
+    """
+    started = time.perf_counter()
+    # Unknown source types sort after every ranked one
+    rank = {source: i for i, source in enumerate(priority_order)}
+    unranked = len(priority_order)
+
+    with tracer.start_as_current_span("resolver.fields"):
+        # Get all domains (optionally filtered)
+        domain_q = select(Domain.id, Domain.name, Domain.sort_order).order_by(Domain.sort_order)
+        if domain_ids is not None:
+            domain_q = domain_q.where(Domain.id.in_(domain_ids))
+        domains_result = await db.execute(domain_q)
+        domains = domains_result.all()
+
+        # Get all active fields for those domains
+        fields_q = (
+            select(Field.id, Field.domain_id, Field.name, Field.display_name, Field.unit, Field.data_type)
+            .where(Field.domain_id.in_([d.id for d in domains]), Field.is_active == True)  # noqa: E712
+            .order_by(Field.sort_order)
+        )
+        if field_ids is not None:
+            fields_q = fields_q.where(Field.id.in_(field_ids))
+        fields_result = await db.execute(fields_q)
+        all_fields = fields_result.all()
 
-    # Get all active values for this pack, joined with contributor name
-    field_ids = [f.id for f in all_fields]
-    if not field_ids:
+        # Build lookup: domain_id -> list of fields
+        fields_by_domain: dict[int, list] = {}
+        for f in all_fields:
+            fields_by_domain.setdefault(f.domain_id, []).append(f)
+        if field_ids is not None:
+            # Sparse selection: only the domains the selected fields belong to
+            domains = [d for d in domains if d.id in fields_by_domain]
+
+    # Get all active values for these packs, joined with contributor name
+    if not all_fields:
         # No fields — return empty domains
-        return [
-            DomainWithResolvedFields(
-                domain_id=d.id, domain_name=d.name, sort_order=d.sort_order, fields=[]
+        _observe(started, 0, 0)
+        return {
+            pack_id: [
+                {"domain_id": d.id, "domain_name": d.name, "sort_order": d.sort_order, "fields": []}
+                for d in domains
+            ]
+            for pack_id in pack_ids
+        }
+
+    with tracer.start_as_current_span("resolver.values"):
+        if as_of is None:
+            values_q = (
+                select(*VALUE_COLUMNS, User.display_name, FieldValue.comment_count)
+                .join(User, FieldValue.contributed_by == User.id)
+                .where(
+                    FieldValue.pack_id.in_(pack_ids),
+                    FieldValue.field_id.in_([f.id for f in all_fields]),
+                    FieldValue.is_active == True,  # noqa: E712
+                )
+            )
+        else:
+            # The models map timestamps without a zone; bind as_of as timestamptz
+            moment = literal(as_of, DateTime(timezone=True))
+            # Counted per value on idx_comments_value_created, not over the whole table
+            comment_count = (
+                select(func.count())
+                .where(Comment.value_id == FieldValueRevision.value_id, Comment.created_at <= moment)
+                .scalar_subquery()
+            )
+            values_q = (
+                select(*REVISION_VALUE_COLUMNS, User.display_name, comment_count)
+                .join(User, FieldValueRevision.contributed_by == User.id)
+                .where(
+                    FieldValueRevision.pack_id.in_(pack_ids),
+                    FieldValueRevision.field_id.in_([f.id for f in all_fields]),
+                    # Both answered by the (pack_id, valid) GiST index
+                    FieldValueRevision.valid.contains(moment),
+                )
+            )
+        values_result = await db.execute(values_q)
+        values_rows = values_result.all()
+
+        consensus = {}
+        if as_of is None:
+            # Stored source agreement (app.services.conflicts), kept current by value writes
+            conflicts_result = await db.execute(
+                select(ValueConflict.pack_id, ValueConflict.field_id, ValueConflict.agreement, ValueConflict.is_conflict)
+                .where(
+                    ValueConflict.pack_id.in_(pack_ids),
+                    ValueConflict.field_id.in_([f.id for f in all_fields]),
+                )
             )
-            for d in domains
-        ]
+            consensus = {(row[0], row[1]): (row[2], row[3]) for row in conflicts_result.all()}
 
-    # Subquery for comment counts
-    comment_count_sq = (
+    with tracer.start_as_current_span("resolver.build"):
+        # Build lookup: (pack_id, field_id) -> list of ((rank, value id), value dict)
+        n_columns = len(VALUE_COLUMNS)
+        values_by_field: dict[tuple[int, int], list[tuple[int, dict]]] = {}
+        for row in values_rows:
+            value = value_row_to_dict(row[:n_columns], row[n_columns], row[n_columns + 1] or 0)
+            values_by_field.setdefault((value["pack_id"], value["field_id"]), []).append(
+                ((rank.get(value["source_type"], unranked), value["id"]), value)
+            )
+
+        # Build response
+        resolved_packs = {}
+        for pack_id in pack_ids:
+            result_domains = []
+            for domain in domains:
+                resolved_fields = []
+                for field in fields_by_domain.get(domain.id, []):
+                    # Sort by priority order; ties go to the oldest value, as in resolve_winners(),
+                    # so the same values resolve the same way now and as_of
+                    ranked = values_by_field.get((pack_id, field.id), [])
+                    ranked.sort(key=lambda x: x[0])
+                    all_values = [value for _, value in ranked]
+                    agreement, disputed = consensus.get((pack_id, field.id), (None, False))
+
+                    resolved_fields.append({
+                        "field_id": field.id,
+                        "field_name": field.name,
+                        "display_name": field.display_name,
+                        "unit": field.unit,
+                        "data_type": field.data_type,
+                        "resolved_value": all_values[0] if all_values else None,
+                        "alternative_count": max(0, len(all_values) - 1),
+                        "agreement": agreement,
+                        "disputed": disputed,
+                        "all_values": all_values if include_all_values else [],
+                    })
+
+                result_domains.append({
+                    "domain_id": domain.id,
+                    "domain_name": domain.name,
+                    "sort_order": domain.sort_order,
+                    "fields": resolved_fields,
+                })
+            resolved_packs[pack_id] = result_domains
+
+    _observe(started, len(all_fields) * len(pack_ids), len(values_rows))
+    return resolved_packs
+
+
+async def resolve_winners(
+    db: AsyncSession, pack_ids: list[int], priority_orders: list[list[str]], field_ids: list[int]
+) -> dict[tuple[int, int], list[tuple]]:
+    """Best value per (pack, field) under each of several priority orders, in one scan.
+
+    Returns ``{(pack_id, field_id): [winner per order]}`` for the pack fields
+    that have values, each winner a ``(value_id, source_type, value_text,
+    value_numeric)`` tuple. Ties go to the oldest value, as in
+    field_values_query().
+    """
+    started = time.perf_counter()
+    ranks = [({source: i for i, source in enumerate(order)}, len(order)) for order in priority_orders]
+    result = await db.execute(
         select(
-            Comment.value_id,
-            func.count(Comment.id).label("comment_count"),
+            FieldValue.pack_id, FieldValue.field_id, FieldValue.id, FieldValue.source_type,
+            FieldValue.value_text, FieldValue.value_numeric,
+        )
+        .where(
+            FieldValue.pack_id.in_(pack_ids),
+            FieldValue.field_id.in_(field_ids),
+            FieldValue.is_active == True,  # noqa: E712
         )
-        .group_by(Comment.value_id)
-        .subquery()
     )
+    rows = result.all()
+
+    # (pack_id, field_id) -> [((rank, value_id), value) per order]
+    best: dict[tuple[int, int], list[tuple]] = {}
+    for pack_id, field_id, *value in rows:
+        value = tuple(value)
+        keys = [(rank.get(value[1], unranked), value[0]) for rank, unranked in ranks]
+        current = best.get((pack_id, field_id))
+        if current is None:
+            best[(pack_id, field_id)] = [(key, value) for key in keys]
+            continue
+        for i, key in enumerate(keys):
+            if key < current[i][0]:
+                current[i] = (key, value)
+
+    _observe(started, len(pack_ids) * len(field_ids), len(rows))
+    return {key: [value for _, value in entries] for key, entries in best.items()}
+
+
+FIELD_PACK_COLUMNS = (Pack.id, Pack.oem, Pack.model, Pack.variant, Pack.year, Pack.market)
+_FIELD_PACK_KEYS = ("pack_id", "oem", "model", "variant", "year", "market")
+
+
+def field_values_query(field_id: int, priority_order: list[str], include_missing: bool = True) -> Select:
+    """One row per active pack with the resolved value of a single field.
 
-    values_q = (
-        select(FieldValue, User.display_name, comment_count_sq.c.comment_count)
-        .join(User, FieldValue.contributed_by == User.id)
-        .outerjoin(comment_count_sq, FieldValue.id == comment_count_sq.c.value_id)
+    The best value per pack is picked in SQL by the same priority rules as
+    resolve_pack_values() (ties go to the oldest value), via a LATERAL probe
+    of idx_values_field_pack_active. Callers add pack filters, ordering and
+    paging, then pass the query to resolve_field_rows().
+    """
+    rank = func.array_position(array(priority_order), FieldValue.source_type)
+    best = (
+        select(*VALUE_COLUMNS, FieldValue.comment_count, func.count().over().label("value_count"))
         .where(
-            FieldValue.pack_id == pack_id,
-            FieldValue.field_id.in_(field_ids),
+            FieldValue.field_id == field_id,
+            FieldValue.pack_id == Pack.id,
             FieldValue.is_active == True,  # noqa: E712
         )
+        .order_by(rank.asc().nulls_last(), FieldValue.id)
+        .limit(1)
+        .lateral("best")
+    )
+    return (
+        select(*FIELD_PACK_COLUMNS, *best.c, User.display_name, ValueConflict.agreement, ValueConflict.is_conflict)
+        .select_from(Pack)
+        .join(best, true(), isouter=include_missing)
+        .outerjoin(User, best.c.contributed_by == User.id)
+        .outerjoin(ValueConflict, (ValueConflict.pack_id == Pack.id) & (ValueConflict.field_id == field_id))
+        .where(Pack.is_active == True)  # noqa: E712
     )
-    values_result = await db.execute(values_q)
-    values_rows = values_result.all()
-
-    # Build lookup: field_id -> list of (FieldValue, contributor_name, comment_count)
-    values_by_field: dict[int, list[tuple]] = {}
-    for row in values_rows:
-        fv = row[0]
-        contributor_name = row[1]
-        cc = row[2] or 0
-        values_by_field.setdefault(fv.field_id, []).append((fv, contributor_name, cc))
-
-    # Build response
-    result_domains = []
-    for domain in domains:
-        domain_fields = fields_by_domain.get(domain.id, [])
-        resolved_fields = []
-
-        for field in domain_fields:
-            field_values_raw = values_by_field.get(field.id, [])
-
-            # Sort by priority order
-            field_values_raw.sort(key=lambda x: _sort_key(x[0].source_type, priority_order))
-
-            all_values = [
-                ValueResponse(
-                    id=fv.id,
-                    pack_id=fv.pack_id,
-                    field_id=fv.field_id,
-                    value_text=fv.value_text,
-                    value_numeric=fv.value_numeric,
-                    source_type=fv.source_type,
-                    source_detail=fv.source_detail,
-                    contributed_by=fv.contributed_by,
-                    contributor_name=cname,
-                    is_active=fv.is_active,
-                    created_at=fv.created_at,
-                    updated_at=fv.updated_at,
-                    comment_count=cc,
-                )
-                for fv, cname, cc in field_values_raw
-            ]
 
-            resolved = ResolvedFieldValue(
-                field_id=field.id,
-                field_name=field.name,
-                display_name=field.display_name,
-                unit=field.unit,
-                data_type=field.data_type,
-                resolved_value=all_values[0] if all_values else None,
-                alternative_count=max(0, len(all_values) - 1),
-                all_values=all_values,
-            )
-            resolved_fields.append(resolved)
-
-        result_domains.append(
-            DomainWithResolvedFields(
-                domain_id=domain.id,
-                domain_name=domain.name,
-                sort_order=domain.sort_order,
-                fields=resolved_fields,
+
+def field_values_count_query(field_id: int, include_missing: bool = True) -> Select:
+    """Total for field_values_query(); add the same pack filters."""
+    query = select(func.count()).select_from(Pack).where(Pack.is_active == True)  # noqa: E712
+    if not include_missing:
+        query = query.where(
+            select(FieldValue.id)
+            .where(
+                FieldValue.field_id == field_id,
+                FieldValue.pack_id == Pack.id,
+                FieldValue.is_active == True,  # noqa: E712
             )
+            .exists()
         )
+    return query
+
+
+async def resolve_field_rows(db: AsyncSession, query: Select) -> list[dict]:
+    """Run a field_values_query() and build ``FieldPackValue``-shaped dicts."""
+    started = time.perf_counter()
+    rows = (await db.execute(query)).all()
+
+    n_pack, n_value = len(FIELD_PACK_COLUMNS), len(VALUE_COLUMNS)
+    n_values = 0
+    items = []
+    for row in rows:
+        item = dict(zip(_FIELD_PACK_KEYS, row[:n_pack]))
+        value_id = row[n_pack]
+        contributor_name, agreement, disputed = row[-3:]
+        if value_id is None:
+            item["resolved_value"] = None
+            item["alternative_count"] = 0
+        else:
+            value_row = row[n_pack:n_pack + n_value]
+            item["resolved_value"] = value_row_to_dict(value_row, contributor_name, row[n_pack + n_value])
+            item["alternative_count"] = row[n_pack + n_value + 1] - 1
+            n_values += 1
+        item["agreement"] = agreement
+        item["disputed"] = bool(disputed)
+        items.append(item)
 
-    return result_domains
+    _observe(started, len(rows), n_values)
+    return items
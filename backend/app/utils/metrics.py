@@ -0,0 +1,113 @@
+import os
+import time
+
+from fastapi import Request
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+# directory shared by all of them; each worker writes its samples there and
+# /metrics aggregates them, whichever worker serves the scrape
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_DURATION = Histogram(
+    "packdb_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "packdb_http_requests_in_progress",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    "packdb_db_pool_connections_open",
+    "Connections held by the SQLAlchemy pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "packdb_db_pool_connections_in_use",
+    "Pool connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+RESOLVER_DURATION = Histogram(
+    "packdb_resolver_duration_seconds",
+    "Time spent resolving pack values per call (one or many packs)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+RESOLVER_FIELDS = Counter(
+    "packdb_resolver_fields_total",
+    "Pack fields resolved (fields x packs)",
+)
+RESOLVER_VALUES = Counter(
+    "packdb_resolver_values_total",
+    "Field values ranked during resolution",
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "packdb_singleflight_calls_total",
+    "Coalesced computations: 'leader' ran the work, 'shared' reused an in-flight result",
+    ["group", "role"],
+)
+CACHE_REQUESTS = Counter(
+    "packdb_cache_requests_total",
+    "In-process cache lookups",
+    ["cache", "result"],
+)
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    pool = engine.sync_engine.pool
+    open_ = DB_CONNECTIONS_OPEN.labels(name)
+    in_use = DB_CONNECTIONS_IN_USE.labels(name)
+
+    event.listen(pool, "connect", lambda dbapi_conn, record: open_.inc())
+    event.listen(pool, "close", lambda dbapi_conn, record: open_.dec())
+    event.listen(pool, "close_detached", lambda dbapi_conn: open_.dec())
+    event.listen(pool, "checkout", lambda dbapi_conn, record, proxy: in_use.inc())
+    event.listen(pool, "checkin", lambda dbapi_conn, record: in_use.dec())
+
+
+async def metrics_middleware(request: Request, call_next):
+    REQUESTS_IN_PROGRESS.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_PROGRESS.dec()
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        REQUEST_DURATION.labels(
+            request.method, route.path if route is not None else "unmatched", str(status)
+        ).observe(time.perf_counter() - started)
+
+
+def metrics_endpoint(request: Request) -> Response:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead() -> None:
+    # Drop this worker's live gauges so in-progress/pool totals stay accurate
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,106 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger("app.query_stats")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def add(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.statements.update(other.statements)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements issued at least ``threshold`` times — likely N+1 loops."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+# Stats for the request (or count_queries block) currently running. SQLAlchemy's
+# async greenlets inherit the task's context, so engine events see this value.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record(conn, statement: str) -> None:
+    started = conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+        stats.statements[statement] += 1
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn, statement)
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute; it still ran
+    conn = context.connection
+    if conn is not None and context.statement is not None and conn.info.get("query_start"):
+        _record(conn, context.statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Collect statement counts for the enclosed block, e.g. to assert a query budget::
+
+        with count_queries() as stats:
+            response = client.get(f"/api/packs/{pack_id}")
+        assert stats.count <= 6
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    # Requests made inside a count_queries() block (in-process test clients)
+    # also count towards it
+    outer = _current_stats.get()
+    with count_queries() as stats:
+        response = await call_next(request)
+    if outer is not None:
+        outer.add(stats)
+
+    response.headers.append(
+        "Server-Timing", f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+    )
+    logger.debug(
+        "%s %s: %d queries, %.1f ms in database",
+        request.method, request.url.path, stats.count, stats.duration * 1000,
+    )
+    for statement, n in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            "Possible N+1 on %s %s: statement ran %d times: %s",
+            request.method, request.url.path, n, " ".join(statement.split())[:200],
+        )
+    return response
@@ -0,0 +1,36 @@
+from typing import AsyncIterable
+
+import orjson
+from fastapi.responses import Response, StreamingResponse
+
+# Integer keys for compare's values_by_pack; "Z" suffix for UTC like pydantic
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(Response):
+    """orjson-encoded response for payloads built as plain dicts.
+
+    Returning a Response instance bypasses FastAPI's ``response_model``
+    validation, so use it only for data assembled from database rows in the
+    shape of the route's declared ``response_model`` (which still drives the
+    OpenAPI docs).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+async def _ndjson_lines(items: AsyncIterable[dict]):
+    async for item in items:
+        yield orjson.dumps(item, option=ORJSON_OPTIONS) + b"\n"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streams dicts as newline-delimited JSON, one object per line."""
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, items: AsyncIterable[dict], **kwargs):
+        super().__init__(_ndjson_lines(items), **kwargs)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger("app.slow_queries")
+
+EXPLAIN_TIMEOUT = "30s"
+MAX_PARAM_LENGTH = 200
+
+
+@dataclass
+class SlowQuery:
+    captured_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: list[str]
+    route: str | None
+    plan: str | None = None
+
+
+# Newest last; per worker process
+SLOW_QUERIES: deque[SlowQuery] = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+
+_current_request: ContextVar[Request | None] = ContextVar("slow_query_request", default=None)
+_explain_in_flight = False
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def _route_label(request: Request | None) -> str | None:
+    if request is None:
+        return None
+    route = request.scope.get("route")
+    return f"{request.method} {route.path if route is not None else request.url.path}"
+
+
+def _format_parameters(parameters, executemany: bool) -> list[str]:
+    if executemany:
+        return [f"<{len(parameters)} parameter sets>"]
+    if isinstance(parameters, dict):
+        parameters = [f"{key}={value!r}" for key, value in parameters.items()]
+    else:
+        parameters = [repr(value) for value in parameters or ()]
+    return [p if len(p) <= MAX_PARAM_LENGTH else p[:MAX_PARAM_LENGTH] + "…" for p in parameters]
+
+
+async def _explain(engine: AsyncEngine, entry: SlowQuery, statement: str, parameters) -> None:
+    global _explain_in_flight
+    try:
+        # Separate read-only transaction: EXPLAIN ANALYZE re-runs the query, and
+        # a failure here must never touch the request's own transaction
+        async with engine.connect() as conn:
+            driver = (await conn.get_raw_connection()).driver_connection
+            async with driver.transaction(readonly=True):
+                await driver.execute(f"SET LOCAL statement_timeout = '{EXPLAIN_TIMEOUT}'")
+                rows = await driver.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", *parameters)
+        entry.plan = "\n".join(row[0] for row in rows)
+    except Exception as exc:
+        entry.plan = f"EXPLAIN failed: {exc}"
+    finally:
+        _explain_in_flight = False
+
+
+def capture_slow_queries(engine: AsyncEngine) -> None:
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        global _explain_in_flight
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed < threshold:
+            return
+
+        entry = SlowQuery(
+            captured_at=datetime.utcnow(),
+            duration_ms=round(elapsed * 1000, 2),
+            statement=statement,
+            parameters=_format_parameters(parameters, executemany),
+            route=_route_label(_current_request.get()),
+        )
+        SLOW_QUERIES.append(entry)
+        logger.warning("Slow query (%.0f ms) on %s: %s", entry.duration_ms, entry.route, " ".join(statement.split())[:200])
+
+        # Sample plans for plain SELECTs only (EXPLAIN ANALYZE executes the
+        # statement), one at a time so a slow period can't pile them up
+        if (
+            not executemany
+            and not _explain_in_flight
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+        ):
+            _explain_in_flight = True
+            task = asyncio.get_running_loop().create_task(_explain(engine, entry, statement, tuple(parameters or ())))
+            _explain_tasks.add(task)
+            task.add_done_callback(_explain_tasks.discard)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(context):
+        # A failed statement never reaches _after; drop its start time
+        conn = context.connection
+        if conn is not None and context.statement is not None and conn.info.get("slow_query_start"):
+            conn.info["slow_query_start"].pop()
+
+
+async def slow_query_middleware(request: Request, call_next):
+    token = _current_request.set(request)
+    try:
+        return await call_next(request)
+    finally:
+        _current_request.reset(token)
@@ -0,0 +1,66 @@
+"""
+Fixtures for the in-process API tests.
+
+Tests marked ``integration`` run the app against DATABASE_URL, which must
+point at a migrated database (e.g. the docker-compose one after
+`python -m app.bootstrap`); they are skipped when it can't be reached,
+unless TEST_REQUIRE_DB is set. They create their own user and packs.
+
+    cd backend && pytest
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from app.main import app
+from app.utils.query_stats import QueryStats, count_queries
+
+TEST_USER = {"email": "pytest-user@example.com", "password": "pytest-password", "display_name": "Pytest"}
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    except (OperationalError, DBAPIError, OSError) as exc:
+        if os.environ.get("TEST_REQUIRE_DB"):
+            raise
+        pytest.skip(f"database not reachable: {exc}")
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> dict[str, str]:
+    response = client.post("/api/auth/register", json=TEST_USER)
+    if response.status_code == 400:  # already registered by an earlier run
+        response = client.post(
+            "/api/auth/login", json={"email": TEST_USER["email"], "password": TEST_USER["password"]}
+        )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def query_budget():
+    """Fail when the enclosed requests issue more than ``limit`` statements::
+
+        with query_budget(8):
+            client.get(f"/api/packs/{pack_id}", headers=auth_headers)
+    """
+
+    @contextmanager
+    def budget(limit: int) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+        if stats.count > limit:
+            statements = "\n".join(
+                f"  {n}x {' '.join(sql.split())[:160]}" for sql, n in stats.statements.most_common()
+            )
+            pytest.fail(f"{stats.count} queries, budget {limit}:\n{statements}")
+
+    return budget
@@ -0,0 +1,70 @@
+"""Keyset paging of a value's comments."""
+
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+COMMENTS = 7
+
+
+@pytest.fixture(scope="module")
+def value(client, auth_headers):
+    response = client.post(
+        "/api/packs/upsert/bulk",
+        json={"packs": [{"oem": "Pytest", "model": f"Comments {uuid.uuid4().hex[:8]}", "year": 2020}]},
+        headers=auth_headers,
+    )
+    response.raise_for_status()
+    pack_id = response.json()[0]["id"]
+
+    domains = client.get("/api/domains/", headers=auth_headers).json()
+    fields = client.get(f"/api/domains/{domains[0]['id']}/fields", headers=auth_headers).json()
+    field = next(f for f in fields if not f.get("formula"))
+    response = client.post(
+        f"/api/packs/{pack_id}/values",
+        json={
+            "field_id": field["id"],
+            "value_text": (field.get("select_options") or ["1"])[0],
+            "source_type": "teardown",
+            "source_detail": "pytest",
+        },
+        headers=auth_headers,
+    )
+    response.raise_for_status()
+    value_id = response.json()["id"]
+    comment_ids = []
+    for i in range(COMMENTS):
+        response = client.post(f"/api/values/{value_id}/comments", json={"text": f"#{i}"}, headers=auth_headers)
+        response.raise_for_status()
+        comment_ids.append(response.json()["id"])
+
+    yield {"id": value_id, "pack_id": pack_id, "comment_ids": comment_ids}
+    client.delete(f"/api/packs/{pack_id}", headers=auth_headers)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, COMMENTS])
+def test_pages_cover_every_comment_once(client, auth_headers, value, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, "pack_id": value["pack_id"]}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/values/{value['id']}/comments", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total"] == COMMENTS
+        assert len(page["items"]) <= limit
+        seen += [comment["id"] for comment in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == value["comment_ids"]
+    assert pages == -(-COMMENTS // limit)
+
+
+def test_invalid_cursor(client, auth_headers, value):
+    response = client.get(f"/api/values/{value['id']}/comments?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 422
@@ -0,0 +1,85 @@
+"""Source agreement scoring (no database)."""
+
+import pytest
+
+from app.services.conflicts import Consensus, score_values
+
+
+def _num(value, low=None, high=None, text=None):
+    low = value if low is None else low
+    high = value if high is None else high
+    return (value, low, high, text if text is not None else str(value))
+
+
+def _text(text):
+    return (None, None, None, text)
+
+
+def test_near_equal_numbers_agree():
+    consensus = score_values([_num(75.0), _num(76.0)], tolerance=0.02)
+    assert consensus == Consensus(value_count=2, group_count=1, agreement=1.0, spread=0.013158)
+    assert not consensus.is_conflict
+
+
+def test_distant_numbers_disagree():
+    consensus = score_values([_num(96.0), _num(108.0)], tolerance=0.02)
+    assert consensus == Consensus(value_count=2, group_count=2, agreement=0.5, spread=0.111111)
+    assert consensus.is_conflict
+
+
+def test_default_tolerance_comes_from_settings(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "CONFLICT_TOLERANCE", 0.2)
+    assert not score_values([_num(96.0), _num(108.0)]).is_conflict
+
+
+def test_agreement_chains_in_ascending_order():
+    consensus = score_values([_num(103.0), _num(100.0), _num(101.5)], tolerance=0.02)
+    assert consensus.group_count == 1
+
+
+def test_overlapping_ranges_agree():
+    consensus = score_values([_num(72.5, 70.0, 75.0), _num(74.0)], tolerance=0.0)
+    assert consensus.group_count == 1
+
+
+def test_largest_group_sets_agreement():
+    values = [_num(75.0), _num(75.5), _num(75.2), _num(90.0)]
+    consensus = score_values(values, tolerance=0.02)
+    assert (consensus.group_count, consensus.agreement) == (2, 0.75)
+
+
+@pytest.mark.parametrize(
+    "limit, other, agree",
+    [
+        (_num(75.0, low=None, high=75.0), 75.0, True),  # "up to 75" vs 75
+        (_num(75.0, low=None, high=75.0), 60.0, False),  # only the stated end counts
+        (_num(300.0, low=300.0, high=None), 300.0, True),  # ">= 300" vs 300
+        (_num(300.0, low=300.0, high=None), 400.0, False),
+    ],
+)
+def test_open_ended_limits_count_their_stated_end(limit, other, agree):
+    numeric, low, high, text = limit
+    consensus = score_values([(numeric, low, high, text), _num(other)], tolerance=0.02)
+    assert consensus.is_conflict is not agree
+
+
+def test_text_matches_after_case_and_whitespace_folding():
+    consensus = score_values([_text("NMC 811"), _text("  nmc   811 "), _text("LFP")])
+    assert consensus == Consensus(value_count=3, group_count=2, agreement=0.666667, spread=None)
+
+
+def test_mixed_text_and_numbers_group_separately():
+    values = [_num(75.0), _num(75.5), _text("unknown"), _text("Unknown")]
+    consensus = score_values(values, tolerance=0.02)
+    assert consensus == Consensus(value_count=4, group_count=2, agreement=0.5, spread=0.006623)
+
+
+def test_spread_needs_two_numbers():
+    assert score_values([_num(75.0), _text("75 kWh?")]).spread is None
+
+
+def test_all_zero_values_agree_without_spread_division():
+    consensus = score_values([_num(0.0), _num(0.0)], tolerance=0.02)
+    assert consensus == Consensus(value_count=2, group_count=1, agreement=1.0, spread=0.0)
@@ -0,0 +1,131 @@
+"""Formula parsing, evaluation and the dependency graph (no database)."""
+
+from collections import namedtuple
+
+import pytest
+
+from app.services.formulas import FormulaError, FormulaRegistry, evaluate, parse_formula
+
+Row = namedtuple("Row", "id name data_type formula")
+
+
+def _eval(formula: str, **inputs):
+    tree, _ = parse_formula(formula)
+    return evaluate(tree, inputs)
+
+
+def test_parse_collects_input_names():
+    _, names = parse_formula("cells_total * cell_capacity_ah * cell_nominal_voltage / 1000")
+    assert names == {"cells_total", "cell_capacity_ah", "cell_nominal_voltage"}
+
+
+def test_parse_allows_whitelisted_functions():
+    _, names = parse_formula("round(max(a, b) - min(a, b), 2) + abs(c)")
+    assert names == {"a", "b", "c"}
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "a *",  # syntax
+        "a.b",  # attribute access
+        "__import__('os')",  # unknown function
+        "max(a, key=b)",  # keyword arguments
+        "a if b else c",
+        "a // b",  # operator outside the whitelist
+        "'text'",
+        "[a, b]",
+    ],
+)
+def test_parse_rejects(formula):
+    with pytest.raises(FormulaError):
+        parse_formula(formula)
+
+
+def test_evaluate_arithmetic():
+    assert _eval("module_count * cells_per_module", module_count=12, cells_per_module=8) == 96.0
+    assert _eval("-a + 2 ** 3", a=1) == 7.0
+    assert _eval("round(a / 3, 2)", a=10) == 3.33
+
+
+def test_evaluate_missing_input_is_none():
+    assert _eval("a * b", a=2) is None
+    assert _eval("max(a, b)", a=2, b=None) is None
+
+
+@pytest.mark.parametrize(
+    "formula, inputs",
+    [
+        ("a / b", {"a": 1, "b": 0}),  # division by zero
+        ("a ** b", {"a": 10.0, "b": 400}),  # overflow
+        ("a * b", {"a": 1e308, "b": 10}),  # inf
+        ("a ** 0.5", {"a": -4}),  # complex
+        ("abs(a ** 0.5)", {"a": -4}),  # complex, made real again by abs()
+    ],
+)
+def test_evaluate_non_finite_is_none(formula, inputs):
+    assert _eval(formula, **inputs) is None
+
+
+def test_evaluate_real_root():
+    assert _eval("a ** 0.5", a=4) == 2.0
+
+
+def _registry(*rows) -> FormulaRegistry:
+    return FormulaRegistry([Row(*row) for row in rows])
+
+
+BASE_FIELDS = [
+    (1, "module_count", "number", None),
+    (2, "cells_per_module", "number", None),
+    (3, "cells_total", "number", "module_count * cells_per_module"),
+    (4, "cell_capacity_ah", "number", None),
+    (5, "capacity", "number", "cells_total * cell_capacity_ah"),
+    (6, "chemistry", "text", None),
+]
+
+
+def test_registry_orders_formulas_by_dependency():
+    registry = _registry(*BASE_FIELDS)
+    assert registry.order == [3, 5]
+    assert registry.downstream([1]) == [3, 5]
+    assert registry.downstream([4]) == [5]
+    assert registry.referenced_by(3) == ["capacity"]
+
+
+def test_check_rejects_cycles():
+    registry = _registry(*BASE_FIELDS)
+    with pytest.raises(FormulaError, match="cycle"):
+        registry.check(1, "capacity / 2")
+    with pytest.raises(FormulaError, match="its own field"):
+        registry.check(3, "cells_total + 1")
+
+
+@pytest.mark.parametrize(
+    "formula, message",
+    [
+        ("unknown_field * 2", "Unknown field"),
+        ("chemistry * 2", "not a number field"),
+        ("2 * 3", "at least one field"),
+    ],
+)
+def test_check_rejects_bad_inputs(formula, message):
+    with pytest.raises(FormulaError, match=message):
+        _registry(*BASE_FIELDS).check(None, formula)
+
+
+def test_check_rejects_ambiguous_names():
+    registry = _registry(*BASE_FIELDS, (7, "module_count", "number", None))
+    with pytest.raises(FormulaError, match="several domains"):
+        registry.check(None, "module_count * 2")
+
+
+def test_registry_skips_stored_cycles():
+    registry = _registry(
+        (1, "a", "number", "b + 1"),
+        (2, "b", "number", "a + 1"),
+        (3, "c", "number", None),
+        (4, "d", "number", "c * 2"),
+    )
+    assert registry.order == [4]
+    assert registry.downstream([3]) == [4]
@@ -0,0 +1,94 @@
+"""Number-field text parsing (no database)."""
+
+import pytest
+
+from app.services.numeric import ParsedNumber, numeric_columns, parse_numeric
+
+
+@pytest.mark.parametrize(
+    "text, unit, value",
+    [
+        ("75", "kWh", 75.0),
+        ("75 kWh", "kWh", 75.0),
+        ("75kwh", "kWh", 75.0),
+        ("75000 Wh", "kWh", 75.0),
+        ("75 000 Wh", "kWh", 75.0),
+        ("0.075 MWh", "kWh", 75.0),
+        ("500 g", "kg", 0.5),
+        ("3 400 mAh", "Ah", 3.4),
+        ("-20", "V", -20.0),
+        ("1e3 Wh", "kWh", 1.0),
+        # Decimal and thousands separators
+        ("75,0", "kWh", 75.0),
+        ("3.65", "V", 3.65),
+        ("1,234", "kg", 1234.0),
+        ("1.234.567", "kg", 1234567.0),
+        ("1.234,5", "kg", 1234.5),
+        ("1,234.5", "kg", 1234.5),
+        ("1 234.5", "kg", 1234.5),
+        ("1'234,5", "kg", 1234.5),
+        ("1 234", "kg", 1234.0),
+        # A leading 0 group is a decimal, never thousands
+        ("0,123", "kWh", 0.123),
+        ("0,500", "kg", 0.5),
+        ("0.500", "kg", 0.5),
+        # Trailing notes
+        ("75 kWh (estimated)", "kWh", 75.0),
+    ],
+)
+def test_parses_single_values(text, unit, value):
+    assert parse_numeric(text, unit) == ParsedNumber(value=value, low=value, high=value)
+
+
+@pytest.mark.parametrize(
+    "text, parsed",
+    [
+        ("70-75", ParsedNumber(72.5, 70.0, 75.0)),
+        ("70 to 75 kWh", ParsedNumber(72.5, 70.0, 75.0)),
+        ("75–70 kWh", ParsedNumber(72.5, 70.0, 75.0)),
+        ("70000-75000 Wh", ParsedNumber(72.5, 70.0, 75.0)),
+        ("75 ± 2", ParsedNumber(75.0, 73.0, 77.0)),
+        ("75 +/- 2 kWh", ParsedNumber(75.0, 73.0, 77.0)),
+        ("<75", ParsedNumber(75.0, None, 75.0)),
+        ("up to 75 kWh", ParsedNumber(75.0, None, 75.0)),
+        (">= 300", ParsedNumber(300.0, 300.0, None)),
+        ("min. 60", ParsedNumber(60.0, 60.0, None)),
+        ("≈75", ParsedNumber(75.0, 75.0, 75.0, approximate=True)),
+        ("ca. 75 kWh", ParsedNumber(75.0, 75.0, 75.0, approximate=True)),
+        ("~70-75", ParsedNumber(72.5, 70.0, 75.0, approximate=True)),
+    ],
+)
+def test_parses_ranges_limits_and_approximations(text, parsed):
+    assert parse_numeric(text, "kWh") == parsed
+
+
+@pytest.mark.parametrize(
+    "text, unit",
+    [
+        (None, "kWh"),
+        ("", "kWh"),
+        ("n/a", "kWh"),
+        ("300 V", "kWh"),  # another dimension
+        ("70 kWh - 75 Wh", "kWh"),  # mixed units
+        ("< 70-75", "kWh"),  # a limit on a range
+        ("1,23,456", "kg"),  # broken groups
+        ("0.123.456", "kg"),
+        ("12 34", "kg"),
+        ("75 kWh", None),  # unit on a unitless field
+    ],
+)
+def test_rejects(text, unit):
+    assert parse_numeric(text, unit) is None
+
+
+def test_unknown_field_unit_matches_only_itself():
+    assert parse_numeric("12 bar", "bar") == ParsedNumber(12.0, 12.0, 12.0)
+    assert parse_numeric("12 psi", "bar") is None
+
+
+def test_numeric_columns_only_for_number_fields():
+    assert numeric_columns("75 kWh", "number", "kWh") == {
+        "value_numeric": 75.0, "value_min": 75.0, "value_max": 75.0, "value_approximate": False,
+    }
+    assert numeric_columns("75 kWh", "text", "kWh")["value_numeric"] is None
+    assert numeric_columns("unknown", "number", "kWh")["value_numeric"] is None
@@ -0,0 +1,81 @@
+"""Statement budgets for the read paths that serve whole packs.
+
+Counts include the user lookup done by authentication. A budget failing
+after a change usually means a per-field or per-pack query crept into a
+loop (see N_PLUS_ONE_THRESHOLD).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from app.database import async_session
+from app.utils.query_stats import count_queries
+
+pytestmark = pytest.mark.integration
+
+PACKS = 3
+
+
+@pytest.fixture(scope="module")
+def pack_ids(client, auth_headers):
+    model = f"Budget {uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/api/packs/upsert/bulk",
+        json={"packs": [{"oem": "Pytest", "model": model, "year": 2020 + i} for i in range(PACKS)]},
+        headers=auth_headers,
+    )
+    response.raise_for_status()
+    ids = [pack["id"] for pack in response.json()]
+
+    domains = client.get("/api/domains/", headers=auth_headers).json()
+    fields = client.get(f"/api/domains/{domains[0]['id']}/fields", headers=auth_headers).json()
+    for pack_id in ids:
+        for field in [f for f in fields if not f.get("formula")][:5]:
+            client.post(
+                f"/api/packs/{pack_id}/values",
+                json={
+                    "field_id": field["id"],
+                    "value_text": (field.get("select_options") or ["1"])[0],
+                    "source_type": "teardown",
+                    "source_detail": "pytest",
+                },
+                headers=auth_headers,
+            ).raise_for_status()
+
+    yield ids
+    for pack_id in ids:
+        client.delete(f"/api/packs/{pack_id}", headers=auth_headers)
+
+
+def test_pack_detail_budget(client, auth_headers, pack_ids, query_budget):
+    with query_budget(8):
+        response = client.get(f"/api/packs/{pack_ids[0]}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_compare_budget_does_not_grow_with_packs(client, auth_headers, pack_ids, query_budget):
+    ids = ",".join(map(str, pack_ids))
+    with query_budget(8):
+        response = client.get("/api/compare", params={"ids": ids}, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["packs"]) == PACKS
+
+
+def test_pack_list_budget(client, auth_headers, pack_ids, query_budget):
+    with query_budget(3):
+        response = client.get("/api/packs/", params={"oem": "Pytest"}, headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_failed_statements_are_counted(client):
+    async def run_bad_statement():
+        async with async_session() as session:
+            await session.execute(text("SELECT * FROM no_such_table"))
+
+    with count_queries() as stats:
+        with pytest.raises(ProgrammingError):
+            client.portal.call(run_bad_statement)
+    assert stats.count == 1
@@ -1,15 +1,21 @@
 import client from './client';
-import type { Comment } from '@/types';
+import type { Comment, CommentPage } from '@/types';
 
-export async function listComments(valueId: number): Promise<Comment[]> {
-  const response = await client.get<Comment[]>(`/values/${valueId}/comments`);
+// packId lets the API look the value up in its pack's partition only
+export async function listComments(valueId: number, packId: number, cursor?: string | null): Promise<CommentPage> {
+  const response = await client.get<CommentPage>(`/values/${valueId}/comments`, {
+    params: cursor ? { pack_id: packId, cursor } : { pack_id: packId },
+  });
   return response.data;
 }
 
 export async function createComment(
   valueId: number,
+  packId: number,
   data: { text: string }
 ): Promise<Comment> {
-  const response = await client.post<Comment>(`/values/${valueId}/comments`, data);
+  const response = await client.post<Comment>(`/values/${valueId}/comments`, data, {
+    params: { pack_id: packId },
+  });
   return response.data;
 }
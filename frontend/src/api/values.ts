@@ -14,17 +14,19 @@ export async function createValue(
   return response.data;
 }
 
+// packId lets the API look the value up in its pack's partition only
 export async function updateValue(
   valueId: number,
+  packId: number,
   data: {
     value_text?: string;
     source_detail?: string;
   }
 ): Promise<FieldValue> {
-  const response = await client.put<FieldValue>(`/values/${valueId}`, data);
+  const response = await client.put<FieldValue>(`/values/${valueId}`, data, { params: { pack_id: packId } });
   return response.data;
 }
 
-export async function deleteValue(valueId: number): Promise<void> {
-  await client.delete(`/values/${valueId}`);
+export async function deleteValue(valueId: number, packId: number): Promise<void> {
+  await client.delete(`/values/${valueId}`, { params: { pack_id: packId } });
 }
@@ -80,7 +80,7 @@ export default function AddValueDialog({
 
   const updateMutation = useMutation({
     mutationFn: (data: { value_text?: string; source_detail?: string }) =>
-      updateValue(editValue!.id, data),
+      updateValue(editValue!.id, packId, data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['pack', packId] });
       toast.success('Value updated');
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { toast } from 'sonner';
 import { Send } from 'lucide-react';
 import { listComments, createComment } from '@/api/comments';
@@ -8,19 +8,23 @@ import { Button } from '@/components/ui/button';
 
 interface CommentsSectionProps {
   valueId: number;
+  packId: number;
 }
 
-export default function CommentsSection({ valueId }: CommentsSectionProps) {
+export default function CommentsSection({ valueId, packId }: CommentsSectionProps) {
   const queryClient = useQueryClient();
   const [text, setText] = useState('');
 
-  const { data: comments = [], isLoading } = useQuery({
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['comments', valueId],
-    queryFn: () => listComments(valueId),
+    queryFn: ({ pageParam }) => listComments(valueId, packId, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
   });
+  const comments = data?.pages.flatMap((page) => page.items) ?? [];
 
   const addMutation = useMutation({
-    mutationFn: (commentText: string) => createComment(valueId, { text: commentText }),
+    mutationFn: (commentText: string) => createComment(valueId, packId, { text: commentText }),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['comments', valueId] });
       setText('');
@@ -62,6 +66,18 @@ export default function CommentsSection({ valueId }: CommentsSectionProps) {
               <p className="text-muted-foreground">{c.text}</p>
             </div>
           ))}
+          {hasNextPage && (
+            <Button
+              type="button"
+              size="sm"
+              variant="ghost"
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="h-7 px-2 text-xs"
+            >
+              {isFetchingNextPage ? 'Loading...' : 'Show more comments'}
+            </Button>
+          )}
         </div>
       )}
 
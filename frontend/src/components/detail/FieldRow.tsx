@@ -29,7 +29,7 @@ export default function FieldRow({ field, packId }: FieldRowProps) {
   const [editValue, setEditValue] = useState<FieldValue | null>(null);
 
   const deleteMutation = useMutation({
-    mutationFn: deleteValue,
+    mutationFn: (valueId: number) => deleteValue(valueId, packId),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['pack', packId] });
       toast.success('Value deleted');
@@ -151,7 +151,7 @@ export default function FieldRow({ field, packId }: FieldRowProps) {
               {/* Inline comments */}
               {commentValueId === val.id && (
                 <div className="ml-4 mb-2">
-                  <CommentsSection valueId={val.id} />
+                  <CommentsSection valueId={val.id} packId={packId} />
                 </div>
               )}
             </div>
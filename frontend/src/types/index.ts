@@ -155,6 +155,12 @@ export interface Comment {
   created_at: string;
 }
 
+export interface CommentPage {
+  items: Comment[];
+  next_cursor: string | null;
+  total: number;
+}
+
 // Source priority
 export interface SourcePriority {
   user_id: number;
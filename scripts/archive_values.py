@@ -0,0 +1,55 @@
+"""
+Move deleted field values past the retention window to field_values_archive.
+
+Deleted values stay in field_values (is_active = false) until this runs;
+their history remains in field_value_revisions either way. Schedule it,
+e.g. nightly from cron:
+
+    python scripts/archive_values.py
+    python scripts/archive_values.py --retention-days 30 --batch-size 10000
+
+Values that have comments are kept. Each batch commits on its own, so the
+job can be stopped and re-run at any time.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to the path so we can import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.database import async_session, engine
+from app.models.value import FieldValue
+from app.services.archive import ARCHIVE_BATCH_SIZE, archive_values
+
+
+async def main(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.retention_days)
+    async with async_session() as session:
+        moved = await archive_values(session, cutoff, args.batch_size)
+        result = await session.execute(
+            select(func.count()).select_from(FieldValue).where(FieldValue.is_active == False)  # noqa: E712
+        )
+        remaining = result.scalar_one()
+
+    await engine.dispose()
+    print(f"{moved} values deleted before {cutoff:%Y-%m-%d %H:%M} UTC archived in {time.perf_counter() - started:.1f}s")
+    print(f"{remaining} deleted values left in field_values (newer, or with comments)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--retention-days", type=float, default=settings.VALUE_ARCHIVE_RETENTION_DAYS,
+        help=f"archive values deleted longer ago than this (default {settings.VALUE_ARCHIVE_RETENTION_DAYS})",
+    )
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="values moved per transaction")
+    asyncio.run(main(parser.parse_args()))
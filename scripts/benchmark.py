@@ -0,0 +1,233 @@
+"""
+HTTP benchmark harness for the PackDB API.
+
+Runs a fixed request mix per scenario against a running backend and records
+throughput and p50/p95/p99 latency as JSON, so runs can be compared:
+
+    python scripts/generate_catalog.py --packs 10000
+    python scripts/benchmark.py --requests 500 --concurrency 16
+    python scripts/benchmark.py --compare bench_results/<earlier-run>.json
+
+Scenarios: list_packs, get_pack_detail, compare_packs, create_value, login.
+Requests use the benchmark users and synthetic packs created by
+generate_catalog.py; create_value writes extra "user" values to those packs.
+Requires httpx (in backend/requirements.txt).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import os
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from generate_catalog import BENCH_PASSWORD, BENCH_USER_COUNT, SYNTHETIC_OEM_PREFIX, bench_user_email
+
+SCENARIOS = ["list_packs", "get_pack_detail", "compare_packs", "create_value", "login"]
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "bench_results")
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+async def _login(client: httpx.AsyncClient, index: int) -> str:
+    r = await client.post("/api/auth/login", json={"email": bench_user_email(index), "password": BENCH_PASSWORD})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def _discover(client: httpx.AsyncClient, headers: dict) -> tuple[list[int], list[int]]:
+    pack_ids: list[int] = []
+    for page in range(1, 6):
+        r = await client.get(
+            "/api/packs/", params={"search": SYNTHETIC_OEM_PREFIX, "page": page, "page_size": 100}, headers=headers
+        )
+        r.raise_for_status()
+        pack_ids += [p["id"] for p in r.json()["items"]]
+    r = await client.get("/api/domains/", headers=headers)
+    r.raise_for_status()
+    field_ids: list[int] = []
+    for domain in r.json():
+        fr = await client.get(f"/api/domains/{domain['id']}/fields", headers=headers)
+        fr.raise_for_status()
+        field_ids += [f["id"] for f in fr.json() if f["data_type"] != "select"]
+    if len(pack_ids) < 3:
+        raise SystemExit("No synthetic catalog found — run scripts/generate_catalog.py first")
+    return pack_ids, field_ids
+
+
+def _request_factory(scenario: str, rng: random.Random, pack_ids: list[int], field_ids: list[int]):
+    if scenario == "list_packs":
+        return lambda: ("GET", "/api/packs/", {"params": {
+            "page": rng.randint(1, 5),
+            "market": rng.choice([None, "EU", "China", "USA"]),
+            "sort_by": rng.choice(["created_at", "oem", "year"]),
+        }})
+    if scenario == "get_pack_detail":
+        return lambda: ("GET", f"/api/packs/{rng.choice(pack_ids)}", {})
+    if scenario == "compare_packs":
+        return lambda: ("GET", "/api/compare", {"params": {"ids": ",".join(map(str, rng.sample(pack_ids, 3)))}})
+    if scenario == "create_value":
+        return lambda: ("POST", f"/api/packs/{rng.choice(pack_ids)}/values", {"json": {
+            "field_id": rng.choice(field_ids),
+            "value_text": f"{rng.uniform(1, 500):.1f}",
+            "source_type": "user",
+            "source_detail": "benchmark",
+        }})
+    if scenario == "login":
+        return lambda: ("POST", "/api/auth/login", {"json": {
+            "email": bench_user_email(rng.randrange(BENCH_USER_COUNT)), "password": BENCH_PASSWORD,
+        }})
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: str, tokens: list[str], pack_ids: list[int], field_ids: list[int],
+    requests: int, concurrency: int, warmup: int, seed: int,
+) -> dict:
+    rng = random.Random(f"{seed}:{scenario}")
+    next_request = _request_factory(scenario, rng, pack_ids, field_ids)
+    latencies: list[float] = []
+    errors = 0
+    remaining = warmup + requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining, errors
+        headers = {"Authorization": f"Bearer {tokens[worker_id % len(tokens)]}"}
+        while remaining > 0:
+            remaining -= 1
+            measured = remaining < requests
+            method, url, kwargs = next_request()
+            started = time.perf_counter()
+            try:
+                r = await client.request(method, url, headers=headers, **kwargs)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            if measured:
+                latencies.append(elapsed)
+                errors += 0 if ok else 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> bool:
+    ok = True
+    print(f"\n{'scenario':<18}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    for scenario, result in current["results"].items():
+        base = baseline["results"].get(scenario)
+        if base is None:
+            continue
+        for metric, higher_is_better in (("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)):
+            if not base[metric]:
+                continue
+            change = (result[metric] - base[metric]) / base[metric]
+            regressed = (-change if higher_is_better else change) > max_regression
+            ok = ok and not regressed
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{scenario:<18}{metric:<16}{base[metric]:>12}{result[metric]:>12}{change:>+10.1%}{flag}")
+    return ok
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency),
+    ) as client:
+        tokens = [await _login(client, i) for i in range(BENCH_USER_COUNT)]
+        pack_ids, field_ids = await _discover(client, {"Authorization": f"Bearer {tokens[0]}"})
+
+        results = {}
+        for scenario in args.scenarios:
+            requests = args.login_requests if scenario == "login" else args.requests
+            results[scenario] = await run_scenario(
+                client, scenario, tokens, pack_ids, field_ids,
+                requests, args.concurrency, args.warmup, args.seed,
+            )
+            r = results[scenario]
+            print(
+                f"{scenario:<18}{r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.1f} ms  "
+                f"p95 {r['p95_ms']:>8.1f} ms  p99 {r['p99_ms']:>8.1f} ms  errors {r['errors']}"
+            )
+
+    run = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "sample_packs": len(pack_ids),
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(run, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=100, help="measured requests for login (bcrypt-bound)")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="result file (default: bench_results/<UTC timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier result file to diff against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="allowed relative slowdown before failing")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,112 @@
+"""
+CPU cost per response for the heavy read endpoints, measured in-process.
+
+Drives the ASGI app directly (no network, no uvicorn) and records process CPU
+time per request for pack detail, pack values and compare, so the cost of
+building and encoding responses is not hidden behind socket I/O. Run it on two
+commits against the same database and diff the numbers:
+
+    python scripts/generate_catalog.py --packs 1000
+    python scripts/benchmark_serialization.py --output before.json
+    git checkout <other commit>
+    python scripts/benchmark_serialization.py --compare before.json
+
+The database is still queried, so CPU includes asyncpg row decoding; with
+the query plans unchanged, differences between runs are response pipeline work.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from generate_catalog import BENCH_PASSWORD, SYNTHETIC_OEM_PREFIX, bench_user_email
+
+from app.database import engine
+from app.main import app
+
+SCENARIOS = ["get_pack_detail", "get_pack_values", "compare_packs"]
+
+
+def _url(scenario: str, rng: random.Random, pack_ids: list[int]) -> str:
+    if scenario == "get_pack_detail":
+        return f"/api/packs/{rng.choice(pack_ids)}"
+    if scenario == "get_pack_values":
+        return f"/api/packs/{rng.choice(pack_ids)}/values"
+    return "/api/compare?ids=" + ",".join(map(str, rng.sample(pack_ids, 3)))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/api/auth/login", json={"email": bench_user_email(0), "password": BENCH_PASSWORD})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        r = await client.get("/api/packs/", params={"search": SYNTHETIC_OEM_PREFIX, "page_size": 100}, headers=headers)
+        r.raise_for_status()
+        pack_ids = [p["id"] for p in r.json()["items"]]
+        if len(pack_ids) < 3:
+            raise SystemExit("No synthetic catalog found — run scripts/generate_catalog.py first")
+
+        results = {}
+        for scenario in args.scenarios:
+            rng = random.Random(f"{args.seed}:{scenario}")
+            cpu_ms, sizes = [], []
+            for i in range(args.warmup + args.requests):
+                url = _url(scenario, rng, pack_ids)
+                cpu_started = time.process_time()
+                r = await client.get(url, headers=headers)
+                elapsed = time.process_time() - cpu_started
+                r.raise_for_status()
+                if i >= args.warmup:
+                    cpu_ms.append(elapsed * 1000)
+                    sizes.append(len(r.content))
+            results[scenario] = {
+                "requests": len(cpu_ms),
+                "cpu_ms_mean": round(statistics.fmean(cpu_ms), 3),
+                "cpu_ms_median": round(statistics.median(cpu_ms), 3),
+                "bytes_mean": round(statistics.fmean(sizes)),
+            }
+            r = results[scenario]
+            print(f"{scenario:<18}cpu/response mean {r['cpu_ms_mean']:>8.3f} ms  median {r['cpu_ms_median']:>8.3f} ms  {r['bytes_mean']:>8} bytes")
+
+    await engine.dispose()
+    return results
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\n{'scenario':<18}{'baseline ms':>12}{'current ms':>12}{'change':>10}")
+    for scenario, result in current.items():
+        base = baseline.get(scenario)
+        if base is None:
+            continue
+        change = (result["cpu_ms_mean"] - base["cpu_ms_mean"]) / base["cpu_ms_mean"]
+        print(f"{scenario:<18}{base['cpu_ms_mean']:>12}{result['cpu_ms_mean']:>12}{change:>+10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier --output file to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
@@ -0,0 +1,272 @@
+"""
+Synthetic catalog generator for load tests and benchmarks.
+
+Builds N packs x every seeded field (SEED_DATA) x M sources, with comments on a
+fraction of the values, plus a handful of benchmark users. Output is fully
+determined by --seed, so two runs at the same scale produce the same catalog.
+Formula fields get no synthetic values: once loaded, their calculated values
+and the source-agreement scores are rebuilt over every pack, as
+recompute_derived.py and score_conflicts.py would (skip with --no-rebuild).
+
+    python scripts/generate_catalog.py --packs 1000           # 1k
+    python scripts/generate_catalog.py --packs 10000          # 10k
+    python scripts/generate_catalog.py --packs 100000 --reset # 100k, replacing a previous run
+
+Synthetic packs use the OEM prefix "Synthetic" and are removed by --reset.
+Values and comments are written with COPY, so 100k packs (~11M values at the
+default 3 sources) load in minutes rather than hours.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the backend directory to the path so we can import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from asyncpg import Range
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database import async_session, engine
+from app.models.field import Field
+from app.models.pack import Pack
+from app.models.source_priority import DEFAULT_PRIORITY, SourcePriority
+from app.models.user import User
+from app.schemas.value import VALID_SOURCE_TYPES
+from app.seed import SEED_DATA, seed_defaults
+from app.services.conflicts import rebuild_conflicts
+from app.services.formulas import load_registry, rebuild_fields
+from app.utils.security import hash_password
+
+SYNTHETIC_OEM_PREFIX = "Synthetic"
+BENCH_USER_COUNT = 5
+BENCH_PASSWORD = "benchmark-password"
+
+OEMS = ["Aurora", "Borealis", "Cirrus", "Delta", "Equinox", "Fjord", "Granite", "Helix"]
+MARKETS = ["EU", "China", "USA", "Global"]
+FUEL_TYPES = ["BEV", "PHEV", "HEV"]
+VEHICLE_CLASSES = ["A", "B", "C", "D", "E", "SUV", "LCV"]
+DRIVETRAINS = ["FWD", "RWD", "AWD"]
+PLATFORMS = ["MEB", "E-GMP", "SEA", "Ultium", "TNGA-e", "CMF-EV", "J1", "EVA2"]
+TEXT_VOCABULARY = [
+    "CATL", "LGES", "Panasonic", "Samsung SDI", "SK On", "BYD", "CALB", "EVE",
+    "Aluminium", "Steel", "Copper", "Glycol/water", "Gap filler", "IP67", "IP6K9K",
+    "TI BQ79616", "ADI LTC6813", "Infineon", "Pyrofuse", "Mersen",
+]
+NUMBER_RANGES = {
+    "Ah": (20, 300), "V": (3.2, 900), "kg": (0.05, 700), "kW": (7, 350),
+    "kWh": (20, 120), "Wh/kg": (120, 220), "Wh/L": (200, 450), "mm²": (20, 200),
+}
+COMMENT_TEXTS = [
+    "Confirmed against teardown photos.",
+    "Press figure looks rounded.",
+    "Differs from the homologation document.",
+    "Needs a second source.",
+]
+
+
+def bench_user_email(index: int) -> str:
+    return f"bench-user-{index}@example.com"
+
+
+def _value_text(rng: random.Random, field: Field) -> str:
+    if field.data_type == "select" and field.select_options:
+        return rng.choice(field.select_options)
+    if field.data_type == "number":
+        low, high = NUMBER_RANGES.get(field.unit or "", (1, 200))
+        return f"{rng.uniform(low, high):.1f}"
+    return rng.choice(TEXT_VOCABULARY)
+
+
+async def _reset(session) -> None:
+    params = {"prefix": f"{SYNTHETIC_OEM_PREFIX} %"}
+    synthetic_packs = "SELECT id FROM packs WHERE oem LIKE :prefix"
+    synthetic_values = f"SELECT id FROM field_values WHERE pack_id IN ({synthetic_packs})"
+    await session.execute(text(f"DELETE FROM comments WHERE value_id IN ({synthetic_values})"), params)
+    await session.execute(text(f"DELETE FROM field_value_revisions WHERE pack_id IN ({synthetic_packs})"), params)
+    await session.execute(text(f"DELETE FROM field_values WHERE pack_id IN ({synthetic_packs})"), params)
+    await session.execute(text(f"DELETE FROM value_conflicts WHERE pack_id IN ({synthetic_packs})"), params)
+    await session.execute(text(f"DELETE FROM field_values_archive WHERE pack_id IN ({synthetic_packs})"), params)
+    await session.execute(text(f"DELETE FROM pack_components WHERE pack_id IN ({synthetic_packs})"), params)
+    await session.execute(text("DELETE FROM packs WHERE oem LIKE :prefix"), params)
+    await session.commit()
+
+
+async def _ensure_bench_users(session) -> list[int]:
+    password_hash = hash_password(BENCH_PASSWORD)
+    await session.execute(
+        pg_insert(User)
+        .values([
+            {"email": bench_user_email(i), "password_hash": password_hash, "display_name": f"Bench User {i}"}
+            for i in range(BENCH_USER_COUNT)
+        ])
+        .on_conflict_do_nothing(index_elements=["email"])
+    )
+    result = await session.execute(
+        select(User.id).where(User.email.in_([bench_user_email(i) for i in range(BENCH_USER_COUNT)])).order_by(User.id)
+    )
+    user_ids = list(result.scalars())
+    await session.execute(
+        pg_insert(SourcePriority)
+        .values([{"user_id": uid, "priority_order": DEFAULT_PRIORITY} for uid in user_ids])
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    return user_ids
+
+
+def _pack_row(rng: random.Random, index: int, user_ids: list[int]) -> dict:
+    return {
+        "oem": f"{SYNTHETIC_OEM_PREFIX} {OEMS[index % len(OEMS)]}",
+        "model": f"Model {index // len(OEMS):06d}",
+        "variant": rng.choice([None, "Standard Range", "Long Range", "Performance"]),
+        "year": 2015 + index % 11,
+        "market": rng.choice(MARKETS),
+        "fuel_type": rng.choice(FUEL_TYPES),
+        "vehicle_class": rng.choice(VEHICLE_CLASSES),
+        "drivetrain": rng.choice(DRIVETRAINS),
+        "platform": rng.choice(PLATFORMS),
+        "created_by": rng.choice(user_ids),
+        "is_active": True,
+    }
+
+
+async def generate(packs: int, sources: int, comment_rate: float, seed: int, batch_size: int, rebuild: bool) -> None:
+    started = datetime.utcnow()
+
+    async with async_session() as session:
+        await seed_defaults(session)
+        user_ids = await _ensure_bench_users(session)
+        await session.commit()
+
+        result = await session.execute(
+            select(Field).where(Field.is_active == True, Field.formula.is_(None), Field.name.in_([  # noqa: E712
+                f["name"] for d in SEED_DATA.values() for f in d["fields"]
+            ])).order_by(Field.id)
+        )
+        fields = list(result.scalars())
+
+        values_created = comments_created = 0
+        for batch_start in range(0, packs, batch_size):
+            # One RNG per pack keeps every pack identical across runs, whatever
+            # the batch size or which packs already exist
+            rngs = {i: random.Random(f"{seed}:{i}") for i in range(batch_start, min(batch_start + batch_size, packs))}
+            pack_rows = {i: _pack_row(rng, i, user_ids) for i, rng in rngs.items()}
+            index_by_identity = {(row["oem"], row["model"]): i for i, row in pack_rows.items()}
+
+            result = await session.execute(
+                pg_insert(Pack)
+                .values(list(pack_rows.values()))
+                .on_conflict_do_nothing(constraint="uq_pack_identity")
+                .returning(Pack.id, Pack.oem, Pack.model)
+            )
+            created = [(pack_id, index_by_identity[(oem, model)]) for pack_id, oem, model in result.all()]
+            if not created:
+                continue  # Already generated at this seed — re-run with --reset to rebuild
+
+            # Reserve ids up front so comments can reference values written via COPY
+            result = await session.execute(
+                text("SELECT nextval('field_values_id_seq') FROM generate_series(1, :n)"),
+                {"n": len(created) * len(fields) * sources},
+            )
+            value_ids = iter(result.scalars().all())
+
+            value_records, revision_records, comment_records = [], [], []
+            for pack_id, index in created:
+                rng = rngs[index]
+                for field in fields:
+                    for source_type in rng.sample(VALID_SOURCE_TYPES, sources):
+                        value_id = next(value_ids)
+                        created_at = started - timedelta(minutes=rng.randint(0, 525_600))
+                        value_text = _value_text(rng, field)
+                        # Plain numbers, so no need for the full parser
+                        numeric = float(value_text) if field.data_type == "number" else None
+                        contributor = rng.choice(user_ids)
+                        comment_count = rng.randint(1, 3) if rng.random() < comment_rate else 0
+                        for _ in range(comment_count):
+                            comment_records.append(
+                                (value_id, pack_id, rng.choice(user_ids), rng.choice(COMMENT_TEXTS), created_at)
+                            )
+                        value_records.append((
+                            value_id, pack_id, field.id, value_text, numeric, numeric, numeric,
+                            source_type, f"synthetic {source_type} source", contributor,
+                            created_at, created_at, True, comment_count,
+                        ))
+                        # Each value's history starts with its only revision
+                        revision_records.append(value_records[-1][:10] + (created_at, Range(created_at, None)))
+
+            raw = await (await session.connection()).get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "field_values",
+                records=value_records,
+                columns=[
+                    "id", "pack_id", "field_id", "value_text", "value_numeric", "value_min", "value_max",
+                    "source_type", "source_detail", "contributed_by", "created_at", "updated_at", "is_active",
+                    "comment_count",
+                ],
+            )
+            await raw.driver_connection.copy_records_to_table(
+                "field_value_revisions",
+                records=revision_records,
+                columns=[
+                    "value_id", "pack_id", "field_id", "value_text", "value_numeric", "value_min", "value_max",
+                    "source_type", "source_detail", "contributed_by", "created_at", "valid",
+                ],
+            )
+            await raw.driver_connection.copy_records_to_table(
+                "comments",
+                records=comment_records,
+                columns=["value_id", "pack_id", "author_id", "text", "created_at"],
+            )
+            await session.commit()
+
+            values_created += len(value_records)
+            comments_created += len(comment_records)
+            print(f"  {batch_start + len(rngs)}/{packs} packs, {values_created} values, {comments_created} comments")
+
+        if rebuild and values_created:
+            # COPY bypassed the write path: add the calculated values, then score agreement
+            rebuild_started = datetime.utcnow()
+            changed = await rebuild_fields(session, list((await load_registry(session)).formulas), user_ids[0])
+            scored = await rebuild_conflicts(session)
+            print(
+                f"  derived values for {changed} packs, agreement for {scored} packs"
+                f" in {(datetime.utcnow() - rebuild_started).total_seconds():.1f}s"
+            )
+
+        await session.execute(text("ANALYZE packs, field_values, field_value_revisions, comments, value_conflicts"))
+        await session.commit()
+
+    await engine.dispose()
+    print(f"Generated in {(datetime.utcnow() - started).total_seconds():.1f}s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.reset:
+        async with async_session() as session:
+            await _reset(session)
+        print("Removed previous synthetic catalog")
+    await generate(args.packs, args.sources, args.comment_rate, args.seed, args.batch_size, not args.no_rebuild)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packs", type=int, default=1000, help="number of packs (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--sources", type=int, default=3, help=f"values per field per pack (max {len(VALID_SOURCE_TYPES)})")
+    parser.add_argument("--comment-rate", type=float, default=0.1, help="fraction of values that get 1-3 comments")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=500, help="packs per transaction")
+    parser.add_argument("--reset", action="store_true", help="delete previously generated synthetic packs first")
+    parser.add_argument(
+        "--no-rebuild", action="store_true",
+        help="skip rebuilding derived values and conflict scores (run recompute_derived.py / score_conflicts.py later)",
+    )
+    args = parser.parse_args()
+    if not 1 <= args.sources <= len(VALID_SOURCE_TYPES):
+        parser.error(f"--sources must be between 1 and {len(VALID_SOURCE_TYPES)}")
+
+    print(f"Generating {args.packs} synthetic packs...")
+    asyncio.run(main(args))
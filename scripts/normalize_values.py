@@ -0,0 +1,71 @@
+"""
+Re-parse stored number-field values into canonical numbers in each field's unit.
+
+Value writes parse ``value_text`` as they go (unit suffixes, decimal commas,
+ranges, approximations — see app/services/numeric.py), and changing a
+field's unit through the API re-parses that field in the background. Run
+this once after upgrading to migration 007, or after a bulk load that
+bypassed the API:
+
+    python scripts/normalize_values.py
+    python scripts/normalize_values.py --field gross_capacity_kwh --user admin@example.com
+
+With --user, formulas fed by the changed fields are recalculated as well,
+attributed to that user; otherwise run scripts/recompute_derived.py after.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the backend directory to the path so we can import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import select
+
+from app.database import async_session, engine
+from app.models.field import Field
+from app.models.user import User
+from app.services.formulas import load_registry, rebuild_fields
+from app.services.numeric import normalize_values
+
+
+async def main(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    async with async_session() as session:
+        user_id = None
+        if args.user:
+            user_id = (await session.execute(select(User.id).where(User.email == args.user))).scalar_one_or_none()
+            if user_id is None:
+                raise SystemExit(f"No user with email {args.user}")
+
+        field_ids = None
+        if args.field:
+            result = await session.execute(select(Field.name, Field.id).where(Field.name.in_(args.field)))
+            by_name = dict(result.all())
+            unknown = [name for name in args.field if name not in by_name]
+            if unknown:
+                raise SystemExit(f"Unknown field(s): {', '.join(unknown)}")
+            field_ids = list(by_name.values())
+
+        changed, fields = await normalize_values(session, field_ids)
+        print(f"{changed} values re-parsed across {len(fields)} fields")
+
+        downstream = (await load_registry(session)).downstream(fields) if fields else []
+        if downstream and user_id is not None:
+            packs = await rebuild_fields(session, downstream, user_id)
+            print(f"Recalculated dependent formulas: {packs} packs changed")
+        elif downstream:
+            print("Dependent formulas not recalculated — pass --user or run scripts/recompute_derived.py")
+
+    await engine.dispose()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--field", action="append", help="field name to re-parse (repeatable; default: every number field)")
+    parser.add_argument("--user", help="email of the user recalculated formula values are attributed to")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,58 @@
+"""
+Recalculate derived (formula) field values over every pack.
+
+Value writes keep derived values current incrementally, and changing a
+formula through the API rebuilds it in the background. Run this after
+bootstrapping a database that already had values when formulas were added,
+or to rebuild after a bulk load that bypassed the API (e.g. generate_catalog):
+
+    python scripts/recompute_derived.py --user admin@example.com
+    python scripts/recompute_derived.py --user admin@example.com --field cells_total
+
+Calculated values are attributed to --user.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the backend directory to the path so we can import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import select
+
+from app.database import async_session, engine
+from app.models.user import User
+from app.services.formulas import load_registry, rebuild_fields
+
+
+async def main(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    async with async_session() as session:
+        user_id = (await session.execute(select(User.id).where(User.email == args.user))).scalar_one_or_none()
+        if user_id is None:
+            raise SystemExit(f"No user with email {args.user}")
+
+        registry = await load_registry(session)
+        if args.field:
+            unknown = [name for name in args.field if name not in registry.field_ids]
+            if unknown:
+                raise SystemExit(f"Unknown field(s): {', '.join(unknown)}")
+            field_ids = [registry.field_ids[name] for name in args.field]
+        else:
+            field_ids = list(registry.formulas)
+        print(f"Recomputing {', '.join(registry.names[fid] for fid in field_ids) or 'nothing'} (and downstream formulas)")
+
+        changed = await rebuild_fields(session, field_ids, user_id)
+
+    await engine.dispose()
+    print(f"{changed} packs changed in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", required=True, help="email of the user the calculated values are attributed to")
+    parser.add_argument("--field", action="append", help="field name to rebuild (repeatable; default: every formula)")
+    asyncio.run(main(parser.parse_args()))
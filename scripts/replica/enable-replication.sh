@@ -0,0 +1,5 @@
+#!/bin/sh
+# Runs once from docker-entrypoint-initdb.d on the primary: lets the replica
+# container stream WAL using the (superuser) application role.
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
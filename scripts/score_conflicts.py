@@ -0,0 +1,42 @@
+"""
+Score source agreement for every pack field and store it in value_conflicts.
+
+Value writes keep the scores current pack by pack. Run this once after
+upgrading to migration 008, after a bulk load that bypassed the API (e.g.
+generate_catalog), or after changing CONFLICT_TOLERANCE:
+
+    python scripts/score_conflicts.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the backend directory to the path so we can import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.database import async_session, engine
+from app.models.conflict import ValueConflict
+from app.services.conflicts import rebuild_conflicts
+
+
+async def main() -> None:
+    started = time.perf_counter()
+    async with async_session() as session:
+        changed = await rebuild_conflicts(session)
+        result = await session.execute(
+            select(func.count(), func.count().filter(ValueConflict.is_conflict == True))  # noqa: E712
+        )
+        scored, disputed = result.one()
+
+    await engine.dispose()
+    print(f"{changed} packs changed in {time.perf_counter() - started:.1f}s")
+    print(f"{scored} pack fields with several values, {disputed} disputed (tolerance {settings.CONFLICT_TOLERANCE:g})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())